@@ -1,7 +1,8 @@
 from .balance import Balance
 from .execution import Execution
+from .executionbatch import ExecutionBatch, ExecutionSide
 from .instrument import Instrument
-from .order import Order, OrderType, OrderSide, OrderState
+from .order import Order, OrderRequest, OrderType, OrderSide, OrderState
 from .orderbook import OrderBook
 from .position import Position, PositionState
 from .streamdata import StreamData
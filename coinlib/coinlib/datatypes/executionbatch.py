@@ -0,0 +1,56 @@
+from typing import Any
+
+from dataclasses import dataclass
+
+from .order import OrderSide
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class ExecutionSide:
+    """side column values of ExecutionBatch"""
+    BUY = 1
+    SELL = -1
+    # side not given by server
+    UNKNOWN = 0
+
+    @classmethod
+    def of(cls, side: str) -> int:
+        """'BUY' -> 1, 'SELL' -> -1, others -> 0"""
+        side = (side or '').upper()
+        if side == OrderSide.BUY:
+            return cls.BUY
+        if side == OrderSide.SELL:
+            return cls.SELL
+        return cls.UNKNOWN
+
+
+@dataclass
+class ExecutionBatch:
+    """
+    columnar executions(time ascending order) of one instrument.
+    each column is numpy.ndarray with same length
+    timestamp: float64, price: float64, qty: float64, side: int8(ExecutionSide)
+    """
+    instrument: str
+    timestamp: Any
+    price: Any
+    qty: Any
+    side: Any
+
+    def __post_init__(self):
+        self.validate()
+
+    def __len__(self) -> int:
+        return len(self.timestamp)
+
+    def validate(self):
+        assert np, 'numpy required'
+        assert self.instrument and isinstance(self.instrument, str)
+        n = len(self.timestamp)
+        for column in (self.timestamp, self.price, self.qty, self.side):
+            assert isinstance(column, np.ndarray)
+            assert column.shape == (n,)
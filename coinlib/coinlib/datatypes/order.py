@@ -1,5 +1,5 @@
 from numbers import Real
-from typing import Any, Hashable
+from typing import Any, Hashable, Optional
 
 from dataclasses import dataclass
 from requests.utils import CaseInsensitiveDict
@@ -88,3 +88,16 @@ class Order:
         assert isinstance(self.is_hidden, bool)
         assert isinstance(self.is_iceberg, bool)
         assert isinstance(self.timestamp_update, (Real, type(None)))
+
+
+@dataclass
+class OrderRequest:
+    """arguments of Client.submit_order(). see Client.submit_orders()"""
+    instrument: str
+    order_type: str
+    side: str
+    price: Optional[float]
+    qty: float
+    margin: bool = False
+    leverage: float = None
+    params: dict = None
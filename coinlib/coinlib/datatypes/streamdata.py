@@ -6,9 +6,9 @@ from dataclasses import dataclass
 class StreamType:
     TICKER = 'ticker'
     ORDER_BOOK = 'order_book'
-    EXECUTION = 'execution'
+    EXECUTION = 'execution'  # List[Execution] or ExecutionBatch
+    CANDLE = 'candle'  # (resolution, Candle) of closed candle, built from execution stream
     # TODO: support following types(currently not supported)
-    CANDLE = 'candle'
     PRIVATE_BALANCE = 'private_balance'
     PRIVATE_EXECUTION = 'private_execution'
     PRIVATE_ORDER = 'private_order'
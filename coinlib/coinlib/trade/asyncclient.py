@@ -0,0 +1,283 @@
+import asyncio
+import collections.abc
+import copy
+import functools
+from typing import Any, AsyncIterator, Callable, Iterator, List, Optional, Tuple
+
+from coinlib.trade.asyncrestapi import AsyncRestApi
+from coinlib.trade.client import Client, _fetcher
+from coinlib.utils.pagination import iter_pages, prefetch
+
+_END = object()
+
+
+class _FetchRequired(BaseException):
+    """
+    converter requested a response which is not fetched yet.
+    BaseException not to be caught by error handling of converters
+    """
+
+    def __init__(self, method_name: str, path: str, params: dict):
+        super().__init__(method_name, path)
+        self.method_name = method_name
+        self.path = path
+        self.params = params
+
+
+class _PageRequired(BaseException):
+    """converter requested a page of Client._iter_pages() which is not fetched yet. see _Pagination"""
+
+
+class _Failed:
+    """exception raised by a fetched request. raised again in converter, so converter can handle it"""
+
+    def __init__(self, exc: Exception):
+        self.exc = exc
+
+
+class _Pagination:
+    """pages of a Client._iter_pages() call of iterator result. kept while converter is run again"""
+
+    def __init__(self):
+        # page or _Failed of raised exception
+        self.pages: List[Any] = []
+        # (fetch_page, cursor) of next page. started by AsyncClient._iterate() after converter yields
+        self.request: Optional[Tuple[Callable[[Any], Any], Any]] = None
+        self.task: Optional[asyncio.Future] = None
+
+
+class _Replay:
+    """fetcher of Client.fetch() which returns fetched responses in order of requests"""
+
+    def __init__(self, responses: List[Any], paginations: List[_Pagination] = None):
+        self.responses = responses
+        self.n = 0
+        # pages of Client._iter_pages() in order of calls. None to fetch pages as other responses
+        self.paginations = paginations
+        self.n_paginations = 0
+
+    def __call__(self, method_name: str, path: str, params: dict) -> Any:
+        if self.n >= len(self.responses):
+            raise _FetchRequired(method_name, path, params)
+        res = self.responses[self.n]
+        self.n += 1
+        if isinstance(res, _Failed):
+            raise res.exc
+        # converter may modify response
+        res = copy.deepcopy(res)
+        return iter(res) if method_name.endswith('_iter') else res
+
+    def iter_pages(self, fetch_page: Callable[[Any], Any], next_cursor: Callable[[Any, Any], Any],
+                   cursor: Any = None) -> Iterator[Any]:
+        """fetcher of Client._iter_pages()"""
+        if self.paginations is None:
+            return iter_pages(fetch_page, next_cursor, cursor, look_ahead=0)
+        if self.n_paginations == len(self.paginations):
+            self.paginations.append(_Pagination())
+        pagination = self.paginations[self.n_paginations]
+        self.n_paginations += 1
+        return self._iter_fetched_pages(pagination, fetch_page, next_cursor, cursor)
+
+    @staticmethod
+    def _iter_fetched_pages(pagination: _Pagination, fetch_page: Callable[[Any], Any],
+                            next_cursor: Callable[[Any, Any], Any], cursor: Any) -> Iterator[Any]:
+        """pages of pagination. next page is requested before converter reads a page"""
+        i = 0
+        while True:
+            if i == len(pagination.pages):
+                pagination.request = (fetch_page, cursor)
+                raise _PageRequired()
+            page = pagination.pages[i]
+            if isinstance(page, _Failed):
+                raise page.exc
+            # converter may modify page
+            page = copy.deepcopy(page)
+            i += 1
+            try:
+                cursor = next_cursor(cursor, page)
+            except Exception as exc:
+                cursor = None
+                # raised when converter reaches next page
+                if i == len(pagination.pages):
+                    pagination.pages.append(_Failed(exc))
+            if cursor is not None and i == len(pagination.pages):
+                pagination.request = (fetch_page, cursor)
+            yield page
+            if cursor is None and i == len(pagination.pages):
+                return
+
+    def run(self, f: Callable, *args, **kwargs) -> Any:
+        token = _fetcher.set(self)
+        try:
+            # pages are fetched in this task, not in thread
+            with prefetch(0):
+                return f(*args, **kwargs)
+        finally:
+            _fetcher.reset(token)
+
+
+class AsyncClient:
+    """
+    asyncio facade of Client of any exchange.
+
+        async with AsyncClient(Client(credential)) as client:
+            tickers = await asyncio.gather(*[client.get_ticker(x) for x in instruments])
+            async for x in await client.get_public_executions('BTC_JPY'):
+                ...
+
+    public_*() and private_*() are sent by AsyncRestApi made from REST_API_CLASS of the client.
+    other methods (get_ticker(), submit_order(), ...) run converters of exchange packages in event loop.
+    a converter is run again with fetched responses each time it requests a new one by Client.fetch(),
+    so converters must request in the same order when run again. errors of requests are raised in converters.
+    iterator result is returned as async iterator. while it reads a page of Client._iter_pages(),
+    next page is fetched ahead in event loop, so paginated iterators are not run again for each page.
+    """
+
+    def __init__(self, client: Client):
+        self.client = client
+        api = client.api
+        api_class = AsyncRestApi.make_class(type(api))
+        self.api: AsyncRestApi = api_class(api.credentials,
+                                           timeout=api.timeout,
+                                           retry_timeout=api.retry_timeout,
+                                           proxies=api.proxies,
+                                           session_pool_size=api.session_pool.pool_size,
+                                           rate_limit=api.rate_limit,
+                                           private_concurrency=api.private_concurrency,
+                                           key_schedule=api.key_pool.schedule,
+                                           hedge_paths=api.hedge_paths,
+                                           hedge_percentile=api.hedger.percentile,
+                                           hedge_budget=api.hedger.budget,
+                                           hooks=api.hooks)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    async def close(self):
+        await self.api.close()
+
+    def __getattr__(self, item: str) -> Any:
+        value = getattr(self.client, item)
+        if not callable(value):
+            return value
+
+        @functools.wraps(value)
+        async def _run(*args, **kwargs):
+            responses = []
+            while True:
+                try:
+                    res = _Replay(responses).run(value, *args, **kwargs)
+                except _FetchRequired as e:
+                    responses.append(await self._fetch(e))
+                    continue
+                if isinstance(res, collections.abc.Iterator):
+                    return self._iterate(responses, value, args, kwargs)
+                return res
+
+        return _run
+
+    async def _iterate(self, responses: List[Any], f: Callable, args: tuple, kwargs: dict) -> AsyncIterator:
+        """
+        elements of iterator of f. iterator is made again and read elements are skipped after a fetch,
+        except for pages of Client._iter_pages() fetched ahead
+        """
+        paginations: List[_Pagination] = []
+        n = 0
+        replay = it = None
+        try:
+            while True:
+                for pagination in paginations:
+                    if pagination.task is not None:
+                        pagination.pages.append(await pagination.task)
+                        pagination.task = None
+                try:
+                    if it is None:
+                        replay = _Replay(responses, paginations)
+                        it = replay.run(f, *args, **kwargs)
+                        for _ in range(n):
+                            replay.run(next, it, None)
+                    x = replay.run(next, it, _END)
+                except _FetchRequired as e:
+                    it = None
+                    responses.append(await self._fetch(e))
+                    continue
+                except _PageRequired:
+                    it = None
+                    continue
+                finally:
+                    for pagination in paginations:
+                        if pagination.request is not None:
+                            pagination.task = asyncio.ensure_future(self._fetch_page(*pagination.request))
+                            pagination.request = None
+                if x is _END:
+                    return
+                n += 1
+                yield x
+        finally:
+            for pagination in paginations:
+                if pagination.task is not None:
+                    pagination.task.cancel()
+
+    async def _fetch_page(self, fetch_page: Callable[[Any], Any], cursor: Any) -> Any:
+        """
+        fetch_page(cursor) of Client._iter_pages() with awaited requests
+        :return: page or _Failed of raised exception
+        """
+        responses = []
+        while True:
+            try:
+                return _Replay(responses).run(fetch_page, cursor)
+            except _FetchRequired as e:
+                responses.append(await self._fetch(e))
+            except Exception as exc:
+                return _Failed(exc)
+
+    async def _fetch(self, e: _FetchRequired) -> Any:
+        """
+        response of request of converter. *_iter() requests are fetched as a whole
+        :return: response or _Failed of raised exception
+        """
+        method_name = e.method_name
+        if method_name.endswith('_iter'):
+            method_name = method_name[:-len('_iter')]
+        try:
+            return await getattr(self.api, method_name)(e.path, **e.params)
+        except Exception as exc:
+            return _Failed(exc)
+
+    # public
+
+    def public_get(self, path: str, **kwargs):
+        return self.api.public_get(path, **kwargs)
+
+    def public_post(self, path: str, **kwargs):
+        return self.api.public_post(path, **kwargs)
+
+    def public_put(self, path: str, **kwargs):
+        return self.api.public_put(path, **kwargs)
+
+    def public_patch(self, path: str, **kwargs):
+        return self.api.public_patch(path, **kwargs)
+
+    def public_delete(self, path: str, **kwargs):
+        return self.api.public_delete(path, **kwargs)
+
+    # private
+
+    def private_get(self, path: str, **kwargs):
+        return self.api.private_get(path, **kwargs)
+
+    def private_post(self, path: str, **kwargs):
+        return self.api.private_post(path, **kwargs)
+
+    def private_put(self, path: str, **kwargs):
+        return self.api.private_put(path, **kwargs)
+
+    def private_patch(self, path: str, **kwargs):
+        return self.api.private_patch(path, **kwargs)
+
+    def private_delete(self, path: str, **kwargs):
+        return self.api.private_delete(path, **kwargs)
@@ -0,0 +1,251 @@
+import asyncio
+import contextvars
+import functools
+import logging
+import time
+from typing import Dict, List, Optional, Type, Union
+
+import requests
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from coinlib.errors import RetryError, ApiTimeoutError
+from coinlib.trade.auth import Auth
+from coinlib.trade.restapi import RestApi
+from coinlib.trade.restmetrics import RequestInfo
+from coinlib.trade.retrypolicy import Idempotency, deadline
+from coinlib.utils.tokenbucket import TokenBucket
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncRestApi(RestApi):
+    """
+    asyncio version of RestApi. requires aiohttp.
+    prepare_request(), on_response(), on_error() and Auth are shared with RestApi,
+    so public_*() and private_*() return coroutines of the same results.
+
+    use make_class() to make async version of RestApi of an exchange.
+    """
+
+    # RestApi class of the exchange. see make_class()
+    BLOCKING_CLASS: Type[RestApi] = RestApi
+
+    def __init__(self, credential: Union[dict, List[dict]] = None, *, session_pool_size: int = 4, **kwargs):
+        """
+        :param session_pool_size: connections of aiohttp per host. 0 for default limit
+        """
+        assert aiohttp, 'aiohttp required'
+        self.connection_limit = session_pool_size
+        super().__init__(credential, session_pool_size=session_pool_size, **kwargs)
+        # only to prepare and sign requests. never sends
+        self._prepare_session = requests.Session()
+        self._session: aiohttp.ClientSession = None
+        self._blocking_api: RestApi = None
+
+    def new_session_pool(self, pool_size: int, pool_maxsize: Optional[int]) -> None:
+        """connections are pooled by aiohttp.ClientSession"""
+        _ = self, pool_size, pool_maxsize
+        return None
+
+    @classmethod
+    def make_class(cls, rest_api_class: Type[RestApi]) -> Type['AsyncRestApi']:
+        if issubclass(rest_api_class, AsyncRestApi):
+            return rest_api_class
+        return type(f'Async{rest_api_class.__name__}', (cls, rest_api_class), {'BLOCKING_CLASS': rest_api_class})
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    async def close(self):
+        super().close()
+        if self._blocking_api:
+            self._blocking_api.close()
+        if self._session:
+            await self._session.close()
+            self._session = None
+
+    def get_session(self) -> 'aiohttp.ClientSession':
+        if self._session is None:
+            connector = aiohttp.TCPConnector(limit_per_host=self.connection_limit)
+            self._session = aiohttp.ClientSession(connector=connector,
+                                                  timeout=aiohttp.ClientTimeout(total=self.timeout))
+        return self._session
+
+    async def request(self, method: str, path: str, is_private: bool, params: dict = None) -> Union[list, dict]:
+        assert path.startswith('/'), f'path={path} must start with /'
+        params = params or {}
+        if not self.hooks:
+            return await self._request(method, path, is_private, params, None)
+        info = RequestInfo(exchange=self.NAME, method=method, path=path,
+                           template=self.get_path_template(path), is_private=is_private)
+        self.call_hooks('on_request_start', info)
+        try:
+            res = await self._request(method, path, is_private, params, info)
+        except Exception as e:
+            self.call_hooks('on_request_end', info, e)
+            raise
+        self.call_hooks('on_request_end', info, None)
+        return res
+
+    async def _request(self, method: str, path: str, is_private: bool, params: dict,
+                       info: Optional[RequestInfo]) -> Union[list, dict]:
+        idempotency = self.get_idempotency(method, path, params)
+        policy = self.retry_policies[idempotency]
+        stop = self.get_stop_time(policy)
+
+        async def _do_request(auth: Optional[Auth], limiter: Optional[TokenBucket]):
+            req = self.prepare_request(method, path, is_private, params)
+            prep = self._prepare_session.prepare_request(req)
+            if auth:
+                prep.prepare_auth(auth)
+            if info:
+                self.call_hooks('on_send', info, prep)
+                info.sent_at = time.time()
+            _res = await self.send(prep, timeout=min(self.timeout, max(stop - time.time(), 0.001)))
+            if info:
+                self.call_hooks('on_response', info, _res, time.time() - info.sent_at)
+            if limiter:
+                self.update_rate_limiter(limiter, _res)
+            return _res
+
+        n = 0
+        maybe_sent = False
+        while True:
+            if stop <= time.time():
+                raise ApiTimeoutError('retry timeout')
+            slot = None
+            limiter = None
+            reconciling = maybe_sent and idempotency == Idempotency.KEYED
+            try:
+                if reconciling:
+                    # reconciliation is retried under policy and deadline of this request
+                    with deadline(stop - time.time()):
+                        reconciled = await self.reconcile(method, path, params)
+                    if reconciled is not None:
+                        return reconciled
+                    reconciling = False
+                if is_private:
+                    slot = self.key_pool.select(lambda auth: self.get_rate_limiter(method, path, True, auth))
+                limiter = self.get_rate_limiter(method, path, is_private, slot and slot.auth)
+                if limiter:
+                    wait = limiter.reserve(max_wait=stop - time.time())
+                    if wait is None:
+                        raise ApiTimeoutError('rate limit')
+                    if wait:
+                        await asyncio.sleep(wait)
+                if slot:
+                    if slot.async_semaphore is None:
+                        slot.async_semaphore = asyncio.Semaphore(slot.concurrency)
+                    async with slot.async_semaphore:
+                        res = await _do_request(slot.auth, limiter)
+                else:
+                    res = await _do_request(None, limiter)
+                try:
+                    return self.on_response(res, is_private)
+                except Exception as e:
+                    return self.on_error(e)
+            except RetryError as e:
+                error = e
+                wait = self.get_retry_wait(e, policy, n, stop, limiter)
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError,
+                    requests.ConnectionError, requests.Timeout) as e:
+                # reconcile() raises errors of requests
+                error = e
+                # failed reconciliation is a read. order is still unknown
+                unsent = isinstance(e, aiohttp.ClientConnectorError) and not reconciling
+                if not (policy.retry_transport_errors or unsent or reconciling):
+                    raise
+                maybe_sent = maybe_sent or not unsent
+                wait = self.get_retry_wait(e, policy, n, stop, limiter)
+            finally:
+                if slot:
+                    self.key_pool.release(slot)
+            n += 1
+            if info:
+                info.attempt = n
+                self.call_hooks('on_retry', info, error, wait)
+            await asyncio.sleep(wait)
+
+    async def reconcile(self, method: str, path: str, params: dict) -> Optional[Union[list, dict]]:
+        # reconcile() of exchange sends blocking requests. run it by blocking RestApi in thread
+        if self._blocking_api is None:
+            self._blocking_api = self.BLOCKING_CLASS(self.credentials, timeout=self.timeout,
+                                                     retry_timeout=self.retry_timeout, proxies=self.proxies,
+                                                     retry_policies=self.retry_policies)
+        loop = asyncio.get_event_loop()
+        # deadline of task is passed to thread
+        context = contextvars.copy_context()
+        return await loop.run_in_executor(None, functools.partial(
+            context.run, self._blocking_api.reconcile, method, path, params))
+
+    async def hedged_request(self, pattern: str, method: str, path: str, params: dict) -> Union[list, dict]:
+        """RestApi.hedged_request(). the other request is cancelled"""
+        self.hedger.earn()
+
+        async def _request():
+            start = time.time()
+            _res = await self.request(method, path, False, params)
+            self.hedger.record(pattern, time.time() - start)
+            return _res
+
+        delay = self.hedger.get_delay(pattern)
+        if delay is None:
+            return await _request()
+        primary = asyncio.ensure_future(_request())
+        done, _ = await asyncio.wait([primary], timeout=delay)
+        if done:
+            return primary.result()
+        if not self.hedger.spend():
+            return await primary
+        logger.debug(f'hedge {method} {path} delay={delay:.3f}')
+        pending = {primary, asyncio.ensure_future(_request())}
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for future in done:
+                    if future.exception() is None:
+                        return future.result()
+            # both failed
+            return primary.result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+    def public_get(self, path: str, **kwargs):
+        # response cache of RestApi is for blocking requests
+        pattern = self.get_hedge_pattern(path)
+        if pattern is None:
+            return self.request('GET', path, False, kwargs)
+        return self.hedged_request(pattern, 'GET', path, kwargs)
+
+    async def send(self, prep: requests.PreparedRequest, timeout: float = None) -> requests.Response:
+        """send prepared request by aiohttp and return it as requests.Response for on_response()"""
+        proxy = self.proxies.get(prep.url.split(':', 1)[0])
+        async with self.get_session().request(prep.method, prep.url, headers=dict(prep.headers),
+                                              data=prep.body, proxy=proxy,
+                                              timeout=aiohttp.ClientTimeout(total=timeout or self.timeout)) as res:
+            content = await res.read()
+            return self.to_response(prep, res, content)
+
+    @staticmethod
+    def to_response(prep: requests.PreparedRequest, res: 'aiohttp.ClientResponse',
+                    content: bytes) -> requests.Response:
+        headers: Dict[str, str] = CaseInsensitiveDict(res.headers)
+        response = requests.Response()
+        response.status_code = res.status
+        response.reason = res.reason
+        response.headers = headers
+        response.url = str(res.url)
+        response.encoding = get_encoding_from_headers(headers)
+        response.request = prep
+        response._content = content
+        return response
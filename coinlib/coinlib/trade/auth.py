@@ -1,13 +1,40 @@
+import threading
 import time
 from abc import ABC, abstractmethod
+from typing import Dict, Hashable
 
 import requests.auth
 
 
+class NonceAllocator:
+    """
+    Strictly increasing nonce per key(api key) in process.
+    nonce is current time in ticks of resolution per second, or last nonce + 1 if it is not greater.
+    """
+
+    def __init__(self):
+        self._last_nonces: Dict[Hashable, int] = {}
+        self._lock = threading.Lock()
+
+    def allocate(self, key: Hashable, resolution: int = 1000) -> int:
+        nonce = int(time.time() * resolution)
+        with self._lock:
+            last = self._last_nonces.get((key, resolution))
+            if last is not None and nonce <= last:
+                nonce = last + 1
+            self._last_nonces[(key, resolution)] = nonce
+        return nonce
+
+
+nonce_allocator = NonceAllocator()
+
+
 class Auth(requests.auth.AuthBase, ABC):
     """
     Authentication base class for REST API
     """
+    # nonce ticks per second
+    NONCE_RESOLUTION = 1000
 
     def __init__(self, credential: dict):
         self.credential = credential
@@ -28,7 +55,9 @@ class Auth(requests.auth.AuthBase, ABC):
     def sign(self, req: requests.PreparedRequest) -> requests.PreparedRequest:
         pass
 
-    @classmethod
-    def get_nonce(cls):
-        """Override if necessary"""
-        return int(time.time() * 1000)
+    def get_nonce(self) -> int:
+        """
+        strictly increasing per api key. call at signing time.
+        Override if necessary
+        """
+        return nonce_allocator.allocate(self.api_key, self.NONCE_RESOLUTION)
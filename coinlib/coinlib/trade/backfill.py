@@ -0,0 +1,144 @@
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+import contextvars
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Deque, Iterator, List, Tuple, Union
+
+from coinlib.datatypes import Execution
+
+logger = logging.getLogger(__name__)
+
+
+class Backfill:
+    """
+    Historical public executions of [start, end) fetched concurrently by chunks.
+    key of range is execution id or unix time milliseconds depending on exchange. see Client.EXECUTION_RANGE_KEY
+
+        backfill = Backfill(client, 'FX_BTC_JPY', start_id, end_id, chunk_size=5000, checkpoint_path='fx.json')
+        for execution in backfill:
+            save(execution)
+
+    executions are yielded in ascending order of chunks, deduplicated by execution_id.
+    chunks are fetched by max_workers threads within rate limits of RestApi.
+    checkpoint is saved after all executions of a chunk are consumed, so interrupted run resumes
+    from the first chunk not consumed completely (executions of that chunk may be yielded again).
+    """
+    VERSION = 1
+
+    def __init__(self, client, instrument: str, start: int, end: int, *, chunk_size: int,
+                 max_workers: int = None, checkpoint_path: Union[str, Path] = None):
+        """
+        :param client: Client supports get_public_executions_range()
+        :param max_workers: session_pool_size of client if None
+        :param checkpoint_path: json file of progress. resume if it exists with same arguments
+        """
+        assert start < end and chunk_size > 0, (start, end, chunk_size)
+        self.client = client
+        self.instrument = instrument
+        self.start = start
+        self.end = end
+        self.chunk_size = chunk_size
+        self.max_workers = max_workers or client.api.session_pool.pool_size or 1
+        self.checkpoint_path = Path(checkpoint_path) if checkpoint_path else None
+        # executions before position are consumed
+        self.position = self._load_checkpoint()
+
+    def get_chunks(self) -> List[Tuple[int, int]]:
+        """[start, end) of chunks not consumed"""
+        chunks = []
+        for x in range(self.position, self.end, self.chunk_size):
+            chunks.append((x, min(x + self.chunk_size, self.end)))
+        return chunks
+
+    def _fetch_chunk(self, start: int, end: int) -> List[Execution]:
+        executions = list(self.client.get_public_executions_range(self.instrument, start, end))
+        logger.debug(f'backfill {self.instrument} [{start}, {end}) {len(executions)} executions')
+        return executions
+
+    def iter_chunks(self) -> Iterator[List[Execution]]:
+        """
+        executions of each chunk in ascending order. checkpoint of a chunk is saved when next chunk is requested
+        """
+        chunks = self.get_chunks()
+        # recent execution ids. chunks of inclusive range may overlap at boundary
+        seen = OrderedDict()
+        executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        futures: Deque[Tuple[Tuple[int, int], Future]] = deque()
+        try:
+            i = 0
+            while i < len(chunks) or futures:
+                # bounded look-ahead of chunks
+                while i < len(chunks) and len(futures) < 2 * self.max_workers:
+                    context = contextvars.copy_context()
+                    futures.append((chunks[i], executor.submit(context.run, self._fetch_chunk, *chunks[i])))
+                    i += 1
+                (_, end), future = futures.popleft()
+                executions = []
+                for execution in future.result():
+                    if execution.execution_id in seen:
+                        continue
+                    seen[execution.execution_id] = True
+                    if len(seen) > 10000:
+                        seen.popitem(last=False)
+                    executions.append(execution)
+                yield executions
+                self.position = end
+                self._save_checkpoint()
+        finally:
+            for _, future in futures:
+                future.cancel()
+            executor.shutdown(wait=False)
+
+    def __iter__(self) -> Iterator[Execution]:
+        for executions in self.iter_chunks():
+            yield from executions
+
+    def write_to(self, store, exchange: str) -> int:
+        """
+        append all executions to ExecutionStore chunk by chunk.
+        executions stored before interruption are not stored again on resume.
+        :return: number of stored executions
+        """
+        n = 0
+        for executions in self.iter_chunks():
+            n += store.append_executions(exchange, executions)
+        return n
+
+    def _get_checkpoint_key(self) -> dict:
+        return {
+            'version': self.VERSION,
+            'instrument': self.instrument,
+            'start': self.start,
+            'end': self.end,
+            'chunk_size': self.chunk_size,
+        }
+
+    def _load_checkpoint(self) -> int:
+        if not self.checkpoint_path:
+            return self.start
+        try:
+            with self.checkpoint_path.open() as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return self.start
+        position = data.pop('position')
+        if data != self._get_checkpoint_key():
+            logger.warning(f'checkpoint {self.checkpoint_path} of other arguments {data} is ignored')
+            return self.start
+        return position
+
+    def _save_checkpoint(self):
+        if not self.checkpoint_path:
+            return
+        data = dict(self._get_checkpoint_key(), position=self.position)
+        tmp_path = self.checkpoint_path.with_name(f'{self.checkpoint_path.name}.{os.getpid()}.tmp')
+        with tmp_path.open('w') as f:
+            json.dump(data, f)
+        os.replace(str(tmp_path), str(self.checkpoint_path))
+
+    @property
+    def is_done(self) -> bool:
+        return self.position >= self.end
@@ -0,0 +1,104 @@
+import logging
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from coinlib.datatypes import Execution, ExecutionBatch
+from coinlib.datatypes.candle import Candle
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RESOLUTIONS = ('1s', '1m', '5m', '1h')
+_UNIT_SECONDS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+
+def parse_resolution(resolution: str) -> int:
+    """'5m' -> 300"""
+    unit = resolution[-1:].lower()
+    assert unit in _UNIT_SECONDS and resolution[:-1].isdigit(), f'invalid resolution={resolution}'
+    seconds = int(resolution[:-1]) * _UNIT_SECONDS[unit]
+    assert seconds > 0, f'invalid resolution={resolution}'
+    return seconds
+
+
+class CandleBuilder:
+    """
+    Build OHLCV candles of some resolutions from executions at once.
+    Candle.timestamp is start time of the period.
+    Candle is closed when an execution of later period arrives or by close(). periods without execution are not emitted.
+    late execution of closed period is dropped.
+    """
+
+    def __init__(self, instrument: str, resolutions: Iterable[str] = DEFAULT_RESOLUTIONS):
+        self.instrument = instrument
+        self.resolutions: Dict[str, int] = {x: parse_resolution(x) for x in resolutions}
+        # resolution -> [timestamp, open, high, low, close, volume]
+        self._open_candles: Dict[str, list] = {}
+        # resolution -> periods before this time are closed
+        self._closed_until: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def add(self, timestamp: float, price: float, qty: float) -> List[Tuple[str, Candle]]:
+        """
+        :return: closed candles [(resolution, Candle)]
+        """
+        closed = []
+        dropped = []
+        with self._lock:
+            for resolution, seconds in self.resolutions.items():
+                start = timestamp - timestamp % seconds
+                if start < self._closed_until.get(resolution, start):
+                    dropped.append(resolution)
+                    continue
+                x = self._open_candles.get(resolution)
+                if x is None or x[0] < start:
+                    if x is not None:
+                        closed.append((resolution, self._to_candle(x)))
+                    self._open_candles[resolution] = [start, price, price, price, price, qty]
+                    self._closed_until[resolution] = start
+                    continue
+                if price > x[2]:
+                    x[2] = price
+                if price < x[3]:
+                    x[3] = price
+                x[4] = price
+                x[5] += qty
+        if dropped:
+            logger.warning(f'late execution dropped from closed candles {self.instrument} {dropped} '
+                           f'timestamp={timestamp} price={price} qty={qty}')
+        return closed
+
+    def add_executions(self, executions: Iterable[Execution]) -> List[Tuple[str, Candle]]:
+        closed = []
+        for x in executions:
+            closed.extend(self.add(x.timestamp, x.price, x.qty))
+        return closed
+
+    def add_batch(self, batch: ExecutionBatch) -> List[Tuple[str, Candle]]:
+        closed = []
+        for timestamp, price, qty in zip(batch.timestamp.tolist(), batch.price.tolist(), batch.qty.tolist()):
+            closed.extend(self.add(timestamp, price, qty))
+        return closed
+
+    def get_candle(self, resolution: str) -> Optional[Candle]:
+        """return current open candle"""
+        with self._lock:
+            x = self._open_candles.get(resolution)
+            if x is None:
+                return None
+            return self._to_candle(x)
+
+    def close(self, timestamp: float) -> List[Tuple[str, Candle]]:
+        """close open candles which period ended before timestamp"""
+        closed = []
+        with self._lock:
+            for resolution, seconds in self.resolutions.items():
+                x = self._open_candles.get(resolution)
+                if x is not None and x[0] + seconds <= timestamp:
+                    closed.append((resolution, self._to_candle(x)))
+                    del self._open_candles[resolution]
+                    self._closed_until[resolution] = x[0] + seconds
+        return closed
+
+    def _to_candle(self, x: list) -> Candle:
+        _ = self
+        return Candle(timestamp=x[0], open=x[1], high=x[2], low=x[3], close=x[4], volume=x[5])
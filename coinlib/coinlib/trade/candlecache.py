@@ -0,0 +1,113 @@
+import json
+import logging
+import os
+from pathlib import Path
+import threading
+import time
+from typing import Callable, Dict, Iterable, Iterator, List, Tuple, Union
+
+from coinlib.datatypes.candle import Candle
+from coinlib.trade.candlebuilder import parse_resolution
+from coinlib.trade.tradestore import CandleStore, DAY_SECONDS
+
+logger = logging.getLogger(__name__)
+
+# (is_local, start, end, yield_start)
+_Segment = Tuple[bool, float, float, float]
+
+
+class CandleCache:
+    """
+    Closed candles of Client.get_candles() kept in CandleStore. used by Client(candle_cache=...)
+
+        directory/exchange/instrument@resolution/_coverage.json   UTC day -> covered_until
+
+    candles of [day start, covered_until) of each day are stored.
+    requested range is served from store where covered and the rest (e.g. still-open tail) is fetched from server.
+    uncovered day is fetched from its start to keep coverage contiguous, so resolution must divide a day.
+    candle is regarded as closed delay seconds after end of its period.
+    """
+
+    def __init__(self, directory: Union[str, Path], *, delay: float = 60):
+        self.store = CandleStore(directory)
+        self.delay = delay
+        self._coverages: Dict[Path, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def get_candles(self, fetch: Callable[[float, float], Iterable[Candle]], exchange: str, instrument: str,
+                    resolution: str, start: float, end: float) -> Iterator[Candle]:
+        """
+        candles of [start, end) in time ascending order
+        :param fetch: fetch(start, end) returns candles of [start, end) from server in time ascending order
+        """
+        seconds = parse_resolution(resolution)
+        assert DAY_SECONDS % seconds == 0, f'resolution must divide a day {resolution}'
+        name = self.store.get_name(instrument, resolution)
+        for is_local, seg_start, seg_end, yield_start in self._get_segments(exchange, name, start, end):
+            if is_local:
+                yield from self.store.iter_candles(exchange, instrument, resolution, seg_start, seg_end)
+                continue
+            # candles of which period ended before closed_until - delay
+            closed_until = (time.time() - self.delay) // seconds * seconds
+            candles = [x for x in fetch(seg_start, seg_end) if seg_start <= x.timestamp < seg_end]
+            closed = [x for x in candles if x.timestamp < closed_until]
+            self.store.append_candles(exchange, instrument, resolution, closed)
+            self._update_coverage(exchange, name, seg_start, min(seg_end, closed_until))
+            yield from (x for x in candles if x.timestamp >= yield_start)
+
+    def _get_segments(self, exchange: str, name: str, start: float, end: float) -> List[_Segment]:
+        coverage = self._get_coverage(exchange, name)
+        segments: List[_Segment] = []
+
+        def add_network(_start: float, _end: float, yield_start: float):
+            if segments and not segments[-1][0] and segments[-1][2] == _start:
+                segments[-1] = (False, segments[-1][1], _end, segments[-1][3])
+            else:
+                segments.append((False, _start, _end, yield_start))
+
+        day_start = start // DAY_SECONDS * DAY_SECONDS
+        while day_start < end:
+            lo = max(start, day_start)
+            hi = min(end, day_start + DAY_SECONDS)
+            covered_until = coverage.get(self.store.get_day_name(day_start), day_start)
+            if lo < covered_until:
+                segments.append((True, lo, min(hi, covered_until), lo))
+            if hi > covered_until:
+                add_network(covered_until, hi, lo)
+            day_start += DAY_SECONDS
+        return segments
+
+    def _get_coverage_path(self, exchange: str, name: str) -> Path:
+        return self.store.directory / exchange / name / '_coverage.json'
+
+    def _get_coverage(self, exchange: str, name: str) -> Dict[str, float]:
+        path = self._get_coverage_path(exchange, name)
+        with self._lock:
+            coverage = self._coverages.get(path)
+            if coverage is None:
+                try:
+                    with path.open() as f:
+                        coverage = json.load(f)
+                except FileNotFoundError:
+                    coverage = {}
+                self._coverages[path] = coverage
+            return dict(coverage)
+
+    def _update_coverage(self, exchange: str, name: str, start: float, end: float):
+        """candles of [start, end) are stored. start is covered_until of its day"""
+        self._get_coverage(exchange, name)
+        path = self._get_coverage_path(exchange, name)
+        with self._lock:
+            coverage = self._coverages[path]
+            day_start = start // DAY_SECONDS * DAY_SECONDS
+            while day_start < end:
+                day = self.store.get_day_name(day_start)
+                covered_until = min(end, day_start + DAY_SECONDS)
+                if covered_until > coverage.get(day, day_start):
+                    coverage[day] = covered_until
+                day_start += DAY_SECONDS
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_name(f'{path.name}.{os.getpid()}.tmp')
+            with tmp_path.open('w') as f:
+                json.dump(coverage, f)
+            os.replace(str(tmp_path), str(path))
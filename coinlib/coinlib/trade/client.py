@@ -1,32 +1,72 @@
 from abc import abstractmethod, ABC
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+import contextvars
 import logging
-from typing import Dict, Hashable, cast, Type, Optional, Iterable, Iterator, List
+import time
+from typing import Dict, Hashable, cast, Type, Optional, Iterable, Iterator, List, Callable, Any, Union, TYPE_CHECKING
 
 from requests.structures import CaseInsensitiveDict
 
 from coinlib.datatypes import Instrument, OrderBook, Order, Execution, Ticker, Balance
 from coinlib.datatypes.candle import Candle
-from coinlib.datatypes.order import OrderType
+from coinlib.datatypes.order import OrderRequest, OrderType
 from coinlib.datatypes.position import Position
+from coinlib.errors import NotSupportedError
+from coinlib.trade.instrumentregistry import InstrumentMetadata, InstrumentRegistry, default_registry
 from coinlib.trade.restapi import RestApi
+from coinlib.utils.pagination import iter_pages
+
+if TYPE_CHECKING:
+    from coinlib.trade.asyncclient import AsyncClient
+    from coinlib.trade.candlecache import CandleCache
 
 logger = logging.getLogger(__name__)
 
+# replaces sending of Client.fetch() and Client._iter_pages() in this context. see AsyncClient
+_fetcher: contextvars.ContextVar = contextvars.ContextVar('fetcher', default=None)
+
+
+class ExecutionRangeKey:
+    """key of get_public_executions_range()"""
+    ID = 'id'
+    # unix time milliseconds
+    TIME_MS = 'time_ms'
+
 
 class Client(ABC):
     REST_API_CLASS: Type[RestApi] = None
+    # None if get_public_executions_range() is not supported
+    EXECUTION_RANGE_KEY: Optional[str] = None
 
-    def __init__(self, credential: dict = None, **kwargs):
-        credential = credential or {}
-        self.credential = credential
+    def __init__(self, credential: Union[dict, List[dict]] = None, *,
+                 instrument_registry: Optional[InstrumentRegistry] = default_registry,
+                 prefetch_pages: int = 1, candle_cache: 'CandleCache' = None, **kwargs):
+        """
+        :param credential: credential or list of credentials. see RestApi
+        :param instrument_registry: instruments and currencies are shared through registry. None to disable
+        :param prefetch_pages: pages of paginated iterators fetched ahead in background. 0 to disable
+        :param candle_cache: closed candles of get_candles() are served from cache. see coinlib.trade.candlecache
+        """
         self.api = self.REST_API_CLASS(credential, **kwargs)
+        # first one if list of credentials
+        if isinstance(credential, (list, tuple)):
+            credential = credential[0]
+        self.credential = credential or {}
+        self.instrument_registry = instrument_registry
+        self.prefetch_pages = prefetch_pages
+        self.candle_cache = candle_cache
 
         self._instruments: Dict[str, Instrument] = CaseInsensitiveDict()
         self._rinstruments: Dict[str, str] = CaseInsensitiveDict()
         self._currencies: Dict[str, str] = CaseInsensitiveDict()
         self._rcurrencies: Dict[str, str] = CaseInsensitiveDict()
 
+    def to_async(self, **kwargs) -> 'AsyncClient':
+        """return asyncio facade of this client. aiohttp required"""
+        from coinlib.trade.asyncclient import AsyncClient
+        return AsyncClient(self, **kwargs)
+
     @property
     def api_key(self) -> str:
         return self.credential.get('api_key')
@@ -35,45 +75,80 @@ class Client(ABC):
     def api_secret(self) -> str:
         return self.credential.get('api_secret')
 
+    def fetch(self, method_name: str, path: str, params: dict) -> Any:
+        """
+        request by method of api (e.g. 'public_get'). converters request through public_*() and private_*().
+        AsyncClient replaces this in its context to await the request
+        """
+        fetcher = _fetcher.get()
+        if fetcher is not None:
+            return fetcher(method_name, path, params)
+        return getattr(self.api, method_name)(path, **params)
+
     def public_get(self, path: str, **kwargs):
-        return self.api.public_get(path, **kwargs)
+        return self.fetch('public_get', path, kwargs)
+
+    def public_get_iter(self, path: str, **kwargs) -> Iterator[Any]:
+        return self.fetch('public_get_iter', path, kwargs)
 
     def public_post(self, path: str, **kwargs):
-        return self.api.public_post(path, **kwargs)
+        return self.fetch('public_post', path, kwargs)
 
     def public_put(self, path: str, **kwargs):
-        return self.api.public_put(path, **kwargs)
+        return self.fetch('public_put', path, kwargs)
 
     def public_patch(self, path: str, **kwargs):
-        return self.api.public_patch(path, **kwargs)
+        return self.fetch('public_patch', path, kwargs)
 
     def public_delete(self, path: str, **kwargs):
-        return self.api.public_delete(path, **kwargs)
+        return self.fetch('public_delete', path, kwargs)
 
     def private_get(self, path: str, **kwargs):
-        return self.api.private_get(path, **kwargs)
+        return self.fetch('private_get', path, kwargs)
+
+    def private_get_iter(self, path: str, **kwargs) -> Iterator[Any]:
+        return self.fetch('private_get_iter', path, kwargs)
 
     def private_post(self, path: str, **kwargs):
-        return self.api.private_post(path, **kwargs)
+        return self.fetch('private_post', path, kwargs)
 
     def private_put(self, path: str, **kwargs):
-        return self.api.private_put(path, **kwargs)
+        return self.fetch('private_put', path, kwargs)
 
     def private_patch(self, path: str, **kwargs):
-        return self.api.private_patch(path, **kwargs)
+        return self.fetch('private_patch', path, kwargs)
 
     def private_delete(self, path: str, **kwargs):
-        return self.api.private_delete(path, **kwargs)
+        return self.fetch('private_delete', path, kwargs)
 
     @abstractmethod
     def get_instruments(self) -> Dict[str, Instrument]:
         pass
 
+    def get_instrument_registry_name(self) -> str:
+        """Override if instruments differ between clients of same RestApi"""
+        return self.api.NAME or type(self).__module__.split('.')[0]
+
+    def _fetch_instrument_metadata(self) -> InstrumentMetadata:
+        instruments = self.get_instruments()
+        # get_currencies() may refer self.instruments
+        self._instruments = CaseInsensitiveDict({k.upper(): v for k, v in instruments.items()})
+        return InstrumentMetadata(timestamp=time.time(), instruments=instruments, currencies=self.get_currencies())
+
     @property
     def instruments(self) -> Dict[str, Instrument]:
         if not self._instruments:
-            instrument_map = CaseInsensitiveDict({k.upper(): v for k, v in self.get_instruments().items()})
-            self._instruments = instrument_map
+            if self.instrument_registry:
+                metadata = self.instrument_registry.get(self.get_instrument_registry_name(),
+                                                        self._fetch_instrument_metadata)
+                self._instruments = metadata.instruments
+                self._rinstruments = metadata.rinstruments
+                if not self._currencies:
+                    self._currencies = metadata.currencies
+                    self._rcurrencies = metadata.rcurrencies
+            else:
+                instrument_map = CaseInsensitiveDict({k.upper(): v for k, v in self.get_instruments().items()})
+                self._instruments = instrument_map
         return cast(Dict[str, Instrument], self._instruments)
 
     @instruments.setter
@@ -96,6 +171,9 @@ class Client(ABC):
 
     @property
     def currencies(self) -> Dict[str, str]:
+        if not self._currencies and self.instrument_registry and not self._instruments:
+            # loaded with instruments
+            _ = self.instruments
         if not self._currencies:
             currency_map = CaseInsensitiveDict({k.upper(): v for k, v in self.get_currencies().items()})
             self._currencies = currency_map
@@ -121,12 +199,97 @@ class Client(ABC):
     def get_order_book(self, instrument: str, *, params: dict = None) -> OrderBook:
         pass
 
+    def get_tickers(self, instruments: Iterable[str] = None) -> Dict[str, Ticker]:
+        """
+        get_ticker() of instruments concurrently. override if server has multi-instrument endpoint
+        :param instruments: all instruments if None
+        :return: instrument -> Ticker
+        """
+        return self._map_instruments(self.get_ticker, instruments)
+
+    def get_order_books(self, instruments: Iterable[str] = None) -> Dict[str, OrderBook]:
+        """
+        get_order_book() of instruments concurrently. override if server has multi-instrument endpoint
+        :param instruments: all instruments if None
+        :return: instrument -> OrderBook
+        """
+        return self._map_instruments(self.get_order_book, instruments)
+
+    def _map_instruments(self, func: Callable[[str], Any], instruments: Iterable[str] = None) -> Dict[str, Any]:
+        """call func for each instrument in threads as many as sessions of session pool"""
+        if instruments is None:
+            instruments = self.instruments.keys()
+        instruments = list(instruments)
+        if len(instruments) <= 1:
+            return {x: func(x) for x in instruments}
+        max_workers = min(len(instruments), self.api.session_pool.pool_size or len(instruments))
+        # deadline of caller is passed to threads
+        context = contextvars.copy_context()
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return dict(zip(instruments, executor.map(lambda x: context.copy().run(func, x), instruments)))
+
+    def _iter_pages(self, fetch_page: Callable[[Any], Any], next_cursor: Callable[[Any, Any], Any],
+                    cursor: Any = None) -> Iterator[Any]:
+        """pages of paginated request prefetched by prefetch_pages. see coinlib.utils.pagination.iter_pages()"""
+        fetcher = _fetcher.get()
+        if fetcher is not None:
+            return fetcher.iter_pages(fetch_page, next_cursor, cursor)
+        return iter_pages(fetch_page, next_cursor, cursor, look_ahead=self.prefetch_pages)
+
+    def _map_private(self, func: Callable[[Any], Any], items: Iterable[Any]) -> List[Union[Any, Exception]]:
+        """
+        call func for each item in threads as many as private requests in flight at once
+        :return: result or raised exception for each item in input order
+        """
+        items = list(items)
+
+        def _call(x):
+            try:
+                return func(x)
+            except Exception as e:
+                return e
+
+        if len(items) <= 1:
+            return [_call(x) for x in items]
+        max_workers = min(len(items), self.api.private_concurrency * len(self.api.key_pool))
+        context = contextvars.copy_context()
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(lambda x: context.copy().run(_call, x), items))
+
     @abstractmethod
     def get_public_executions(self, instrument: str, *, params: dict = None) -> Iterator[Execution]:
         """time descending order"""
 
-    def get_candles(self, instrument: str, candle_size: str, *, params: dict = None) -> Iterator[Candle]:
-        """time descending order"""
+    def get_public_executions_range(self, instrument: str, start: int, end: int) -> Iterator[Execution]:
+        """
+        executions of which key(EXECUTION_RANGE_KEY) is in [start, end) in ascending order.
+        used by coinlib.trade.backfill.Backfill
+        """
+        raise NotSupportedError('not supported')
+
+    def get_candles(self, instrument: str, candle_size: str, *, start: float, end: float = None,
+                    params: dict = None) -> Iterator[Candle]:
+        """
+        candles of which timestamp(start of period) is in [start, end) in time ascending order
+        :param candle_size: resolution. e.g. '1m', '1h', '1d'
+        :param end: now if None
+        :param params: extra request parameters. candle_cache is not used if specified
+        """
+        if end is None:
+            end = time.time()
+        if self.candle_cache is None or params:
+            return self._fetch_candles(instrument, candle_size, start, end, params=params)
+
+        def fetch(_start: float, _end: float) -> Iterator[Candle]:
+            return self._fetch_candles(instrument, candle_size, _start, _end)
+
+        return self.candle_cache.get_candles(fetch, self.get_instrument_registry_name(), instrument, candle_size,
+                                             start, end)
+
+    def _fetch_candles(self, instrument: str, candle_size: str, start: float, end: float, *,
+                       params: dict = None) -> Iterator[Candle]:
+        """Override. candles of [start, end) from server in time ascending order"""
+        raise NotSupportedError('not supported')
 
     # private methods
 
@@ -171,6 +334,15 @@ class Client(ABC):
         """
         pass
 
+    def submit_orders(self, orders: Iterable[OrderRequest]) -> List[Union[Order, Exception]]:
+        """
+        submit_order() of orders concurrently. override if server has batch endpoint
+        :return: Order or raised exception for each order in input order
+        """
+        return self._map_private(lambda x: self.submit_order(x.instrument, x.order_type, x.side, x.price, x.qty,
+                                                             margin=x.margin, leverage=x.leverage,
+                                                             params=x.params), orders)
+
     def submit_market_order(self, instrument: str, side: str, qty: float,
                             *, margin: bool = False, leverage: float = None, params: dict = None) -> Order:
         return self.submit_order(instrument, OrderType.MARKET, side, None, qty,
@@ -190,6 +362,24 @@ class Client(ABC):
         """
         pass
 
+    def cancel_orders(self, order_ids: Iterable[Hashable]) -> List[Union[Optional[Order], Exception]]:
+        """
+        cancel_order() of order_ids concurrently. override if server has batch endpoint
+        :return: result of cancel_order() or raised exception for each order in input order
+        """
+        return self._map_private(self.cancel_order, order_ids)
+
+    def cancel_all(self, instrument: str = None):
+        """
+        cancel all active orders. override if server has mass cancel endpoint
+        :param instrument: orders of all instruments if None (instrument is required by some servers)
+        :raise: first error of cancels after all orders are tried
+        """
+        order_ids = [x.order_id for x in self.get_orders(instrument=instrument, active_only=True)]
+        for res in self.cancel_orders(order_ids):
+            if isinstance(res, Exception):
+                raise res
+
     @abstractmethod
     def update_order(self, order_id: Hashable, *, params: dict = None) -> Optional[Order]:
         """
@@ -0,0 +1,68 @@
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Tuple
+
+from coinlib.datatypes import ExecutionBatch, ExecutionSide
+from coinlib.datatypes.executionbatch import np
+from coinlib.datatypes.streamdata import StreamData
+from coinlib.utils.threadmixin import ThreadMixin
+
+logger = logging.getLogger(__name__)
+
+# (execution_id, timestamp, side, price, qty, raw-data)
+ExecutionRow = Tuple[Hashable, float, str, float, float, Any]
+OnBatchCallback = Callable[[StreamData], None]
+
+
+class ExecutionBatcher(ThreadMixin):
+    """
+    Collect execution rows per stream key and flush them as ExecutionBatch every interval.
+    """
+
+    def __init__(self, interval: float, on_batch: OnBatchCallback):
+        assert np, 'numpy required'
+        self.interval = interval
+        self.on_batch = on_batch
+        self._thread_data = self.ThreadData()
+        # key -> (timestamps, sides, prices, qtys)
+        self._columns: Dict[Hashable, Tuple[List[float], List[int], List[float], List[float]]] = {}
+        self._lock = threading.Lock()
+
+    def add(self, key: Tuple[str, Hashable], rows: Iterable[ExecutionRow]):
+        with self._lock:
+            timestamps, sides, prices, qtys = self._columns.setdefault(key, ([], [], [], []))
+            for _, timestamp, side, price, qty, _ in rows:
+                timestamps.append(timestamp)
+                sides.append(ExecutionSide.of(side))
+                prices.append(price)
+                qtys.append(qty)
+
+    def flush(self):
+        with self._lock:
+            columns_map, self._columns = self._columns, {}
+        for key, columns in columns_map.items():
+            if columns[0]:
+                self.on_batch(StreamData(key, self.to_batch(key[1], *columns)))
+
+    @staticmethod
+    def to_batch(instrument: str, timestamps: List[float], sides: List[int],
+                 prices: List[float], qtys: List[float]) -> ExecutionBatch:
+        timestamp = np.array(timestamps, dtype=np.float64)
+        side = np.array(sides, dtype=np.int8)
+        price = np.array(prices, dtype=np.float64)
+        qty = np.array(qtys, dtype=np.float64)
+        if len(timestamp) > 1 and (np.diff(timestamp) < 0).any():
+            index = np.argsort(timestamp, kind='stable')
+            timestamp, side, price, qty = timestamp[index], side[index], price[index], qty[index]
+        return ExecutionBatch(instrument=instrument, timestamp=timestamp, price=price, qty=qty, side=side)
+
+    def run(self):
+        try:
+            while self.is_active():
+                time.sleep(self.interval)
+                self.flush()
+        except Exception as e:
+            logger.exception(e)
+        finally:
+            self.flush()
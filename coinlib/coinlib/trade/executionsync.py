@@ -0,0 +1,148 @@
+from dataclasses import dataclass, field
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+import threading
+from typing import Dict, Hashable, Iterator, List, Optional, Union
+
+from coinlib.datatypes import Execution
+from coinlib.utils.pagination import prefetch
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SyncCursor:
+    """position of executions already synced"""
+    # timestamp of newest synced execution
+    timestamp: float
+    # ids of synced executions at timestamp. executions of same timestamp may be split between runs
+    execution_ids: List[Hashable] = field(default_factory=list)
+
+
+class CursorStore:
+    """
+    SyncCursor per (exchange, credential, instrument).
+    if directory is specified, cursors are persisted as a json file per exchange and credential.
+    """
+    VERSION = 1
+
+    def __init__(self, directory: Union[str, Path] = None):
+        self.directory = Path(directory) if directory else None
+        self._cursors: Dict[str, Dict[str, SyncCursor]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def get_name(exchange: str, api_key: Optional[str]) -> str:
+        # api key is not written as it is
+        digest = hashlib.sha256((api_key or '').encode()).hexdigest()[:16]
+        return f'{exchange}-{digest}'
+
+    def get(self, name: str, instrument: str) -> Optional[SyncCursor]:
+        with self._lock:
+            return self._get_cursors(name).get(instrument)
+
+    def set(self, name: str, instrument: str, cursor: SyncCursor):
+        with self._lock:
+            cursors = self._get_cursors(name)
+            cursors[instrument] = cursor
+            self._save_file(name, cursors)
+
+    def _get_cursors(self, name: str) -> Dict[str, SyncCursor]:
+        cursors = self._cursors.get(name)
+        if cursors is None:
+            cursors = self._cursors[name] = self._load_file(name)
+        return cursors
+
+    def _get_path(self, name: str) -> Path:
+        return self.directory / f'{name}.json'
+
+    def _load_file(self, name: str) -> Dict[str, SyncCursor]:
+        if not self.directory:
+            return {}
+        try:
+            with self._get_path(name).open() as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return {}
+        if data.get('version') != self.VERSION:
+            logger.warning(f'cursors of other version {self._get_path(name)} are ignored')
+            return {}
+        return {k: SyncCursor(**v) for k, v in data['cursors'].items()}
+
+    def _save_file(self, name: str, cursors: Dict[str, SyncCursor]):
+        if not self.directory:
+            return
+        data = {
+            'version': self.VERSION,
+            'cursors': {k: dict(timestamp=v.timestamp, execution_ids=v.execution_ids) for k, v in cursors.items()},
+        }
+        path = self._get_path(name)
+        tmp_path = path.with_name(f'{path.name}.{os.getpid()}.tmp')
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with tmp_path.open('w') as f:
+            json.dump(data, f)
+        os.replace(str(tmp_path), str(path))
+
+
+class ExecutionSync:
+    """
+    Incremental sync of private executions.
+    Client.get_private_executions() (time descending) is read until the cursor, so usually one page is requested.
+
+        sync = ExecutionSync(client, CursorStore('cursors'))
+        # every minute
+        for execution in sync.iter_new_executions('BTC_JPY'):
+            save(execution)
+
+    new executions are yielded in time ascending order.
+    cursor is saved after all of them are consumed, so interrupted run yields them again next time.
+    """
+
+    def __init__(self, client, cursor_store: CursorStore = None):
+        self.client = client
+        self.cursor_store = cursor_store or CursorStore()
+        exchange = client.get_instrument_registry_name()
+        self.name = self.cursor_store.get_name(exchange, client.api_key)
+
+    def get_cursor(self, instrument: str) -> Optional[SyncCursor]:
+        return self.cursor_store.get(self.name, instrument)
+
+    def fetch_new_executions(self, instrument: str, since: float = None) -> List[Execution]:
+        """
+        executions newer than cursor in time descending order. cursor is not updated
+        :param since: timestamp to start from if no cursor. all executions if None
+        """
+        cursor = self.get_cursor(instrument)
+        if cursor is None and since is not None:
+            cursor = SyncCursor(timestamp=since)
+        synced_ids = set(cursor.execution_ids) if cursor else set()
+        executions = []
+        # pages after the cursor are not prefetched
+        with prefetch(0):
+            for execution in self.client.get_private_executions(instrument):
+                if cursor is not None and execution.timestamp < cursor.timestamp:
+                    break
+                if cursor is not None and execution.timestamp == cursor.timestamp \
+                        and execution.execution_id in synced_ids:
+                    continue
+                executions.append(execution)
+        return executions
+
+    def iter_new_executions(self, instrument: str, since: float = None) -> Iterator[Execution]:
+        """executions newer than cursor in time ascending order. see fetch_new_executions()"""
+        executions = self.fetch_new_executions(instrument, since)
+        if not executions:
+            return
+        yield from reversed(executions)
+        self.cursor_store.set(self.name, instrument, self._next_cursor(instrument, executions))
+
+    def _next_cursor(self, instrument: str, executions: List[Execution]) -> SyncCursor:
+        timestamp = max(x.timestamp for x in executions)
+        execution_ids = [x.execution_id for x in executions if x.timestamp == timestamp]
+        cursor = self.get_cursor(instrument)
+        if cursor is not None and cursor.timestamp == timestamp:
+            execution_ids = cursor.execution_ids + execution_ids
+        return SyncCursor(timestamp=timestamp, execution_ids=execution_ids)
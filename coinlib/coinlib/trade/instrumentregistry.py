@@ -0,0 +1,117 @@
+from dataclasses import dataclass, asdict
+import json
+import logging
+import os
+from pathlib import Path
+import threading
+import time
+from typing import Callable, Dict, Union
+
+from requests.structures import CaseInsensitiveDict
+
+from coinlib.datatypes import Instrument
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class InstrumentMetadata:
+    timestamp: float
+    instruments: Dict[str, Instrument]
+    currencies: Dict[str, str]
+    rinstruments: Dict[str, str] = None
+    rcurrencies: Dict[str, str] = None
+
+    def __post_init__(self):
+        self.instruments = CaseInsensitiveDict({k.upper(): v for k, v in self.instruments.items()})
+        self.currencies = CaseInsensitiveDict({k.upper(): v for k, v in self.currencies.items()})
+        self.rinstruments = CaseInsensitiveDict({str(v.name_id).upper(): k for k, v in self.instruments.items()})
+        self.rcurrencies = CaseInsensitiveDict({v.upper(): k.upper() for k, v in self.currencies.items()})
+
+
+class InstrumentRegistry:
+    """
+    Instruments and currencies of exchanges shared by clients in process.
+    if directory is specified, they are persisted as json files and reused by other processes.
+    metadata older than ttl seconds or saved by other VERSION is loaded again.
+    """
+    VERSION = 1
+
+    def __init__(self, directory: Union[str, Path] = None, *, ttl: float = 24 * 60 * 60):
+        self.directory = Path(directory) if directory else None
+        self.ttl = ttl
+        self._entries: Dict[str, InstrumentMetadata] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def get(self, name: str, loader: Callable[[], InstrumentMetadata]) -> InstrumentMetadata:
+        """
+        :param name: exchange name
+        :param loader: fetch metadata from server. called once at the same time
+        """
+        with self._lock:
+            name_lock = self._locks.setdefault(name, threading.Lock())
+        with name_lock:
+            metadata = self._entries.get(name)
+            if metadata is None or self._is_expired(metadata):
+                metadata = self._load_file(name)
+            if metadata is None or self._is_expired(metadata):
+                metadata = loader()
+                self._save_file(name, metadata)
+            self._entries[name] = metadata
+            return metadata
+
+    def invalidate(self, name: str):
+        with self._lock:
+            self._entries.pop(name, None)
+        if self.directory:
+            try:
+                self._get_path(name).unlink()
+            except FileNotFoundError:
+                pass
+
+    def _is_expired(self, metadata: InstrumentMetadata) -> bool:
+        return metadata.timestamp + self.ttl <= time.time()
+
+    def _get_path(self, name: str) -> Path:
+        return self.directory / f'{name}.json'
+
+    def _load_file(self, name: str) -> Union[InstrumentMetadata, None]:
+        if not self.directory:
+            return None
+        try:
+            with self._get_path(name).open() as f:
+                data = json.load(f)
+            if data.get('version') != self.VERSION:
+                return None
+            return InstrumentMetadata(timestamp=data['timestamp'],
+                                      instruments={k: Instrument(**v) for k, v in data['instruments'].items()},
+                                      currencies=data['currencies'])
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f'failed to load instruments name={name} {e}')
+            return None
+
+    def _save_file(self, name: str, metadata: InstrumentMetadata):
+        if not self.directory:
+            return
+        data = {
+            'version': self.VERSION,
+            'timestamp': metadata.timestamp,
+            'instruments': {k: asdict(v) for k, v in metadata.instruments.items()},
+            'currencies': dict(metadata.currencies),
+        }
+        path = self._get_path(name)
+        tmp_path = path.with_name(f'{path.name}.{os.getpid()}.tmp')
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            with tmp_path.open('w') as f:
+                json.dump(data, f)
+            os.replace(str(tmp_path), str(path))
+        except Exception as e:
+            logger.warning(f'failed to save instruments name={name} {e}')
+
+
+# shared in process. persisted only if environment variable 'COINLIB_INSTRUMENTS_DIR' is set
+default_registry = InstrumentRegistry(os.environ.get('COINLIB_INSTRUMENTS_DIR') or None)
@@ -0,0 +1,81 @@
+import math
+import threading
+from typing import Callable, List, Optional
+
+from coinlib.trade.auth import Auth
+from coinlib.utils.tokenbucket import TokenBucket
+
+GetLimiter = Callable[[Auth], Optional[TokenBucket]]
+
+
+class KeySlot:
+    """An api key in KeyPool"""
+
+    def __init__(self, auth: Auth, concurrency: int):
+        self.auth = auth
+        self.concurrency = concurrency
+        # nonce ordering is kept per key by limiting requests in flight per key
+        self.semaphore = threading.BoundedSemaphore(concurrency)
+        # for AsyncRestApi. created in event loop
+        self.async_semaphore = None
+        # selected and not released yet
+        self.in_flight = 0
+
+
+class KeyPool:
+    """
+    Spread private requests over api keys.
+    schedule:
+        LEAST_LOADED: key with fewest requests in flight. ties are broken by remaining rate limit tokens
+        ROUND_ROBIN: keys in turn
+    keys without rate limit tokens are skipped while other keys have tokens.
+    """
+    LEAST_LOADED = 'least_loaded'
+    ROUND_ROBIN = 'round_robin'
+
+    def __init__(self, auths: List[Auth], concurrency: int, schedule: str = LEAST_LOADED):
+        assert auths, 'no auth'
+        assert schedule in (self.LEAST_LOADED, self.ROUND_ROBIN), f'invalid schedule={schedule}'
+        self.slots = [KeySlot(x, concurrency) for x in auths]
+        self.schedule = schedule
+        self._counter = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.slots)
+
+    def select(self, get_limiter: GetLimiter) -> KeySlot:
+        """select a key. call release() after the request"""
+        with self._lock:
+            if len(self.slots) == 1:
+                slot = self.slots[0]
+            elif self.schedule == self.ROUND_ROBIN:
+                slot = self._select_round_robin(get_limiter)
+            else:
+                slot = self._select_least_loaded(get_limiter)
+            slot.in_flight += 1
+            return slot
+
+    def release(self, slot: KeySlot):
+        with self._lock:
+            slot.in_flight -= 1
+
+    def _select_round_robin(self, get_limiter: GetLimiter) -> KeySlot:
+        n = len(self.slots)
+        slots = [self.slots[(self._counter + i) % n] for i in range(n)]
+        self._counter = (self._counter + 1) % n
+        for slot in slots:
+            if _get_tokens(get_limiter(slot.auth)) >= 1:
+                return slot
+        return slots[0]
+
+    def _select_least_loaded(self, get_limiter: GetLimiter) -> KeySlot:
+        def _load(slot: KeySlot):
+            tokens = _get_tokens(get_limiter(slot.auth))
+            return tokens < 1, slot.in_flight, -tokens
+
+        return min(self.slots, key=_load)
+
+
+def _get_tokens(limiter: Optional[TokenBucket]) -> float:
+    return limiter.tokens if limiter else math.inf
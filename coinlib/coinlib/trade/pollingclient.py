@@ -0,0 +1,240 @@
+from concurrent.futures import ThreadPoolExecutor
+import contextvars
+import dataclasses
+import logging
+import threading
+import time
+from typing import Any, Dict, Hashable, List, Set, Tuple
+
+from coinlib.datatypes import Execution
+from coinlib.datatypes.streamdata import StreamData, StreamType
+from coinlib.trade.executionsync import ExecutionSync
+from coinlib.trade.streamapi import OnDataCallback
+from coinlib.utils.pagination import prefetch
+from coinlib.utils.threadmixin import ThreadMixin
+
+logger = logging.getLogger(__name__)
+
+# fields not compared to detect change
+_VOLATILE_FIELDS = {'timestamp', '_data'}
+
+
+def fingerprint(data: Any) -> Any:
+    """comparable value of data without timestamps and raw data"""
+    if dataclasses.is_dataclass(data):
+        return tuple(fingerprint(getattr(data, x.name)) for x in dataclasses.fields(data)
+                     if x.name not in _VOLATILE_FIELDS)
+    if isinstance(data, dict):
+        return tuple((k, fingerprint(v)) for k, v in data.items())
+    if isinstance(data, (list, tuple)):
+        return tuple(fingerprint(x) for x in data)
+    return data
+
+
+class PollingClient(ThreadMixin):
+    """
+    Poll REST methods of Client and publish results as StreamData like StreamClient.
+    for servers without websocket or data without stream channel (e.g. balances).
+
+        with PollingClient(client, on_data=print, interval=2) as poller:
+            poller.subscribe(ticker='BTC_JPY', private_balance='JPY')
+
+    stream types and data:
+        TICKER, ORDER_BOOK(instrument): Ticker, OrderBook
+        EXECUTION, PRIVATE_EXECUTION(instrument): List[Execution] newer than previous poll (time ascending)
+        PRIVATE_BALANCE(currency or None for all): List[Balance]
+        PRIVATE_ORDER(instrument or None): List[Order] of active orders
+        PRIVATE_POSITION(instrument or None): List[Position] of active positions
+
+    data equal to previous one except timestamp is not published.
+    interval is stretched while tokens of rate limiter of client are less than headroom of capacity,
+    and doubled after each failed poll (up to max_interval). errors are logged.
+    """
+
+    def __init__(self, client, *, on_data: OnDataCallback = None, interval: float = 1.0,
+                 max_interval: float = 60.0, headroom: float = 0.5, max_workers: int = 4):
+        """
+        :param client: coinlib.trade.client.Client
+        :param interval: seconds between polls of a key when rate limit has headroom
+        :param headroom: ratio of remaining tokens to capacity of rate limiter below which interval is stretched
+        :param max_workers: keys polled at once
+        """
+        self.client = client
+        self.on_data = on_data or (lambda *_: None)
+        self.interval = interval
+        self.max_interval = max_interval
+        self.headroom = headroom
+        self.max_workers = max_workers
+        self._thread_data = self.ThreadData()
+        self._subscription_keys: Set[Tuple[str, Hashable]] = set()
+        # key -> unix time of next poll
+        self._next_times: Dict[Tuple[str, Hashable], float] = {}
+        self._in_flight: Set[Tuple[str, Hashable]] = set()
+        # key -> consecutive failures
+        self._failures: Dict[Tuple[str, Hashable], int] = {}
+        # key -> fingerprint of last published data
+        self._last_values: Dict[Tuple[str, Hashable], Any] = {}
+        # key -> (timestamp, execution ids at timestamp) of newest published public execution
+        self._execution_cursors: Dict[Tuple[str, Hashable], Tuple[float, Set[Hashable]]] = {}
+        self._execution_sync: ExecutionSync = None
+        self._subscribed_at: Dict[Tuple[str, Hashable], float] = {}
+        self._wakeup = threading.Event()
+        self._lock = threading.Lock()
+        self._on_data_lock = threading.Lock()
+        self._executor: ThreadPoolExecutor = None
+
+    def is_connected(self) -> bool:
+        return self.is_active()
+
+    def open(self):
+        assert not self.is_active(), 'already opened'
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        self.start()
+
+    def close(self):
+        assert self.is_active(), 'not opened'
+        self.stop()
+        self._wakeup.set()
+        self.join()
+        self._executor.shutdown(wait=True)
+        self._executor = None
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def subscribe(self, **kwargs: Hashable):
+        """
+        example)
+        obj.subscribe(ticker='BTC_JPY', private_order='BTC_JPY')
+        """
+        with self._lock:
+            for key in kwargs.items():
+                if key not in self._subscription_keys:
+                    self._subscription_keys.add(key)
+                    self._subscribed_at[key] = self._next_times[key] = time.time()
+        self._wakeup.set()
+
+    def unsubscribe(self, **kwargs: Hashable):
+        with self._lock:
+            for key in kwargs.items():
+                self._subscription_keys.discard(key)
+                self._next_times.pop(key, None)
+                self._failures.pop(key, None)
+                self._last_values.pop(key, None)
+                self._execution_cursors.pop(key, None)
+                self._subscribed_at.pop(key, None)
+
+    def run(self):
+        while self.is_active():
+            self._wakeup.clear()
+            now = time.time()
+            with self._lock:
+                due = [k for k, t in self._next_times.items() if t <= now and k not in self._in_flight]
+                self._in_flight.update(due)
+                waiting = [t for k, t in self._next_times.items() if k not in self._in_flight]
+            for key in due:
+                # deadline of caller is passed to worker
+                context = contextvars.copy_context()
+                self._executor.submit(context.run, self._poll_key, key)
+            timeout = min(waiting) - now if waiting else self.max_interval
+            self._wakeup.wait(max(min(timeout, self.max_interval), 0.01))
+
+    def _poll_key(self, key: Tuple[str, Hashable]):
+        try:
+            data = self.poll(key)
+        except Exception as e:
+            logger.warning(f'failed to poll {key} {e}')
+            data = None
+            failures = self._failures[key] = self._failures.get(key, 0) + 1
+        else:
+            failures = self._failures[key] = 0
+        try:
+            if data is not None and key in self._subscription_keys:
+                self._publish(key, data)
+        except Exception as e:
+            logger.exception(f'on_data raised {e}')
+        finally:
+            with self._lock:
+                self._in_flight.discard(key)
+                if key in self._subscription_keys:
+                    self._next_times[key] = time.time() + self.get_interval(key, failures)
+            self._wakeup.set()
+
+    def _publish(self, key: Tuple[str, Hashable], data: Any):
+        if key[0] not in (StreamType.EXECUTION, StreamType.PRIVATE_EXECUTION):
+            value = fingerprint(data)
+            if key in self._last_values and self._last_values[key] == value:
+                return
+            self._last_values[key] = value
+        elif not data:
+            return
+        with self._on_data_lock:
+            self.on_data(StreamData(key, data))
+
+    def get_interval(self, key: Tuple[str, Hashable], failures: int = 0) -> float:
+        """seconds until next poll of key"""
+        is_private = key[0].startswith('private_')
+        limiter = self.client.api.get_rate_limiter('GET', '', is_private)
+        interval = self.interval
+        if limiter is not None:
+            ratio = limiter.tokens / limiter.capacity
+            if ratio < self.headroom:
+                interval *= self.headroom / max(ratio, self.headroom / 10)
+        interval *= 2 ** min(failures, 10)
+        return min(interval, self.max_interval)
+
+    def poll(self, key: Tuple[str, Hashable]) -> Any:
+        """
+        Override to support other stream types.
+        :return: data of StreamData. None if nothing to publish
+        """
+        stream_type, value = key
+        if stream_type == StreamType.TICKER:
+            return self.client.get_ticker(value)
+        if stream_type == StreamType.ORDER_BOOK:
+            return self.client.get_order_book(value)
+        if stream_type == StreamType.EXECUTION:
+            return self._poll_executions(key)
+        if stream_type == StreamType.PRIVATE_EXECUTION:
+            if self._execution_sync is None:
+                self._execution_sync = ExecutionSync(self.client)
+            since = self._subscribed_at.get(key, time.time())
+            return list(self._execution_sync.iter_new_executions(value, since=since))
+        if stream_type == StreamType.PRIVATE_BALANCE:
+            return [x for x in self.client.get_balances_list() if value is None or x.currency == value]
+        if stream_type == StreamType.PRIVATE_ORDER:
+            return list(self.client.get_orders(instrument=value))
+        if stream_type == StreamType.PRIVATE_POSITION:
+            return list(self.client.get_positions(instrument=value))
+        raise ValueError(f'not supported stream type {key}')
+
+    def _poll_executions(self, key: Tuple[str, Hashable]) -> List[Execution]:
+        """public executions newer than previous poll. first poll only remembers the newest one"""
+        cursor = self._execution_cursors.get(key)
+        executions = []
+        # pages behind the cursor are not fetched
+        with prefetch(0):
+            for execution in self.client.get_public_executions(key[1]):
+                if cursor is None:
+                    executions.append(execution)
+                    break
+                timestamp, ids = cursor
+                if execution.timestamp < timestamp:
+                    break
+                if execution.timestamp == timestamp and execution.execution_id in ids:
+                    continue
+                executions.append(execution)
+        if not executions:
+            return []
+        newest = max(x.timestamp for x in executions)
+        ids = {x.execution_id for x in executions if x.timestamp == newest}
+        if cursor is not None and cursor[0] == newest:
+            ids |= cursor[1]
+        self._execution_cursors[key] = (newest, ids)
+        if cursor is None:
+            return []
+        return list(reversed(executions))
@@ -1,6 +1,6 @@
 import logging
 from collections import deque
-from typing import Dict, Tuple, Hashable, Any
+from typing import Dict, Tuple, Hashable, Any, List
 
 from pubnub.enums import PNStatusCategory
 from pubnub.models.consumer.pubsub import PNMessageResult
@@ -35,7 +35,8 @@ class PubNubStreamApi(StreamApi):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         self._subscription_q = deque()
-        self._channel_name_map: Dict[str, str] = {}
+        self._channel_name_map: Dict[str, Hashable] = {}
+        self._key_channel_map: Dict[Hashable, str] = {}
 
     def subscribe(self, *args: Tuple[Hashable, Any]):
         for key, channel_name in args:
@@ -46,30 +47,53 @@ class PubNubStreamApi(StreamApi):
             self._subscription_q.append(('unsubscribe', (key, '')))
 
     def _process_subscription_q(self, pn: PubNub):
-        # process one
-        if len(self._subscription_q):
+        # process all pending operations by one subscribe and one unsubscribe call
+        subscribes: List[str] = []
+        unsubscribes: List[str] = []
+        # channels subscribed before this batch
+        live = set(self._channel_name_map)
+
+        def _remove(channel_name: str):
+            self._channel_name_map.pop(channel_name, None)
+            if channel_name in subscribes:
+                subscribes.remove(channel_name)
+            if channel_name in live and channel_name not in unsubscribes:
+                unsubscribes.append(channel_name)
+
+        while len(self._subscription_q):
             op, (key, channel_name) = self._subscription_q.popleft()
             if op == 'subscribe':
+                old_channel_name = self._key_channel_map.get(key)
+                if old_channel_name is not None and old_channel_name != channel_name:
+                    # key is moved to other channel
+                    _remove(old_channel_name)
                 self._channel_name_map[channel_name] = key
-                self._subscribe_channel(pn, channel_name)
+                self._key_channel_map[key] = channel_name
+                if channel_name in unsubscribes:
+                    unsubscribes.remove(channel_name)
+                if channel_name not in live and channel_name not in subscribes:
+                    subscribes.append(channel_name)
             elif op == 'unsubscribe':
-                for k, v in self._channel_name_map.items():
-                    if v == key:
-                        self._channel_name_map.pop(k)
-                        self._unsubscribe_channel(pn, k)
-                        break
+                channel_name = self._key_channel_map.pop(key, None)
+                if channel_name is None:
+                    continue
+                _remove(channel_name)
             else:
                 assert False, f'unknown operation={op}'
+        if unsubscribes:
+            self._unsubscribe_channels(pn, unsubscribes)
+        if subscribes:
+            self._subscribe_channels(pn, subscribes)
 
-    def _subscribe_channel(self, pn: PubNub, channel_name: str):
+    def _subscribe_channels(self, pn: PubNub, channel_names: List[str]):
         _ = self
-        pn.subscribe().channels(channel_name).execute()
-        logger.debug(f'subscribe channel={channel_name}')
+        pn.subscribe().channels(channel_names).execute()
+        logger.debug(f'subscribe channels={channel_names}')
 
-    def _unsubscribe_channel(self, pn: PubNub, channel_name: str):
+    def _unsubscribe_channels(self, pn: PubNub, channel_names: List[str]):
         _ = self
-        pn.unsubscribe().channels(channel_name).execute()
-        logger.debug(f'unsubscribe channel={channel_name}')
+        pn.unsubscribe().channels(channel_names).execute()
+        logger.debug(f'unsubscribe channels={channel_names}')
 
     def create_connection(self) -> PubNub:
         pn_config = PNConfiguration()
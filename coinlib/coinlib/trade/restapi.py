@@ -1,43 +1,185 @@
 from abc import ABC
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, TimeoutError as FutureTimeoutError, wait
+import contextlib
+import contextvars
+import datetime
+import email.utils
+import fnmatch
 import json
 import logging
+import math
 import threading
 import time
-from typing import Dict, Union, Type
+from typing import Any, Dict, Iterable, Iterator, List, Union, Type, Tuple, Optional
 
 import requests
 from requests.structures import CaseInsensitiveDict
 
-from coinlib.errors import RetryError, ApiTimeoutError
+from coinlib.errors import RetryError, ApiTimeoutError, RateLimitError
 from coinlib.trade.auth import Auth
+from coinlib.trade.keypool import KeyPool
+from coinlib.trade.restmetrics import RestHook, RequestInfo, normalize_path
+from coinlib.trade.retrypolicy import Idempotency, RetryPolicy, deadline, get_deadline
+from coinlib.utils.hedger import Hedger
+from coinlib.utils.jsonstream import iter_json_array
 from coinlib.utils.sessiopool import SessionPool
+from coinlib.utils.tokenbucket import TokenBucket
+from coinlib.utils.ttlcache import TTLCache
 
 logger = logging.getLogger(__name__)
 
 
+def iter_holding(iterator: Iterator[Any], stack: contextlib.ExitStack) -> Iterator[Any]:
+    """
+    iterator which holds resources of stack (session, key slot, ...) while elements are read.
+    stack is closed when iterator is exhausted, closed, raised or garbage collected
+    """
+    def _iter():
+        with stack:
+            yield None
+            yield from iterator
+
+    it = _iter()
+    # started generator runs finally on close() even if no element is read
+    next(it)
+    return it
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """seconds of Retry-After header (delay-seconds or HTTP-date). None if missing or invalid"""
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        dt = email.utils.parsedate_to_datetime(value)
+        if dt.tzinfo is None:
+            dt = dt.replace(tzinfo=datetime.timezone.utc)
+        return max(dt.timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        logger.warning(f'invalid retry-after header {value!r}')
+        return None
+
+
+def _parse_finite(value: str) -> float:
+    """:raise ValueError: if value is not a finite number"""
+    number = float(value)
+    if not math.isfinite(number):
+        raise ValueError(f'not finite {value!r}')
+    return number
+
+
 class RestApi(ABC):
     NAME: str = ''
     BASE_URL: str = ''
     AUTH_CLASS: Type[Auth] = None
     CONTENT_TYPE: str = 'application/x-www-form-urlencoded'
+    # rate limit class -> (capacity, tokens per second). see get_rate_limit_class()
+    RATE_LIMITS: Dict[str, Tuple[float, float]] = {}
+    # private requests in flight at once per api key. 1 if server requires nonce arrives in increasing order
+    PRIVATE_CONCURRENCY = 1
+    # Idempotency -> RetryPolicy. see get_idempotency()
+    RETRY_POLICIES: Dict[str, RetryPolicy] = {
+        Idempotency.READ: RetryPolicy(),
+        Idempotency.WRITE: RetryPolicy(retry_transport_errors=False),
+        Idempotency.KEYED: RetryPolicy(),
+    }
+
+    # shared by all instances. (NAME, api_key or None, rate limit class) -> TokenBucket
+    _rate_limiters: Dict[Tuple[str, Optional[str], str], TokenBucket] = {}
+    _rate_limiters_lock = threading.Lock()
 
-    def __init__(self, credential: dict = None, *,
+    def __init__(self, credential: Union[dict, List[dict]] = None, *,
                  timeout: float = 60,
                  retry_timeout: float = 300,
                  proxies: Dict[str, str] = None,
                  session_pool_size: int = 4,
+                 session_pool_maxsize: int = None,
+                 session_warm_up: bool = False,
+                 session_keep_alive: float = None,
+                 rate_limit: bool = True,
+                 private_concurrency: int = None,
+                 key_schedule: str = KeyPool.LEAST_LOADED,
+                 cache_ttls: Dict[str, float] = None,
+                 cache_size: int = 1024,
+                 cache_stale_seconds: float = 0,
+                 retry_policies: Dict[str, RetryPolicy] = None,
+                 hedge_paths: Iterable[str] = None,
+                 hedge_percentile: float = 0.95,
+                 hedge_budget: float = 0.05,
+                 hooks: Iterable[RestHook] = None,
                  **kwargs):
+        """
+        :param credential: credential or list of credentials(api keys) private requests are spread over
+        :param session_pool_size: sessions per host
+        :param session_pool_maxsize: pool_maxsize of HTTPAdapter of each session
+        :param session_warm_up: connect sessions to hosts of get_urls() at construction
+        :param session_keep_alive: interval seconds of keep-alive requests by idle sessions. stop by close()
+        :param key_schedule: KeyPool.LEAST_LOADED or KeyPool.ROUND_ROBIN
+        :param cache_ttls: path pattern(fnmatch) -> seconds. public_get() of matched path is cached. e.g. {'/ticker/*': 1}
+        :param cache_size: max number of cached responses
+        :param cache_stale_seconds: expired response is returned for seconds while it is refreshed in background
+        :param retry_timeout: default timeout of retry policies
+        :param retry_policies: Idempotency -> RetryPolicy. override RETRY_POLICIES
+        :param hedge_paths: path patterns(fnmatch) of public_get() hedged by duplicate request on another session
+            if not completed by hedge_percentile of recent latencies. e.g. ['/board', '/ticker/*']
+        :param hedge_budget: max ratio of duplicate requests to hedged requests
+        :param hooks: observers of requests. e.g. [RestMetrics()]
+        """
         _ = kwargs
-        credential = credential or {}
-        self.credential = credential
+        if isinstance(credential, (list, tuple)):
+            credentials = list(credential)
+        else:
+            credentials = [credential or {}]
+        self.credentials = credentials
+        # first one if list of credentials
+        self.credential = credentials[0]
         self.timeout = timeout
         self.retry_timeout = retry_timeout
+        self.retry_policies = dict(self.RETRY_POLICIES)
+        self.retry_policies.update(retry_policies or {})
         self.proxies = self.load_proxies()
         self.proxies.update(proxies or {})
-        self.session_pool = SessionPool(session_pool_size, timeout=timeout)
+        self.session_pool = self.new_session_pool(session_pool_size, session_pool_maxsize)
+        self.rate_limit = rate_limit
+        self.cache_ttls = dict(cache_ttls or {})
+        self.response_cache = TTLCache(cache_size, stale_seconds=cache_stale_seconds)
+        self.hedge_paths = list(hedge_paths or [])
+        self.hedger = Hedger(percentile=hedge_percentile, budget=hedge_budget)
+        self._hedge_executor: ThreadPoolExecutor = None
+        self._hedge_executor_lock = threading.Lock()
+        self.hooks: List[RestHook] = list(hooks or [])
+
+        self.private_concurrency = private_concurrency or self.PRIVATE_CONCURRENCY
+        self.key_pool = KeyPool([self.AUTH_CLASS(x) for x in credentials], self.private_concurrency, key_schedule)
+        self._auth = self.key_pool.slots[0].auth
+
+        if session_warm_up and self.session_pool:
+            for url in self.get_urls():
+                self.session_pool.warm_up(url)
+        if session_keep_alive and self.session_pool:
+            self.session_pool.keep_alive_interval = session_keep_alive
+            self.session_pool.start()
+
+    def new_session_pool(self, pool_size: int, pool_maxsize: Optional[int]) -> Optional[SessionPool]:
+        """pool of requests.Session. None if requests are not sent by requests"""
+        # probes are counted by public rate limit (per ip address)
+        return SessionPool(pool_size, timeout=self.timeout, pool_maxsize=pool_maxsize,
+                           get_rate_limiter=lambda _: self.get_rate_limiter('HEAD', '/', False))
+
+    def close(self):
+        """stop keep-alive of session pool and threads of hedged requests"""
+        if self.session_pool and self.session_pool.is_active():
+            self.session_pool.stop()
+        if self._hedge_executor:
+            self._hedge_executor.shutdown(wait=False)
+            self._hedge_executor = None
 
-        self._auth = self.AUTH_CLASS(credential)
-        self._private_lock = threading.RLock()
+    def get_urls(self) -> List[str]:
+        """public and private urls. hosts of them are warmed up"""
+        return list(dict.fromkeys([self.get_url('/', False), self.get_url('/', True)]))
 
     @classmethod
     def load_proxies(cls) -> Dict[str, str]:
@@ -53,35 +195,215 @@ class RestApi(ABC):
                 proxies[k] = environ[env_name]
         return proxies
 
-    def request(self, method: str, path: str, is_private: bool, params: dict = None) -> Union[list, dict]:
+    def request(self, method: str, path: str, is_private: bool, params: dict = None, *,
+                stream: bool = False) -> Union[list, dict, Iterator[Any]]:
+        """
+        :param stream: return iterator of elements of json array parsed while body arrives. see on_stream_response()
+        """
         assert path.startswith('/'), f'path={path} must start with /'
         params = params or {}
-        stop = time.time() + self.retry_timeout
+        if not self.hooks:
+            return self._request(method, path, is_private, params, None, stream)
+        info = RequestInfo(exchange=self.NAME, method=method, path=path,
+                           template=self.get_path_template(path), is_private=is_private)
+        self.call_hooks('on_request_start', info)
+        try:
+            res = self._request(method, path, is_private, params, info, stream)
+        except Exception as e:
+            self.call_hooks('on_request_end', info, e)
+            raise
+        if stream:
+            # request ends when body is read
+            stack = contextlib.ExitStack()
+            stack.push(lambda _, e, __: self.call_hooks(
+                'on_request_end', info, None if isinstance(e, GeneratorExit) else e))
+            return iter_holding(res, stack)
+        self.call_hooks('on_request_end', info, None)
+        return res
 
-        def _do_request():
-            with self.session_pool.get() as s:
-                req = self.prepare_request(method, path, is_private, params)
-                prep = s.prepare_request(req)
-                if is_private:
-                    prep.prepare_auth(self._auth)
-                return s.send(prep, timeout=self.timeout, proxies=self.proxies)
+    def _request(self, method: str, path: str, is_private: bool, params: dict,
+                 info: Optional[RequestInfo], stream: bool = False) -> Union[list, dict, Iterator[Any]]:
+        idempotency = self.get_idempotency(method, path, params)
+        policy = self.retry_policies[idempotency]
+        stop = self.get_stop_time(policy)
+
+        def _do_request(auth: Optional[Auth], limiter: Optional[TokenBucket], stack: contextlib.ExitStack):
+            req = self.prepare_request(method, path, is_private, params)
+            # session is returned to pool when stack is closed. after body is read if stream
+            s = stack.enter_context(self.session_pool.get(req.url))
+            prep = s.prepare_request(req)
+            if auth:
+                prep.prepare_auth(auth)
+            timeout = min(self.timeout, max(stop - time.time(), 0.001))
+            if info:
+                self.call_hooks('on_send', info, prep)
+                info.sent_at = time.time()
+            _res = s.send(prep, timeout=timeout, proxies=self.proxies, stream=stream)
+            stack.callback(_res.close)
+            if info:
+                self.call_hooks('on_response', info, _res, time.time() - info.sent_at)
+            if limiter:
+                self.update_rate_limiter(limiter, _res)
+            return _res
 
+        n = 0
+        maybe_sent = False
         while True:
             if stop <= time.time():
                 raise ApiTimeoutError('retry timeout')
+            slot = None
+            limiter = None
+            reconciling = maybe_sent and idempotency == Idempotency.KEYED
+            # releases session, semaphore and slot in reverse order
+            stack = contextlib.ExitStack()
             try:
+                if reconciling:
+                    # reconciliation is retried under policy and deadline of this request
+                    with deadline(stop - time.time()):
+                        reconciled = self.reconcile(method, path, params)
+                    if reconciled is not None:
+                        return reconciled
+                    reconciling = False
                 if is_private:
-                    with self._private_lock:
-                        res = _do_request()
-                else:
-                    res = _do_request()
+                    slot = self.key_pool.select(lambda auth: self.get_rate_limiter(method, path, True, auth))
+                    stack.callback(self.key_pool.release, slot)
+                limiter = self.get_rate_limiter(method, path, is_private, slot and slot.auth)
+                if limiter and limiter.acquire(max_wait=stop - time.time()) is None:
+                    raise ApiTimeoutError('rate limit')
+                if slot:
+                    stack.enter_context(slot.semaphore)
+                res = _do_request(slot and slot.auth, limiter, stack)
                 try:
+                    if stream:
+                        # session and slot are held until body is read
+                        return iter_holding(self.on_stream_response(res, is_private), stack.pop_all())
                     return self.on_response(res, is_private)
                 except Exception as e:
                     return self.on_error(e)
             except RetryError as e:
-                logger.warning(e)
-                time.sleep(e.wait_seconds)
+                error = e
+                wait = self.get_retry_wait(e, policy, n, stop, limiter)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                error = e
+                # failed reconciliation is a read. order is still unknown
+                unsent = isinstance(e, requests.ConnectTimeout) and not reconciling
+                if not (policy.retry_transport_errors or unsent or reconciling):
+                    raise
+                maybe_sent = maybe_sent or not unsent
+                wait = self.get_retry_wait(e, policy, n, stop, limiter)
+            finally:
+                stack.close()
+            n += 1
+            if info:
+                info.attempt = n
+                self.call_hooks('on_retry', info, error, wait)
+            time.sleep(wait)
+
+    def get_path_template(self, path: str) -> str:
+        """path of stats. Override if path has ids normalize_path() does not detect"""
+        _ = self
+        return normalize_path(path)
+
+    def call_hooks(self, name: str, *args):
+        for hook in self.hooks:
+            try:
+                getattr(hook, name)(*args)
+            except Exception as e:
+                logger.exception(f'hook {name} failed {e}')
+
+    def get_idempotency(self, method: str, path: str, params: dict) -> str:
+        """
+        Idempotency class of request. Override to return Idempotency.KEYED for requests with client id
+        and implement reconcile()
+        """
+        _ = self, path, params
+        return Idempotency.READ if method == 'GET' else Idempotency.WRITE
+
+    def reconcile(self, method: str, path: str, params: dict) -> Optional[Union[list, dict]]:
+        """
+        called before retry of Idempotency.KEYED request which may have been processed.
+        :return: response of processed request found by client id. None if not processed
+        """
+        _ = self, method, path, params
+        return None
+
+    def get_stop_time(self, policy: RetryPolicy) -> float:
+        """unix time of giving up. earlier one of policy timeout and deadline of context"""
+        timeout = self.retry_timeout if policy.timeout is None else policy.timeout
+        stop = time.time() + timeout
+        deadline = get_deadline()
+        if deadline is not None:
+            stop = min(stop, deadline)
+        return stop
+
+    def get_retry_wait(self, exc: Exception, policy: RetryPolicy, n: int, stop: float,
+                       limiter: Optional[TokenBucket]) -> float:
+        """
+        :return: seconds to wait before n+1 th retry
+        :raise ApiTimeoutError: if retry would exceed stop time
+        """
+        _ = self
+        logger.warning(exc)
+        if limiter and isinstance(exc, RateLimitError):
+            # make other threads wait too. limiter.acquire() waits
+            limiter.pause(exc.wait_seconds)
+            wait = 0
+        else:
+            wait = policy.get_wait(n, exc)
+        if stop <= time.time() + wait:
+            raise ApiTimeoutError('retry timeout') from exc
+        return wait
+
+    def get_rate_limit_class(self, method: str, path: str, is_private: bool) -> str:
+        """Override if exchange limits some endpoints separately"""
+        _ = self, method, path
+        return 'private' if is_private else 'public'
+
+    def get_rate_limiter(self, method: str, path: str, is_private: bool,
+                         auth: Auth = None) -> Optional[TokenBucket]:
+        """
+        private limits are counted per api key, public limits per exchange(ip address)
+        :param auth: api key of private request. first one if None
+        """
+        if not self.rate_limit:
+            return None
+        limit_class = self.get_rate_limit_class(method, path, is_private)
+        if limit_class not in self.RATE_LIMITS:
+            return None
+        key = (self.NAME, (auth or self._auth).api_key if is_private else None, limit_class)
+        with self._rate_limiters_lock:
+            limiter = self._rate_limiters.get(key)
+            if limiter is None:
+                limiter = TokenBucket(*self.RATE_LIMITS[limit_class])
+                self._rate_limiters[key] = limiter
+            return limiter
+
+    def update_rate_limiter(self, limiter: TokenBucket, res: requests.Response):
+        """
+        update limiter by 'x-ratelimit-*' headers if exist.
+        x-ratelimit-reset is unix time(BitMEX, bitFlyer) or seconds.
+        limiter is not updated if a header is invalid
+        """
+        _ = self
+        headers = res.headers
+        retry_after = parse_retry_after(headers.get('retry-after'))
+        if res.status_code == 429 and retry_after is not None:
+            limiter.pause(retry_after)
+        remaining = headers.get('x-ratelimit-remaining')
+        if remaining is None:
+            return
+        limit = headers.get('x-ratelimit-limit')
+        reset = headers.get('x-ratelimit-reset')
+        try:
+            remaining = _parse_finite(remaining)
+            limit = _parse_finite(limit) if limit else None
+            reset_seconds = _parse_finite(reset) if reset else None
+        except ValueError as e:
+            logger.warning(f'invalid x-ratelimit headers {e}')
+            return
+        if reset_seconds is not None and reset_seconds > 1e9:
+            reset_seconds -= time.time()
+        limiter.update(remaining, reset_seconds, limit)
 
     def prepare_request(self, method: str, path: str, is_private: bool, params: dict) -> requests.Request:
         url = self.get_url(path, is_private)
@@ -102,19 +424,124 @@ class RestApi(ABC):
         return url
 
     def on_response(self, res: requests.Response, is_private: bool) -> Union[list, dict]:
-        _ = self, is_private
+        _ = is_private
         res.raise_for_status()
-        if res.text and 'application/json' in res.headers['Content-Type']:
-            return res.json()
+        if res.content and 'application/json' in res.headers.get('Content-Type', ''):
+            return self.decode_json(res)
         return {'response': res.text}
 
+    @staticmethod
+    def decode_json(res: requests.Response) -> Union[list, dict]:
+        """
+        parse body bytes once. res.text and res.json() decode whole body to str
+        (and guess encoding if not specified) before parsing
+        """
+        return json.loads(res.content)
+
+    # bytes read from socket at once by on_stream_response()
+    STREAM_CHUNK_SIZE = 64 * 1024
+
+    def on_stream_response(self, res: requests.Response, is_private: bool) -> Iterator[Any]:
+        """
+        response of request(stream=True). elements of json array are parsed while body arrives,
+        so converters of caller start before whole body is read.
+        status is checked before return. error while reading body is raised from iterator (not retried)
+        :raise ValueError: if body of successful response is not json
+        """
+        if not res.ok:
+            # error of exchange is raised
+            return iter(self.on_response(res, is_private))
+        content_type = res.headers.get('Content-Type', '')
+        if 'application/json' not in content_type:
+            raise ValueError(f'not a json response: {content_type!r}')
+        return iter_json_array(res.iter_content(self.STREAM_CHUNK_SIZE))
+
     def on_error(self, exc: Exception) -> dict:
         raise exc
 
+    def get_cache_ttl(self, path: str) -> Optional[float]:
+        """TTL of first matched pattern of cache_ttls. None if not cached"""
+        for pattern, ttl in self.cache_ttls.items():
+            if fnmatch.fnmatchcase(path, pattern):
+                return ttl
+        return None
+
+    def get_hedge_pattern(self, path: str) -> Optional[str]:
+        """first matched pattern of hedge_paths. latencies are tracked per pattern. None if not hedged"""
+        for pattern in self.hedge_paths:
+            if fnmatch.fnmatchcase(path, pattern):
+                return pattern
+        return None
+
+    def hedged_request(self, pattern: str, method: str, path: str, params: dict) -> Union[list, dict]:
+        """
+        request(). duplicate is sent if not completed by delay of hedger and budget remains.
+        first successful response is returned. the other is discarded when completed
+        (blocking send of requests can not be aborted)
+        """
+        self.hedger.earn()
+        context = contextvars.copy_context()
+
+        def _request():
+            start = time.time()
+            _res = context.copy().run(self.request, method, path, False, params)
+            self.hedger.record(pattern, time.time() - start)
+            return _res
+
+        delay = self.hedger.get_delay(pattern)
+        if delay is None:
+            return _request()
+        executor = self._get_hedge_executor()
+        primary = executor.submit(_request)
+        try:
+            return primary.result(timeout=delay)
+        except FutureTimeoutError:
+            pass
+        if not self.hedger.spend():
+            return primary.result()
+        logger.debug(f'hedge {method} {path} delay={delay:.3f}')
+        pending = {primary, executor.submit(_request)}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    for x in pending:
+                        x.cancel()
+                    return future.result()
+        # both failed
+        return primary.result()
+
+    def _get_hedge_executor(self) -> ThreadPoolExecutor:
+        with self._hedge_executor_lock:
+            if self._hedge_executor is None:
+                # primary and duplicate of each caller
+                max_workers = 2 * max(self.session_pool.pool_size, 4)
+                self._hedge_executor = ThreadPoolExecutor(max_workers=max_workers,
+                                                          thread_name_prefix=f'{self.NAME}-hedge')
+            return self._hedge_executor
+
     # public
 
     def public_get(self, path: str, **kwargs):
-        return self.request('GET', path, False, kwargs)
+        pattern = self.get_hedge_pattern(path)
+        if pattern is None:
+            def _request():
+                return self.request('GET', path, False, kwargs)
+        else:
+            def _request():
+                return self.hedged_request(pattern, 'GET', path, kwargs)
+        ttl = self.get_cache_ttl(path)
+        if ttl is None:
+            return _request()
+        # values may be unhashable. e.g. filter={'open': True}
+        key = (path, json.dumps(kwargs, sort_keys=True, default=str))
+        return self.response_cache.get(key, _request, ttl)
+
+    def public_get_iter(self, path: str, **kwargs) -> Iterator[Any]:
+        """elements of json array response. see on_stream_response()"""
+        if self.get_cache_ttl(path) is not None or self.get_hedge_pattern(path) is not None:
+            return iter(self.public_get(path, **kwargs))
+        return self.request('GET', path, False, kwargs, stream=True)
 
     def public_post(self, path: str, **kwargs):
         return self.request('POST', path, False, kwargs)
@@ -133,6 +560,10 @@ class RestApi(ABC):
     def private_get(self, path: str, **kwargs):
         return self.request('GET', path, True, kwargs)
 
+    def private_get_iter(self, path: str, **kwargs) -> Iterator[Any]:
+        """elements of json array response. see on_stream_response()"""
+        return self.request('GET', path, True, kwargs, stream=True)
+
     def private_post(self, path: str, **kwargs):
         return self.request('POST', path, True, kwargs)
 
@@ -0,0 +1,233 @@
+import bisect
+from dataclasses import dataclass, field
+import re
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+import requests
+
+_ID_SEGMENT = re.compile(r'^(\d+|[0-9a-fA-F-]{16,}|(?=.*\d)[\w-]{12,})$')
+
+
+def normalize_path(path: str) -> str:
+    """
+    replace id-like segments(numbers, uuids, long tokens with digits) by '{id}' so number of paths is bounded.
+    '/orders/12345' -> '/orders/{id}'
+    """
+    path = path.split('?', 1)[0]
+    return '/'.join('{id}' if _ID_SEGMENT.match(x) else x for x in path.split('/'))
+
+
+@dataclass
+class RequestInfo:
+    """passed to RestHook methods. same instance through retries of a request"""
+    exchange: str
+    method: str
+    path: str
+    # normalized path. see RestApi.get_path_template()
+    template: str
+    is_private: bool
+    start: float = field(default_factory=time.time)
+    # 0 for first try
+    attempt: int = 0
+    # time of current send
+    sent_at: float = None
+
+
+class RestHook:
+    """
+    Override methods to observe requests of RestApi. register by RestApi(hooks=[...]).
+    exceptions raised by hooks are logged and ignored.
+    """
+
+    def on_request_start(self, info: RequestInfo):
+        pass
+
+    def on_send(self, info: RequestInfo, prep: requests.PreparedRequest):
+        pass
+
+    def on_response(self, info: RequestInfo, res: requests.Response, latency: float):
+        pass
+
+    def on_retry(self, info: RequestInfo, exc: Exception, wait: float):
+        pass
+
+    def on_request_end(self, info: RequestInfo, exc: Optional[Exception]):
+        """:param exc: raised to caller. None if succeeded"""
+        pass
+
+
+class LatencyHistogram:
+    """cumulative histogram of seconds. compatible with prometheus histogram"""
+    BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, float('inf'))
+
+    def __init__(self, buckets: Tuple[float, ...] = BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def add(self, seconds: float):
+        self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+
+    def percentile(self, q: float) -> Optional[float]:
+        """upper bound of bucket of q-th latency. None if empty"""
+        if not self.count:
+            return None
+        rank = q * self.count
+        n = 0
+        for bound, count in zip(self.buckets, self.counts):
+            n += count
+            if n >= rank:
+                return bound
+        return self.buckets[-1]
+
+    def copy(self) -> 'LatencyHistogram':
+        histogram = LatencyHistogram(self.buckets)
+        histogram.counts = list(self.counts)
+        histogram.count = self.count
+        histogram.sum = self.sum
+        return histogram
+
+    def to_dict(self) -> dict:
+        return {
+            'count': self.count,
+            'sum': self.sum,
+            'buckets': {str(k): v for k, v in zip(self.buckets, self.counts)},
+        }
+
+
+@dataclass
+class EndpointStats:
+    latency: LatencyHistogram = field(default_factory=LatencyHistogram)
+    requests: int = 0
+    # status code -> count
+    statuses: Dict[int, int] = field(default_factory=dict)
+    retries: int = 0
+    # exceptions raised to caller
+    errors: int = 0
+    # request bodies
+    bytes_sent: int = 0
+    # response bodies
+    bytes_received: int = 0
+
+    def copy(self) -> 'EndpointStats':
+        return EndpointStats(latency=self.latency.copy(), requests=self.requests, statuses=dict(self.statuses),
+                             retries=self.retries, errors=self.errors,
+                             bytes_sent=self.bytes_sent, bytes_received=self.bytes_received)
+
+    def to_dict(self) -> dict:
+        return {
+            'latency': self.latency.to_dict(),
+            'requests': self.requests,
+            'statuses': dict(self.statuses),
+            'retries': self.retries,
+            'errors': self.errors,
+            'bytes_sent': self.bytes_sent,
+            'bytes_received': self.bytes_received,
+        }
+
+
+class RestMetrics(RestHook):
+    """
+    Thread-safe collector of stats per (exchange, method, path template).
+    one instance can be shared by RestApis of exchanges.
+
+        metrics = RestMetrics()
+        client = BitMEXClient(hooks=[metrics])
+        ...
+        metrics.snapshot()[('bitmex', 'GET', '/orderBook/L2')].latency.percentile(0.99)
+    """
+
+    def __init__(self):
+        self._stats: Dict[Tuple[str, str, str], EndpointStats] = {}
+        self._lock = threading.Lock()
+
+    def _get_stats(self, info: RequestInfo) -> EndpointStats:
+        key = (info.exchange, info.method, info.template)
+        stats = self._stats.get(key)
+        if stats is None:
+            stats = self._stats[key] = EndpointStats()
+        return stats
+
+    def on_request_start(self, info: RequestInfo):
+        with self._lock:
+            self._get_stats(info).requests += 1
+
+    def on_send(self, info: RequestInfo, prep: requests.PreparedRequest):
+        with self._lock:
+            body = prep.body or b''
+            if isinstance(body, str):
+                body = body.encode('utf-8')
+            self._get_stats(info).bytes_sent += len(body)
+
+    def on_response(self, info: RequestInfo, res: requests.Response, latency: float):
+        with self._lock:
+            stats = self._get_stats(info)
+            stats.latency.add(latency)
+            stats.statuses[res.status_code] = stats.statuses.get(res.status_code, 0) + 1
+            stats.bytes_received += self._get_content_length(res)
+
+    @staticmethod
+    def _get_content_length(res: requests.Response) -> int:
+        # body of streamed response is not read here
+        if getattr(res, '_content', None) is False:
+            return int(res.headers.get('Content-Length') or 0)
+        return len(res.content or b'')
+
+    def on_retry(self, info: RequestInfo, exc: Exception, wait: float):
+        with self._lock:
+            self._get_stats(info).retries += 1
+
+    def on_request_end(self, info: RequestInfo, exc: Optional[Exception]):
+        if exc is not None:
+            with self._lock:
+                self._get_stats(info).errors += 1
+
+    def snapshot(self) -> Dict[Tuple[str, str, str], EndpointStats]:
+        """copy of stats. (exchange, method, path template) -> EndpointStats"""
+        with self._lock:
+            return {k: v.copy() for k, v in self._stats.items()}
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+
+    def to_dicts(self) -> List[dict]:
+        """json serializable stats"""
+        return [dict(exchange=k[0], method=k[1], path=k[2], **v.to_dict()) for k, v in self.snapshot().items()]
+
+    def to_prometheus(self, prefix: str = 'coinlib_rest') -> str:
+        """stats in prometheus text exposition format"""
+        snapshot = sorted(self.snapshot().items())
+        counters = [
+            ('requests_total', lambda x: x.requests),
+            ('retries_total', lambda x: x.retries),
+            ('errors_total', lambda x: x.errors),
+            ('sent_bytes_total', lambda x: x.bytes_sent),
+            ('received_bytes_total', lambda x: x.bytes_received),
+        ]
+        lines = [f'# TYPE {prefix}_latency_seconds histogram']
+        for (exchange, method, path), stats in snapshot:
+            labels = f'exchange="{exchange}",method="{method}",path="{path}"'
+            n = 0
+            for bound, count in zip(stats.latency.buckets, stats.latency.counts):
+                n += count
+                le = '+Inf' if bound == float('inf') else str(bound)
+                lines.append(f'{prefix}_latency_seconds_bucket{{{labels},le="{le}"}} {n}')
+            lines.append(f'{prefix}_latency_seconds_sum{{{labels}}} {stats.latency.sum}')
+            lines.append(f'{prefix}_latency_seconds_count{{{labels}}} {stats.latency.count}')
+        lines.append(f'# TYPE {prefix}_responses_total counter')
+        for (exchange, method, path), stats in snapshot:
+            labels = f'exchange="{exchange}",method="{method}",path="{path}"'
+            for status, count in sorted(stats.statuses.items()):
+                lines.append(f'{prefix}_responses_total{{{labels},status="{status}"}} {count}')
+        for name, get_value in counters:
+            lines.append(f'# TYPE {prefix}_{name} counter')
+            for (exchange, method, path), stats in snapshot:
+                labels = f'exchange="{exchange}",method="{method}",path="{path}"'
+                lines.append(f'{prefix}_{name}{{{labels}}} {get_value(stats)}')
+        return '\n'.join(lines) + '\n'
@@ -0,0 +1,67 @@
+import contextlib
+import contextvars
+from dataclasses import dataclass
+import random
+import time
+from typing import Optional
+
+from coinlib.errors import RetryError
+
+
+class Idempotency:
+    # safe to send again. e.g. GET
+    READ = 'read'
+    # sent again only if server did not process it (RetryError). e.g. order submit
+    WRITE = 'write'
+    # write with client id (BitMEX clOrdID, ...). sent again after RestApi.reconcile() found nothing
+    KEYED = 'keyed'
+
+
+@dataclass
+class RetryPolicy:
+    """
+    exponential backoff: wait initial_wait * multiplier ** n (at most max_wait) before n+1 th retry.
+    wait_seconds of RetryError is respected.
+    """
+    # seconds from first try. None: RestApi.retry_timeout
+    timeout: Optional[float] = None
+    initial_wait: float = 0.5
+    max_wait: float = 30
+    multiplier: float = 2
+    # +-ratio of wait
+    jitter: float = 0.1
+    # retry connection error and timeout, request may have been processed by server
+    retry_transport_errors: bool = True
+
+    def get_wait(self, n: int, exc: Exception) -> float:
+        wait = min(self.max_wait, self.initial_wait * self.multiplier ** n)
+        if isinstance(exc, RetryError):
+            wait = max(wait, exc.wait_seconds)
+        return wait * (1 + random.uniform(-self.jitter, self.jitter))
+
+
+_deadline: contextvars.ContextVar = contextvars.ContextVar('deadline', default=None)
+
+
+@contextlib.contextmanager
+def deadline(seconds: float):
+    """
+    requests in this context(thread or task) give up after seconds, including retries.
+
+        with deadline(1.0):
+            client.submit_order(...)
+    """
+    current = _deadline.get()
+    value = time.time() + seconds
+    if current is not None:
+        value = min(value, current)
+    token = _deadline.set(value)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def get_deadline() -> Optional[float]:
+    """unix time of current deadline. None if not specified"""
+    return _deadline.get()
@@ -1,10 +1,15 @@
 from abc import abstractmethod, ABC
 import logging
 import threading
-from typing import Tuple, Hashable, Type, Optional, Any
+import time
+from typing import Tuple, Hashable, Type, Optional, Any, Iterable, Dict, Set
 
-from coinlib.datatypes.streamdata import StreamData
+from coinlib.datatypes import Execution, ExecutionBatch, OrderBook, Ticker
+from coinlib.datatypes.candle import Candle
+from coinlib.datatypes.streamdata import StreamData, StreamType
+from .candlebuilder import CandleBuilder, DEFAULT_RESOLUTIONS
 from .client import Client as ClientBase
+from .executionbatcher import ExecutionBatcher, ExecutionRow
 from .streamapi import StreamApi, OnDataCallback
 
 logger = logging.getLogger(__name__)
@@ -12,15 +17,37 @@ logger = logging.getLogger(__name__)
 
 class StreamClient(ClientBase, ABC):
     STREAM_API_CLASS: Type[StreamApi] = None
+    # False if server has no ticker channel. ticker is derived from order book and execution streams
+    NATIVE_TICKER_STREAM = True
+    # seconds between checks of candles to close
+    CANDLE_CLOSE_INTERVAL = 1.0
 
     def __init__(self, credential: dict = None, *,
                  reconnect_interval: float = 10,
                  on_data: OnDataCallback = None,
+                 execution_batch_interval: float = None,
+                 candle_resolutions: Iterable[str] = DEFAULT_RESOLUTIONS,
+                 candle_close_delay: Optional[float] = 2.0,
                  **kwargs):
+        """
+        :param execution_batch_interval: if specified, execution stream data is ExecutionBatch(numpy arrays)
+                                         flushed every interval seconds instead of List[Execution] per message
+        :param candle_resolutions: resolutions of candle stream built from execution stream
+        :param candle_close_delay: candle is closed delay seconds after end of its period without later execution.
+                                   None to close only by execution of later period
+        """
         super().__init__(credential, **kwargs)
 
         self.reconnect_interval = reconnect_interval
         self.on_data = on_data or (lambda *_: None)
+        self.execution_batch_interval = execution_batch_interval
+        self._execution_batcher: ExecutionBatcher = None
+        self.candle_resolutions = tuple(candle_resolutions)
+        self._candle_builders: Dict[str, CandleBuilder] = {}
+        self.candle_close_delay = candle_close_delay
+        self._candle_timer_stop: threading.Event = None
+        self._derived_tickers: Dict[str, dict] = {}
+        self._stream_keys: Set[Tuple[str, Hashable]] = set()
 
         self.stream_api: StreamApi = None
         self._subscription_keys = set()
@@ -51,7 +78,7 @@ class StreamClient(ClientBase, ABC):
                     if self.is_authenticated():
                         self.authenticate()
                     # re-subscribe
-                    for key in self._subscription_keys:
+                    for key in tuple(self._stream_keys):
                         self.request_subscribe(key)
 
                 def on_close():
@@ -66,7 +93,7 @@ class StreamClient(ClientBase, ABC):
                     if stream_api.is_active():
                         data = self.convert_raw_data(data)
                         if data:
-                            self.on_data(data)
+                            self._on_stream_data(data)
 
                 def on_auth(success: bool, data: Any):
                     _ = data
@@ -80,6 +107,13 @@ class StreamClient(ClientBase, ABC):
                 self.stream_api = stream_api
                 self.stream_api.start()
 
+            if self.execution_batch_interval:
+                self._execution_batcher = ExecutionBatcher(self.execution_batch_interval,
+                                                           on_batch=self._on_stream_data)
+                self._execution_batcher.start()
+            if self.candle_close_delay is not None:
+                self._candle_timer_stop = threading.Event()
+                threading.Thread(target=self._run_candle_timer, args=(self._candle_timer_stop,), daemon=True).start()
             connect()
 
     def close(self):
@@ -88,6 +122,12 @@ class StreamClient(ClientBase, ABC):
             stream_api = self.stream_api
             self.stream_api: StreamApi = None
             stream_api.stop()
+            if self._execution_batcher:
+                self._execution_batcher.stop()
+                self._execution_batcher = None
+            if self._candle_timer_stop:
+                self._candle_timer_stop.set()
+                self._candle_timer_stop = None
 
     def __enter__(self):
         self.open()
@@ -104,8 +144,16 @@ class StreamClient(ClientBase, ABC):
         assert self.stream_api, 'not opened'
         for key in kwargs.items():
             if key not in self._subscription_keys:
+                stream_keys = self._stream_keys
+                if key[0] == StreamType.CANDLE:
+                    self._candle_builders[key[1]] = CandleBuilder(key[1], self.candle_resolutions)
+                elif key[0] == StreamType.TICKER and self._can_derive_ticker(key[1]):
+                    self._derived_tickers[key[1]] = {}
                 self._subscription_keys.add(key)
-                self.request_subscribe(key)
+                self._stream_keys = self._get_all_stream_keys()
+                for stream_key in self.get_stream_keys(key):
+                    if stream_key not in stream_keys:
+                        self.request_subscribe(stream_key)
 
     def unsubscribe(self, **kwargs: Hashable):
         """
@@ -115,8 +163,39 @@ class StreamClient(ClientBase, ABC):
         assert self.stream_api, 'not opened'
         for key in kwargs.items():
             if key in self._subscription_keys:
+                key_stream_keys = self.get_stream_keys(key)
                 self._subscription_keys.remove(key)
-                self.request_unsubscribe(key)
+                if key[0] == StreamType.CANDLE:
+                    self._candle_builders.pop(key[1], None)
+                elif key[0] == StreamType.TICKER:
+                    self._derived_tickers.pop(key[1], None)
+                self._stream_keys = self._get_all_stream_keys()
+                for stream_key in key_stream_keys:
+                    if stream_key not in self._stream_keys:
+                        self.request_unsubscribe(stream_key)
+
+    def get_stream_keys(self, key: Tuple[str, Hashable]) -> Tuple[Tuple[str, Hashable], ...]:
+        """
+        return keys requested by request_subscribe() for subscription key.
+        candle is built from execution stream, derived ticker is built from order book and execution streams
+        """
+        if key[0] == StreamType.CANDLE:
+            return (StreamType.EXECUTION, key[1]),
+        if key[0] == StreamType.TICKER and key[1] in self._derived_tickers:
+            return (StreamType.ORDER_BOOK, key[1]), (StreamType.EXECUTION, key[1])
+        return key,
+
+    def _can_derive_ticker(self, instrument: str) -> bool:
+        """derive ticker if no ticker channel or order book and execution are already subscribed"""
+        if not self.NATIVE_TICKER_STREAM:
+            return True
+        return {(StreamType.ORDER_BOOK, instrument), (StreamType.EXECUTION, instrument)}.issubset(self._stream_keys)
+
+    def _get_all_stream_keys(self) -> Set[Tuple[str, Hashable]]:
+        stream_keys = set()
+        for key in tuple(self._subscription_keys):
+            stream_keys.update(self.get_stream_keys(key))
+        return stream_keys
 
     @abstractmethod
     def request_subscribe(self, key: Tuple[str, Hashable]):
@@ -144,6 +223,88 @@ class StreamClient(ClientBase, ABC):
         :return: None if no converted data
         """
 
+    def _on_stream_data(self, data: StreamData):
+        key: Tuple[str, Hashable] = data.key
+        if key[0] == StreamType.EXECUTION:
+            self._update_candles(data)
+        if key[0] in (StreamType.EXECUTION, StreamType.ORDER_BOOK):
+            self._update_derived_ticker(data)
+            if key not in self._subscription_keys:
+                # subscribed internally
+                return
+        self.on_data(data)
+
+    def _update_derived_ticker(self, data: StreamData):
+        instrument: str = data.key[1]
+        cache = self._derived_tickers.get(instrument)
+        if cache is None:
+            return
+        if data.key[0] == StreamType.ORDER_BOOK:
+            order_book: OrderBook = data.data
+            if not order_book.asks or not order_book.bids:
+                return
+            values = dict(ask=order_book.asks[0][0], bid=order_book.bids[0][0], timestamp=order_book.timestamp)
+        elif isinstance(data.data, ExecutionBatch):
+            batch: ExecutionBatch = data.data
+            values = dict(last=float(batch.price[-1]), timestamp=float(batch.timestamp[-1]))
+        else:
+            execution: Execution = data.data[-1]
+            values = dict(last=execution.price, timestamp=execution.timestamp)
+        changed = any(cache.get(k) != v for k, v in values.items() if k != 'timestamp')
+        cache.update(values)
+        if changed and {'ask', 'bid', 'last'}.issubset(cache):
+            ticker = Ticker(timestamp=cache['timestamp'], instrument=instrument,
+                            ask=cache['ask'], bid=cache['bid'], last=cache['last'])
+            self.on_data(StreamData((StreamType.TICKER, instrument), ticker))
+
+    def _update_candles(self, data: StreamData):
+        instrument: str = data.key[1]
+        candle_builder = self._candle_builders.get(instrument)
+        if not candle_builder:
+            return
+        if isinstance(data.data, ExecutionBatch):
+            closed = candle_builder.add_batch(data.data)
+        else:
+            closed = candle_builder.add_executions(data.data)
+        for resolution, candle in closed:
+            self.on_data(StreamData((StreamType.CANDLE, instrument), (resolution, candle)))
+
+    def _run_candle_timer(self, stop: threading.Event):
+        while not stop.wait(self.CANDLE_CLOSE_INTERVAL):
+            try:
+                self._close_candles(time.time() - self.candle_close_delay)
+            except Exception as e:
+                logger.exception(e)
+
+    def _close_candles(self, timestamp: float):
+        """emit candles which period ended before timestamp"""
+        for instrument, candle_builder in tuple(self._candle_builders.items()):
+            for resolution, candle in candle_builder.close(timestamp):
+                self.on_data(StreamData((StreamType.CANDLE, instrument), (resolution, candle)))
+
+    def get_open_candle(self, instrument: str, resolution: str) -> Optional[Candle]:
+        """return not closed candle of candle stream"""
+        candle_builder = self._candle_builders.get(instrument)
+        if not candle_builder:
+            return None
+        return candle_builder.get_candle(resolution)
+
+    def convert_executions(self, key: Tuple[str, Hashable], rows: Iterable[ExecutionRow]) -> Optional[StreamData]:
+        """
+        convert execution rows of one message.
+        :return: StreamData(key, List[Execution]), None if no executions or batched
+        """
+        if self._execution_batcher:
+            self._execution_batcher.add(key, rows)
+            return None
+        instrument: str = key[1]
+        executions = [Execution(execution_id=execution_id, timestamp=timestamp, instrument=instrument,
+                                side=side, price=price, qty=qty, _data=data)
+                      for execution_id, timestamp, side, price, qty, data in rows]
+        if not executions:
+            return None
+        return StreamData(key, executions)
+
     # private
 
     def authenticate(self, *, params: dict = None):
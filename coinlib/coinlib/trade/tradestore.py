@@ -0,0 +1,313 @@
+import datetime
+import hashlib
+import logging
+import os
+from pathlib import Path
+import threading
+from typing import Dict, Hashable, Iterable, Iterator, List, Optional, Tuple, Union
+
+from coinlib.datatypes import Execution, ExecutionBatch, ExecutionSide
+from coinlib.datatypes.candle import Candle
+from coinlib.datatypes.executionbatch import np
+from coinlib.datatypes.streamdata import StreamData, StreamType
+
+logger = logging.getLogger(__name__)
+
+DAY_SECONDS = 24 * 60 * 60
+
+Columns = Dict[str, 'np.ndarray']
+
+
+class ColumnStore:
+    """
+    Append-only columnar store of time series per (exchange, name, UTC day).
+
+        directory/exchange/name/YYYY-MM-DD/<column>.bin   raw little-endian values of COLUMNS
+        directory/exchange/name/YYYY-MM-DD/_index.bin     timestamp of every INDEX_STRIDE th row (float64)
+
+    rows are kept in timestamp ascending order. appended rows older than last stored row are dropped.
+    read() memory-maps column files into numpy arrays without parsing.
+    time range is located by binary search of sparse index and then of one stride of timestamp column.
+    rows are appended by one process at a time. readers may read while it is appending.
+    """
+    # (name, numpy dtype). first column is 'timestamp'(unix seconds, float64)
+    COLUMNS: Tuple[Tuple[str, str], ...] = (('timestamp', '<f8'),)
+    INDEX_STRIDE = 1024
+
+    def __init__(self, directory: Union[str, Path]):
+        assert np, 'numpy required'
+        assert self.COLUMNS[0] == ('timestamp', '<f8'), self.COLUMNS
+        self.directory = Path(directory)
+        self._lock = threading.Lock()
+
+    # write
+
+    def append(self, exchange: str, name: str, columns: Columns) -> int:
+        """
+        :param columns: column name -> array of same length. sorted by timestamp if not sorted
+        :return: number of appended rows
+        """
+        columns = {k: np.asarray(columns[k], dtype=dtype) for k, dtype in self.COLUMNS}
+        timestamp = columns['timestamp']
+        if not len(timestamp):
+            return 0
+        if len(timestamp) > 1 and (np.diff(timestamp) < 0).any():
+            index = np.argsort(timestamp, kind='stable')
+            columns = {k: v[index] for k, v in columns.items()}
+            timestamp = columns['timestamp']
+        days = (timestamp // DAY_SECONDS).astype(np.int64)
+        boundaries = np.flatnonzero(np.diff(days)) + 1
+        n = 0
+        with self._lock:
+            for start, end in zip(np.concatenate([[0], boundaries]), np.concatenate([boundaries, [len(days)]])):
+                day_dir = self._get_day_dir(exchange, name, float(timestamp[start]))
+                n += self._append_day(day_dir, {k: v[start:end] for k, v in columns.items()})
+        return n
+
+    def _append_day(self, day_dir: Path, columns: Columns) -> int:
+        day_dir.mkdir(parents=True, exist_ok=True)
+        stored = self._repair(day_dir)
+        if stored:
+            tail = self._read_day(day_dir, stored - min(stored, self.INDEX_STRIDE), stored)
+            keep = self.filter_new_rows(tail, columns)
+            columns = {k: v[keep] for k, v in columns.items()}
+            dropped = len(keep) - int(keep.sum())
+            if dropped:
+                logger.warning(f'{dropped} rows older than stored rows are dropped {day_dir}')
+        n = len(columns['timestamp'])
+        if not n:
+            return 0
+        for k, _ in self.COLUMNS:
+            with (day_dir / f'{k}.bin').open('ab') as f:
+                f.write(columns[k].tobytes())
+        # index is appended after columns. rows of broken index are repaired by _repair()
+        self._append_index(day_dir, stored, columns['timestamp'])
+        return n
+
+    def filter_new_rows(self, tail: Columns, columns: Columns) -> 'np.ndarray':
+        """
+        :param tail: last rows of stored rows
+        :return: bool mask of rows to be appended. Override to drop rows of same timestamp already stored
+        """
+        _ = self
+        return columns['timestamp'] >= tail['timestamp'][-1]
+
+    def _append_index(self, day_dir: Path, stored: int, timestamp: 'np.ndarray'):
+        first = -stored % self.INDEX_STRIDE
+        values = timestamp[first::self.INDEX_STRIDE]
+        if len(values):
+            with (day_dir / '_index.bin').open('ab') as f:
+                f.write(values.astype('<f8').tobytes())
+
+    def _repair(self, day_dir: Path) -> int:
+        """truncate columns and index written partially. :return: number of rows"""
+        sizes = [self._count_rows(day_dir, k, dtype) for k, dtype in self.COLUMNS]
+        n = min(sizes)
+        if max(sizes) != n:
+            logger.warning(f'truncate partially written rows {day_dir} {sizes}')
+            for k, dtype in self.COLUMNS:
+                path = day_dir / f'{k}.bin'
+                if path.exists():
+                    os.truncate(str(path), n * np.dtype(dtype).itemsize)
+        n_index = -(-n // self.INDEX_STRIDE)
+        index_path = day_dir / '_index.bin'
+        if self._count_rows(day_dir, '_index', '<f8') != n_index:
+            timestamp = self._memmap(day_dir, 'timestamp', '<f8', n)
+            with index_path.open('wb') as f:
+                f.write(np.asarray(timestamp[::self.INDEX_STRIDE], dtype='<f8').tobytes())
+        return n
+
+    # read
+
+    def read(self, exchange: str, name: str, start: float = None, end: float = None) -> Columns:
+        """
+        rows of start <= timestamp < end. arrays are memory-mapped(read only) if rows are in one day
+        """
+        parts = list(self.iter_days(exchange, name, start, end))
+        if len(parts) == 1:
+            return parts[0]
+        if not parts:
+            return {k: np.empty(0, dtype=dtype) for k, dtype in self.COLUMNS}
+        return {k: np.concatenate([x[k] for x in parts]) for k, _ in self.COLUMNS}
+
+    def iter_days(self, exchange: str, name: str, start: float = None, end: float = None) -> Iterator[Columns]:
+        """memory-mapped rows of start <= timestamp < end for each day"""
+        for day_dir in self.get_day_dirs(exchange, name, start, end):
+            n = min(self._count_rows(day_dir, k, dtype) for k, dtype in self.COLUMNS)
+            if not n:
+                continue
+            i = self._search(day_dir, n, start) if start is not None else 0
+            j = self._search(day_dir, n, end) if end is not None else n
+            if i < j:
+                yield self._read_day(day_dir, i, j)
+
+    def get_day_dirs(self, exchange: str, name: str, start: float = None, end: float = None) -> List[Path]:
+        series_dir = self.directory / exchange / name
+        if not series_dir.exists():
+            return []
+        first = self.get_day_name(start) if start is not None else ''
+        last = self.get_day_name(end) if end is not None else '9999'
+        return sorted(x for x in series_dir.iterdir() if x.is_dir() and first <= x.name <= last)
+
+    def _search(self, day_dir: Path, n: int, timestamp: float) -> int:
+        """first row of which timestamp >= timestamp"""
+        index = self._memmap(day_dir, '_index', '<f8', -(-n // self.INDEX_STRIDE))
+        block = max(int(np.searchsorted(index, timestamp, side='left')) - 1, 0)
+        start = block * self.INDEX_STRIDE
+        end = min(start + 2 * self.INDEX_STRIDE, n)
+        column = self._memmap(day_dir, 'timestamp', '<f8', n)
+        return start + int(np.searchsorted(column[start:end], timestamp, side='left'))
+
+    def _read_day(self, day_dir: Path, start: int, end: int) -> Columns:
+        return {k: self._memmap(day_dir, k, dtype, end)[start:end] for k, dtype in self.COLUMNS}
+
+    @staticmethod
+    def _memmap(day_dir: Path, column: str, dtype: str, n: int) -> 'np.ndarray':
+        if not n:
+            return np.empty(0, dtype=dtype)
+        return np.memmap(str(day_dir / f'{column}.bin'), dtype=dtype, mode='r', shape=(n,))
+
+    @staticmethod
+    def _count_rows(day_dir: Path, column: str, dtype: str) -> int:
+        try:
+            return (day_dir / f'{column}.bin').stat().st_size // np.dtype(dtype).itemsize
+        except FileNotFoundError:
+            return 0
+
+    @staticmethod
+    def get_day_name(timestamp: float) -> str:
+        return datetime.datetime.fromtimestamp(timestamp, datetime.timezone.utc).strftime('%Y-%m-%d')
+
+    def _get_day_dir(self, exchange: str, name: str, timestamp: float) -> Path:
+        return self.directory / exchange / name / self.get_day_name(timestamp)
+
+
+def to_stored_id(execution_id: Hashable) -> int:
+    """
+    execution_id column value. integer as is, 63 bit hash of str(id) for others (e.g. uuid of BitMEX).
+    -1 if None
+    """
+    if isinstance(execution_id, int):
+        return execution_id
+    if execution_id is None:
+        return -1
+    digest = hashlib.blake2b(str(execution_id).encode(), digest_size=8).digest()
+    return int.from_bytes(digest, 'little') & 0x7fff_ffff_ffff_ffff
+
+
+class ExecutionStore(ColumnStore):
+    """
+    executions per (exchange, instrument, day).
+    execution_id is stored by to_stored_id(). -1 if unknown (e.g. ExecutionBatch)
+    """
+    COLUMNS = (
+        ('timestamp', '<f8'),
+        ('price', '<f8'),
+        ('qty', '<f8'),
+        ('side', 'i1'),
+        ('execution_id', '<i8'),
+    )
+
+    def append_executions(self, exchange: str, executions: Iterable[Execution]) -> int:
+        """executions of multiple instruments are grouped by instrument"""
+        rows: Dict[str, Tuple[list, list, list, list, list]] = {}
+        for x in executions:
+            timestamps, prices, qtys, sides, ids = rows.setdefault(x.instrument, ([], [], [], [], []))
+            timestamps.append(x.timestamp)
+            prices.append(x.price)
+            qtys.append(x.qty)
+            sides.append(ExecutionSide.of(x.side))
+            ids.append(to_stored_id(x.execution_id))
+        n = 0
+        for instrument, (timestamps, prices, qtys, sides, ids) in rows.items():
+            n += self.append(exchange, instrument, dict(timestamp=timestamps, price=prices, qty=qtys,
+                                                        side=sides, execution_id=ids))
+        return n
+
+    def append_batch(self, exchange: str, batch: ExecutionBatch) -> int:
+        return self.append(exchange, batch.instrument, dict(timestamp=batch.timestamp, price=batch.price,
+                                                            qty=batch.qty, side=batch.side,
+                                                            execution_id=np.full(len(batch), -1)))
+
+    def write_stream_data(self, exchange: str, data: StreamData) -> bool:
+        """
+        append execution stream data of StreamClient.
+
+            client = StreamClient(on_data=lambda x: store.write_stream_data('bitmex', x))
+
+        :return: False if data is not execution
+        """
+        if not isinstance(data.key, tuple) or data.key[0] != StreamType.EXECUTION:
+            return False
+        if isinstance(data.data, ExecutionBatch):
+            self.append_batch(exchange, data.data)
+        else:
+            self.append_executions(exchange, data.data)
+        return True
+
+    def filter_new_rows(self, tail: Columns, columns: Columns) -> 'np.ndarray':
+        # rows of same timestamp as last row are dropped if their ids are stored. e.g. resumed backfill
+        last = tail['timestamp'][-1]
+        keep = super().filter_new_rows(tail, columns)
+        stored_ids = tail['execution_id'][(tail['timestamp'] == last) & (tail['execution_id'] >= 0)]
+        if len(stored_ids):
+            keep &= ~((columns['timestamp'] == last) & np.isin(columns['execution_id'], stored_ids))
+        return keep
+
+    def read_batch(self, exchange: str, instrument: str, start: float = None, end: float = None) -> ExecutionBatch:
+        columns = self.read(exchange, instrument, start, end)
+        return ExecutionBatch(instrument=instrument, timestamp=columns['timestamp'], price=columns['price'],
+                              qty=columns['qty'], side=columns['side'])
+
+
+class CandleStore(ColumnStore):
+    """candles per (exchange, instrument, resolution, day). volume is NaN if None"""
+    COLUMNS = (
+        ('timestamp', '<f8'),
+        ('open', '<f8'),
+        ('high', '<f8'),
+        ('low', '<f8'),
+        ('close', '<f8'),
+        ('volume', '<f8'),
+    )
+
+    @staticmethod
+    def get_name(instrument: str, resolution: str) -> str:
+        return f'{instrument}@{resolution}'
+
+    def append_candles(self, exchange: str, instrument: str, resolution: str, candles: Iterable[Candle]) -> int:
+        candles = list(candles)
+        columns = {k: [getattr(x, k) for x in candles] for k, _ in self.COLUMNS}
+        columns['volume'] = [np.nan if x is None else x for x in columns['volume']]
+        return self.append(exchange, self.get_name(instrument, resolution), columns)
+
+    def write_stream_data(self, exchange: str, data: StreamData) -> bool:
+        """
+        append candle stream data of StreamClient.
+        :return: False if data is not candle
+        """
+        if not isinstance(data.key, tuple) or data.key[0] != StreamType.CANDLE:
+            return False
+        resolution, candle = data.data
+        self.append_candles(exchange, data.key[1], resolution, [candle])
+        return True
+
+    def read_candles(self, exchange: str, instrument: str, resolution: str,
+                     start: float = None, end: float = None) -> Columns:
+        """column name -> array"""
+        return self.read(exchange, self.get_name(instrument, resolution), start, end)
+
+    def iter_candles(self, exchange: str, instrument: str, resolution: str,
+                     start: float = None, end: float = None) -> Iterator[Candle]:
+        for columns in self.iter_days(exchange, self.get_name(instrument, resolution), start, end):
+            for row in zip(*[columns[k].tolist() for k, _ in self.COLUMNS]):
+                timestamp, open_, high, low, close, volume = row
+                yield Candle(timestamp=timestamp, open=open_, high=high, low=low, close=close,
+                             volume=None if volume != volume else volume)
+
+    def get_last_timestamp(self, exchange: str, instrument: str, resolution: str) -> Optional[float]:
+        for day_dir in reversed(self.get_day_dirs(exchange, self.get_name(instrument, resolution))):
+            n = min(self._count_rows(day_dir, k, dtype) for k, dtype in self.COLUMNS)
+            if n:
+                return float(self._memmap(day_dir, 'timestamp', '<f8', n)[-1])
+        return None
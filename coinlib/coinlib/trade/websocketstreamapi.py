@@ -7,7 +7,7 @@ from collections import deque
 from typing import Any, Hashable, Tuple
 
 import websocket
-from websocket import WebSocket, WebSocketTimeoutException
+from websocket import ABNF, WebSocket, WebSocketTimeoutException
 
 from .streamapi import StreamApi
 
@@ -37,7 +37,8 @@ class WebSocketStreamApi(StreamApi):
         pass
 
     def create_connection(self) -> WebSocket:
-        self._ws = websocket.create_connection(self._url, enable_multithread=True)
+        # payload is validated by decode_message(), skip per-frame utf8 validation
+        self._ws = websocket.create_connection(self._url, enable_multithread=True, skip_utf8_validation=True)
         return self._ws
 
     def run(self):
@@ -54,8 +55,9 @@ class WebSocketStreamApi(StreamApi):
             try:
                 while self.is_active():
                     try:
-                        message_data = ws.recv()
-                        self.on_message(message_data)
+                        opcode, message_data = ws.recv_data()
+                        if opcode in (ABNF.OPCODE_TEXT, ABNF.OPCODE_BINARY):
+                            self.on_message(message_data)
                     except WebSocketTimeoutException:
                         pass
             finally:
@@ -67,8 +69,13 @@ class WebSocketStreamApi(StreamApi):
             logger.exception(e)
 
     @abstractmethod
-    def on_message(self, message_data: str):
-        pass
+    def on_message(self, message_data: bytes):
+        """message_data is raw frame payload(not decoded to str)"""
+
+    def decode_message(self, message_data: bytes) -> Any:
+        """Override if necessary"""
+        _ = self
+        return json.loads(message_data)
 
     def send_message(self, message: Any):
         assert self._ws
@@ -0,0 +1,69 @@
+from collections import deque
+import threading
+from typing import Deque, Dict, Hashable, Optional
+
+
+class Hedger:
+    """
+    Thread-safe latency tracker and budget of hedged requests.
+    - get_delay() returns rolling `percentile` of recent `window` latencies of key.
+      duplicate request is sent if first one has not completed by then
+    - every request earns `budget` tokens and a duplicate spends one,
+      so duplicates are `budget` ratio of requests at most (burst `burst`)
+    """
+
+    def __init__(self, *, percentile: float = 0.95, budget: float = 0.05, window: int = 200,
+                 min_samples: int = 20, min_delay: float = 0.01, burst: float = 10):
+        """
+        :param min_samples: no duplicate until latencies of key are collected
+        :param min_delay: lower bound of delay
+        """
+        assert 0 < percentile < 1, percentile
+        self.percentile = percentile
+        self.budget = budget
+        self.window = window
+        self.min_samples = min_samples
+        self.min_delay = min_delay
+        self.burst = burst
+        self._latencies: Dict[Hashable, Deque[float]] = {}
+        self._tokens = 0.0
+        self._hedged = 0
+        self._lock = threading.Lock()
+
+    @property
+    def hedged(self) -> int:
+        """number of duplicates sent"""
+        return self._hedged
+
+    def record(self, key: Hashable, latency: float):
+        with self._lock:
+            latencies = self._latencies.get(key)
+            if latencies is None:
+                latencies = self._latencies[key] = deque(maxlen=self.window)
+            latencies.append(latency)
+
+    def get_delay(self, key: Hashable) -> Optional[float]:
+        """
+        :return: seconds to wait before duplicate request. None if not enough samples
+        """
+        with self._lock:
+            latencies = self._latencies.get(key)
+            if not latencies or len(latencies) < self.min_samples:
+                return None
+            values = sorted(latencies)
+        index = min(len(values) - 1, int(len(values) * self.percentile))
+        return max(self.min_delay, values[index])
+
+    def earn(self):
+        """called for each request"""
+        with self._lock:
+            self._tokens = min(self.burst, self._tokens + self.budget)
+
+    def spend(self) -> bool:
+        """:return: True if duplicate request can be sent"""
+        with self._lock:
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            self._hedged += 1
+            return True
@@ -0,0 +1,71 @@
+import codecs
+import json
+from typing import Any, Iterable, Iterator
+
+_WHITESPACE = ' \t\n\r'
+_DELIMITERS = _WHITESPACE + ',]'
+_decoder = json.JSONDecoder()
+
+
+def iter_json_array(chunks: Iterable[bytes]) -> Iterator[Any]:
+    """
+    yield elements of top-level json array while chunks of utf-8 bytes arrive.
+    memory holds one chunk and one element at most, not whole body.
+
+        for x in iter_json_array(res.iter_content(64 * 1024)):
+            ...
+
+    raise ValueError if body is not an array or broken
+    """
+    text_decoder = codecs.getincrementaldecoder('utf-8')()
+    buf = ''
+    pos = 0
+    started = False
+    # ',' or ']' is expected
+    after_element = False
+    chunks = iter(chunks)
+    finished = False
+
+    while True:
+        # skip whitespace and delimiters
+        while pos < len(buf) and buf[pos] in _WHITESPACE:
+            pos += 1
+        if pos < len(buf):
+            c = buf[pos]
+            if not started:
+                if c != '[':
+                    raise ValueError(f'not a json array: {buf[pos:pos + 20]!r}')
+                started = True
+                pos += 1
+                continue
+            if c == ']':
+                return
+            if after_element:
+                if c != ',':
+                    raise ValueError(f'invalid json array: {buf[pos:pos + 20]!r}')
+                after_element = False
+                pos += 1
+                continue
+            try:
+                value, end = _decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                value, end = None, None
+            # number like '23.' may continue in next chunk. element of array is followed by delimiter
+            if end is not None and ((end < len(buf) and buf[end] in _DELIMITERS) or finished):
+                yield value
+                pos = end
+                after_element = True
+                continue
+            if finished:
+                raise ValueError(f'invalid json array: {buf[pos:pos + 20]!r}')
+        elif finished:
+            raise ValueError('unexpected end of json array')
+        # need more data
+        buf = buf[pos:]
+        pos = 0
+        chunk = next(chunks, None)
+        if chunk is None:
+            buf += text_decoder.decode(b'', final=True)
+            finished = True
+        else:
+            buf += text_decoder.decode(chunk)
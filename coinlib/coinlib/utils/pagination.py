@@ -0,0 +1,101 @@
+import contextlib
+import contextvars
+from queue import Queue
+import threading
+from typing import Any, Callable, Iterator, TypeVar
+
+P = TypeVar('P')
+
+_END = object()
+
+_look_ahead: contextvars.ContextVar = contextvars.ContextVar('look_ahead', default=None)
+
+
+@contextlib.contextmanager
+def prefetch(look_ahead: int):
+    """
+    override look_ahead of iter_pages() started in this context(thread or task).
+
+        with prefetch(0):
+            next(client.get_private_executions('BTC_JPY'))
+    """
+    token = _look_ahead.set(look_ahead)
+    try:
+        yield
+    finally:
+        _look_ahead.reset(token)
+
+
+class _Failure:
+    __slots__ = ('exc',)
+
+    def __init__(self, exc: Exception):
+        self.exc = exc
+
+
+def iter_pages(fetch_page: Callable[[Any], P], next_cursor: Callable[[Any, P], Any], cursor: Any = None,
+               *, look_ahead: int = 1) -> Iterator[P]:
+    """
+    yield fetch_page(cursor), fetch_page(next_cursor(cursor, page)), ... until next_cursor() returns None.
+    while consumer processes a page, up to look_ahead following pages are fetched in background thread.
+
+        def fetch_page(before):
+            return api.public_get('/executions', before=before)
+
+        def next_cursor(before, page):
+            return page[-1]['id'] if len(page) == limit else None
+
+        for page in iter_pages(fetch_page, next_cursor):
+            ...
+
+    exception of fetch_page() or next_cursor() is raised to consumer when it reaches the page.
+    the thread stops when generator is closed.
+    :param look_ahead: 0 to fetch next page after consumer requests it (no thread). see prefetch()
+    """
+    if _look_ahead.get() is not None:
+        look_ahead = _look_ahead.get()
+    if look_ahead <= 0:
+        while True:
+            page = fetch_page(cursor)
+            yield page
+            cursor = next_cursor(cursor, page)
+            if cursor is None:
+                return
+
+    q = Queue()
+    # a slot is held from start of fetch until consumer takes the page
+    slots = threading.Semaphore(look_ahead)
+    stopped = threading.Event()
+
+    def _acquire() -> bool:
+        while not stopped.is_set():
+            if slots.acquire(timeout=0.1):
+                return True
+        return False
+
+    def _run(_cursor: Any):
+        try:
+            while _acquire():
+                page = fetch_page(_cursor)
+                q.put(page)
+                _cursor = next_cursor(_cursor, page)
+                if _cursor is None:
+                    break
+            q.put(_END)
+        except Exception as e:
+            q.put(_Failure(e))
+
+    # deadline of caller is passed to thread
+    context = contextvars.copy_context()
+    threading.Thread(target=context.run, args=(_run, cursor), daemon=True, name='iter_pages').start()
+    try:
+        while True:
+            item = q.get()
+            if item is _END:
+                return
+            if isinstance(item, _Failure):
+                raise item.exc
+            slots.release()
+            yield item
+    finally:
+        stopped.set()
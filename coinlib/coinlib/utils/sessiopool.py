@@ -1,27 +1,220 @@
 import contextlib
-from queue import LifoQueue
+from dataclasses import dataclass
+import logging
+from queue import LifoQueue, Empty
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+import urllib.parse
 
 from requests import Session
+from requests.adapters import HTTPAdapter
 
+from coinlib.utils.threadmixin import ThreadMixin
+from coinlib.utils.tokenbucket import TokenBucket
 
-class SessionPool:
-    def __init__(self, pool_size: int, *, timeout: float = 60):
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SessionPoolStats:
+    gets: int = 0
+    # get() blocked because all sessions were in use
+    waits: int = 0
+    # get() timed out
+    timeouts: int = 0
+    # new connections (TCP/TLS handshakes)
+    handshakes: int = 0
+    # warm-up and keep-alive requests
+    probes: int = 0
+
+
+def get_host(url: Optional[str]) -> Optional[str]:
+    """'https://api.example.com/v1/x' -> 'https://api.example.com'"""
+    if not url:
+        return None
+    parsed = urllib.parse.urlsplit(url)
+    return f'{parsed.scheme}://{parsed.netloc}'
+
+
+class SessionPool(ThreadMixin):
+    """
+    LIFO pool of requests.Session per host.
+    pool_size sessions are created for each host when the host is used first.
+    start() runs keep-alive thread which sends HEAD request by sessions idle longer than keep_alive_interval.
+    sessions are probed one by one, so get() waits one probe at most
+    """
+
+    def __init__(self, pool_size: int, *, timeout: float = 60, pool_maxsize: int = None,
+                 keep_alive_interval: float = 30,
+                 get_rate_limiter: Callable[[str], Optional[TokenBucket]] = None):
+        """
+        :param pool_maxsize: pool_maxsize of HTTPAdapter of each session
+        :param get_rate_limiter: rate limiter of host. a probe consumes a token, and keep-alive skips probes
+                                 while the limiter has no token
+        """
         self.pool_size = pool_size
         self.timeout = timeout
-        self.q = LifoQueue()
-        for _ in range(pool_size):
-            self.q.put(Session())
+        self.pool_maxsize = pool_maxsize
+        self.keep_alive_interval = keep_alive_interval
+        self.get_rate_limiter = get_rate_limiter
+        self._thread_data = self.ThreadData()
+        self._queues: Dict[Optional[str], LifoQueue] = {}
+        self._sessions: List[Session] = []
+        # id(session) -> unix time when returned to pool
+        self._idle_since: Dict[int, float] = {}
+        self._stats = SessionPoolStats()
+        self._lock = threading.Lock()
+        self._get_queue(None)
+
+    @property
+    def q(self) -> LifoQueue:
+        """queue of sessions used without url"""
+        return self._queues[None]
+
+    @property
+    def stats(self) -> SessionPoolStats:
+        with self._lock:
+            handshakes = sum(self._count_connections(x) for x in self._sessions)
+            return SessionPoolStats(gets=self._stats.gets, waits=self._stats.waits, timeouts=self._stats.timeouts,
+                                    handshakes=self._stats.handshakes + handshakes, probes=self._stats.probes)
+
+    def new_session(self) -> Session:
+        s = Session()
+        if self.pool_maxsize:
+            for prefix in ['https://', 'http://']:
+                s.mount(prefix, HTTPAdapter(pool_maxsize=self.pool_maxsize))
+        return s
+
+    @staticmethod
+    def _count_connections(s: Session) -> int:
+        n = 0
+        for adapter in s.adapters.values():
+            pools = getattr(getattr(adapter, 'poolmanager', None), 'pools', None)
+            if pools is None:
+                continue
+            for key in pools.keys():
+                n += getattr(pools.get(key), 'num_connections', 0)
+        return n
+
+    def _get_queue(self, host: Optional[str]) -> LifoQueue:
+        with self._lock:
+            q = self._queues.get(host)
+            if q is None:
+                q = LifoQueue()
+                for _ in range(self.pool_size):
+                    s = self.new_session()
+                    self._sessions.append(s)
+                    self._idle_since[id(s)] = time.time()
+                    q.put(s)
+                self._queues[host] = q
+            return q
 
     @contextlib.contextmanager
-    def get(self) -> Session:
+    def get(self, url: str = None) -> Session:
+        """
+        :param url: session for host of url
+        """
+        with self._lock:
+            self._stats.gets += 1
         if not self.pool_size:
-            with Session() as s:
-                yield s
-        else:
-            s = None
+            with self.new_session() as s:
+                try:
+                    yield s
+                finally:
+                    with self._lock:
+                        self._stats.handshakes += self._count_connections(s)
+            return
+
+        q = self._get_queue(get_host(url))
+        s = None
+        try:
+            try:
+                s = q.get_nowait()
+            except Empty:
+                with self._lock:
+                    self._stats.waits += 1
+                try:
+                    s = q.get(timeout=self.timeout)
+                except Empty:
+                    with self._lock:
+                        self._stats.timeouts += 1
+                    raise
+            yield s
+        finally:
+            if s:
+                self._put(q, s)
+
+    def _put(self, q: LifoQueue, s: Session):
+        with self._lock:
+            self._idle_since[id(s)] = time.time()
+        q.put(s)
+
+    def warm_up(self, url: str):
+        """connect all idle sessions for host of url"""
+        host = get_host(url)
+        q = self._get_queue(host)
+        sessions = []
+        try:
+            while True:
+                sessions.append(q.get_nowait())
+        except Empty:
+            pass
+
+        def _probe(s: Session):
+            try:
+                limiter = self.get_rate_limiter and self.get_rate_limiter(host)
+                if limiter:
+                    limiter.acquire()
+                self._probe(host, s)
+            finally:
+                self._put(q, s)
+
+        threads = [threading.Thread(target=_probe, args=(s,), daemon=True) for s in sessions]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+    def _probe(self, host: str, s: Session):
+        try:
+            s.head(host + '/', timeout=self.timeout)
+        except Exception as e:
+            logger.warning(f'probe failed host={host} {e}')
+        with self._lock:
+            self._stats.probes += 1
+
+    def _take_idle_session(self, q: LifoQueue, idle_before: float) -> Optional[Session]:
+        """remove the session idle longest if it is idle since before idle_before"""
+        with q.mutex:
+            sessions = [x for x in q.queue if self._idle_since.get(id(x), 0) <= idle_before]
+            if not sessions:
+                return None
+            s = min(sessions, key=lambda x: self._idle_since.get(id(x), 0))
+            q.queue.remove(s)
+            return s
+
+    def _probe_idle_sessions(self, host: str, q: LifoQueue):
+        """probe sessions idle longer than keep_alive_interval one by one"""
+        idle_before = time.time() - self.keep_alive_interval
+        limiter = self.get_rate_limiter and self.get_rate_limiter(host)
+        while self.is_active():
+            s = self._take_idle_session(q, idle_before)
+            if s is None:
+                return
+            if limiter and limiter.reserve(max_wait=0) is None:
+                # keep tokens for requests. probed in next interval
+                q.put(s)
+                return
             try:
-                s = self.q.get(timeout=self.timeout)
-                yield s
+                self._probe(host, s)
             finally:
-                if s:
-                    self.q.put(s)
+                self._put(q, s)
+
+    def run(self):
+        while self.is_active():
+            time.sleep(self.keep_alive_interval)
+            with self._lock:
+                queues = [(k, v) for k, v in self._queues.items() if k]
+            for host, q in queues:
+                self._probe_idle_sessions(host, q)
@@ -0,0 +1,79 @@
+import threading
+import time
+from typing import Optional
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket.
+    Holds `capacity` tokens at most and refills `rate` tokens per second.
+    acquire() reserves tokens in arrival order and sleeps until reserved tokens are refilled.
+    """
+
+    def __init__(self, capacity: float, rate: float):
+        assert capacity > 0 and rate > 0, (capacity, rate)
+        self.capacity = capacity
+        self.rate = rate
+        self._tokens = float(capacity)
+        # refill starts from here. may be future while paused
+        self._updated_at = time.time()
+        self._lock = threading.Lock()
+
+    @property
+    def tokens(self) -> float:
+        with self._lock:
+            self._refill(time.time())
+            return self._tokens
+
+    def _refill(self, now: float):
+        if now > self._updated_at:
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+            self._updated_at = now
+
+    def acquire(self, tokens: float = 1, max_wait: float = None) -> Optional[float]:
+        """
+        :return: waited seconds. None if wait exceeds max_wait (nothing is reserved)
+        """
+        wait = self.reserve(tokens, max_wait)
+        if wait:
+            time.sleep(wait)
+        return wait
+
+    def reserve(self, tokens: float = 1, max_wait: float = None) -> Optional[float]:
+        """
+        reserve tokens without sleeping. caller must wait returned seconds before using them.
+        :return: seconds to wait. None if wait exceeds max_wait (nothing is reserved)
+        """
+        with self._lock:
+            now = time.time()
+            self._refill(now)
+            wait = max(self._updated_at - now, 0) + max(tokens - self._tokens, 0) / self.rate
+            if max_wait is not None and wait > max_wait:
+                return None
+            self._tokens -= tokens
+        return wait
+
+    def pause(self, seconds: float):
+        """no token is refilled for seconds"""
+        with self._lock:
+            now = time.time()
+            self._refill(now)
+            self._tokens = min(self._tokens, 0)
+            self._updated_at = max(self._updated_at, now + seconds)
+
+    def update(self, remaining: float, reset_seconds: float = None, limit: float = None):
+        """
+        update state from server side values.
+        :param remaining: remaining requests reported by server
+        :param reset_seconds: seconds until limit is reset
+        :param limit: capacity reported by server
+        """
+        with self._lock:
+            now = time.time()
+            self._refill(now)
+            if limit:
+                self.capacity = limit
+            # requests in flight are not counted by server yet. trust smaller one
+            self._tokens = min(self._tokens, remaining, self.capacity)
+        if remaining <= 0 and reset_seconds:
+            self.pause(reset_seconds)
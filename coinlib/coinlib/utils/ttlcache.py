@@ -0,0 +1,83 @@
+from collections import OrderedDict
+from concurrent.futures import Future
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable
+
+logger = logging.getLogger(__name__)
+
+
+class _Entry:
+    __slots__ = ('value', 'expires_at')
+
+    def __init__(self, value: Any, expires_at: float):
+        self.value = value
+        self.expires_at = expires_at
+
+
+class TTLCache:
+    """
+    Thread-safe cache of loaded values.
+    - expires ttl seconds after loaded
+    - least recently used entry is evicted if size exceeds maxsize
+    - concurrent loads of same key are coalesced into one loader call (single-flight)
+    - expired value is returned for stale_seconds while it is reloaded in background
+    values are shared by callers. do not modify them.
+    """
+
+    def __init__(self, maxsize: int = 1024, *, stale_seconds: float = 0):
+        self.maxsize = maxsize
+        self.stale_seconds = stale_seconds
+        self._entries: Dict[Hashable, _Entry] = OrderedDict()
+        self._loading: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def get(self, key: Hashable, loader: Callable[[], Any], ttl: float) -> Any:
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                if now < entry.expires_at:
+                    return entry.value
+                if now < entry.expires_at + self.stale_seconds:
+                    if key not in self._loading:
+                        future = self._loading[key] = Future()
+                        threading.Thread(target=self._reload, args=(key, loader, ttl, future), daemon=True).start()
+                    return entry.value
+            future = self._loading.get(key)
+            is_loader = future is None
+            if is_loader:
+                future = self._loading[key] = Future()
+        if is_loader:
+            self._load(key, loader, ttl, future)
+        return future.result()
+
+    def _load(self, key: Hashable, loader: Callable[[], Any], ttl: float, future: Future):
+        try:
+            value = loader()
+        except Exception as e:
+            with self._lock:
+                self._loading.pop(key, None)
+            future.set_exception(e)
+            return
+        with self._lock:
+            self._entries[key] = _Entry(value, time.time() + ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+            self._loading.pop(key, None)
+        future.set_result(value)
+
+    def _reload(self, key: Hashable, loader: Callable[[], Any], ttl: float, future: Future):
+        self._load(key, loader, ttl, future)
+        if future.exception():
+            logger.warning(f'reload failed key={key} {future.exception()}')
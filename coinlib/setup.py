@@ -13,6 +13,8 @@ setup(
     description='',
     install_requires=['requests', 'pubnub', 'pyyaml', 'websocket-client'],
     extras_require={
-        'test': ['pytest'],
+        'numpy': ['numpy'],
+        'async': ['aiohttp'],
+        'test': ['pytest', 'numpy', 'aiohttp'],
     },
 )
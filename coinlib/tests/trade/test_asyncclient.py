@@ -0,0 +1,107 @@
+import asyncio
+import threading
+
+import requests
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from coinlib.errors import NotFoundError
+from coinlib.trade.auth import Auth
+from coinlib.trade.client import Client
+from coinlib.trade.restapi import RestApi
+from coinlib.utils.pagination import iter_pages
+
+
+class DummyAuth(Auth):
+    def sign(self, req: requests.PreparedRequest) -> requests.PreparedRequest:
+        return req
+
+
+class DummyRestApi(RestApi):
+    AUTH_CLASS = DummyAuth
+
+    def on_error(self, exc: Exception):
+        if isinstance(exc, requests.HTTPError) and exc.response.status_code == 404:
+            raise NotFoundError(exc.response.json()) from exc
+        super().on_error(exc)
+
+
+class DummyClient(Client):
+    REST_API_CLASS = DummyRestApi
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.threads = set()
+        self.runs = 0
+
+    def get_ticker(self, instrument: str):
+        self.threads.add(threading.current_thread())
+        res = self.public_get('/a', n=1)
+        try:
+            res2 = self.public_get('/a', n=res['n'] + 1)
+        except Exception:
+            assert False
+        # response is not shared between runs
+        res['n'] = -1
+        return instrument, res2['n']
+
+    def get_order_book(self, instrument: str):
+        try:
+            return self.public_get('/missing')
+        except NotFoundError:
+            return 'handled'
+
+    def get_public_executions(self, instrument: str):
+        for page in iter_pages(lambda n: self.public_get('/a', n=n)['items'],
+                               lambda n, _: n + 1 if n < 3 else None, 1):
+            yield from page
+
+    def get_private_executions(self, instrument: str):
+        self.runs += 1
+        for page in self._iter_pages(lambda n: self.private_get('/a', n=n)['items'],
+                                     lambda n, _: n + 1 if n < 4 else None, 1):
+            yield from page
+
+    # not used
+    get_instruments = get_balances_list = get_orders = submit_order = None
+    cancel_order = update_order = get_positions = close_position = None
+
+
+def test_async_client():
+    requested = []
+
+    async def handle(request: web.Request):
+        if request.path == '/missing':
+            return web.json_response({'error': 'not found'}, status=404)
+        n = int(request.query['n'])
+        requested.append(n)
+        return web.json_response({'n': n, 'items': [n * 10, n * 10 + 1]})
+
+    async def _test():
+        app = web.Application()
+        app.router.add_route('GET', '/{tail:.*}', handle)
+        async with TestServer(app) as server:
+            DummyRestApi.BASE_URL = str(server.make_url('')).rstrip('/')
+            client = DummyClient({'api_key': 'key', 'api_secret': 'secret'})
+            async with client.to_async() as async_client:
+                # converter runs in event loop and awaits requests
+                assert await async_client.get_ticker('BTC_JPY') == ('BTC_JPY', 2)
+                assert requested == [1, 2]
+                assert client.threads == {threading.current_thread()}
+
+                # error of request is handled by converter
+                assert await async_client.get_order_book('BTC_JPY') == 'handled'
+
+                requested.clear()
+                rows = [x async for x in await async_client.get_public_executions('BTC_JPY')]
+                assert rows == [10, 11, 20, 21, 30, 31]
+                assert requested == [1, 2, 3]
+
+                # pages are fetched ahead without running converter again
+                requested.clear()
+                rows = [x async for x in await async_client.get_private_executions('BTC_JPY')]
+                assert rows == [10, 11, 20, 21, 30, 31, 40, 41]
+                assert requested == [1, 2, 3, 4]
+                assert client.runs == 2
+
+    asyncio.run(_test())
@@ -0,0 +1,57 @@
+import asyncio
+
+import requests
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from coinlib.errors import NotFoundError
+from coinlib.trade.asyncrestapi import AsyncRestApi
+from coinlib.trade.auth import Auth
+from coinlib.trade.restapi import RestApi
+
+
+class DummyAuth(Auth):
+    def sign(self, req: requests.PreparedRequest) -> requests.PreparedRequest:
+        req.headers['api-key'] = self.api_key
+        return req
+
+
+class DummyRestApi(RestApi):
+    AUTH_CLASS = DummyAuth
+    CONTENT_TYPE = 'application/json'
+
+    def on_error(self, exc: Exception):
+        if isinstance(exc, requests.HTTPError) and exc.response.status_code == 404:
+            raise NotFoundError(exc.response.json()) from exc
+        super().on_error(exc)
+
+
+async def handle(request: web.Request):
+    if request.path == '/missing':
+        return web.json_response({'error': 'not found'}, status=404)
+    return web.json_response({
+        'path': request.path,
+        'query': dict(request.query),
+        'body': await request.json() if request.can_read_body else None,
+        'api_key': request.headers.get('api-key'),
+    })
+
+
+def test_async_rest_api():
+    async def _test():
+        app = web.Application()
+        app.router.add_route('*', '/{tail:.*}', handle)
+        async with TestServer(app) as server:
+            api_class = AsyncRestApi.make_class(DummyRestApi)
+            api_class.BASE_URL = str(server.make_url('')).rstrip('/')
+            async with api_class({'api_key': 'key', 'api_secret': 'secret'}) as api:
+                results = await asyncio.gather(api.public_get('/a', x=1), api.private_post('/b', y=2))
+                assert results[0] == {'path': '/a', 'query': {'x': '1'}, 'body': None, 'api_key': None}
+                assert results[1] == {'path': '/b', 'query': {}, 'body': {'y': 2}, 'api_key': 'key'}
+                try:
+                    await api.public_get('/missing')
+                    assert False
+                except NotFoundError as e:
+                    assert e.info == {'error': 'not found'}
+
+    asyncio.run(_test())
@@ -0,0 +1,28 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from coinlib.trade.auth import Auth, NonceAllocator
+
+
+class DummyAuth(Auth):
+    def sign(self, req: requests.PreparedRequest) -> requests.PreparedRequest:
+        return req
+
+
+def test_nonce_allocator():
+    allocator = NonceAllocator()
+    with ThreadPoolExecutor(8) as executor:
+        nonces = list(executor.map(lambda _: allocator.allocate('key'), range(10000)))
+    assert len(set(nonces)) == len(nonces)
+
+    nonces = [allocator.allocate('key') for _ in range(100)]
+    assert nonces == sorted(nonces)
+    assert allocator.allocate('other') < nonces[-1]
+
+
+def test_get_nonce():
+    auth1 = DummyAuth({'api_key': 'key'})
+    auth2 = DummyAuth({'api_key': 'key'})
+    nonces = [auth.get_nonce() for _ in range(100) for auth in (auth1, auth2)]
+    assert nonces == sorted(set(nonces))
@@ -0,0 +1,90 @@
+import threading
+import time
+
+import requests
+
+from coinlib.datatypes import Execution
+from coinlib.trade.auth import Auth
+from coinlib.trade.backfill import Backfill
+from coinlib.trade.client import Client, ExecutionRangeKey
+from coinlib.trade.restapi import RestApi
+from coinlib.trade.tradestore import ExecutionStore
+
+
+class DummyAuth(Auth):
+    def sign(self, req: requests.PreparedRequest) -> requests.PreparedRequest:
+        return req
+
+
+class DummyRestApi(RestApi):
+    AUTH_CLASS = DummyAuth
+
+
+class DummyClient(Client):
+    REST_API_CLASS = DummyRestApi
+    EXECUTION_RANGE_KEY = ExecutionRangeKey.ID
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, instrument_registry=None, **kwargs)
+        self.threads = set()
+        self.ranges = []
+
+    def get_public_executions_range(self, instrument: str, start: int, end: int):
+        self.threads.add(threading.get_ident())
+        self.ranges.append((start, end))
+        time.sleep(0.05)
+        # inclusive end like some servers
+        for i in range(start, end + 1):
+            yield Execution(execution_id=i, timestamp=i, instrument=instrument, side='BUY', price=1, qty=1)
+
+    # not used
+    get_instruments = get_ticker = get_order_book = get_public_executions = None
+    get_balances_list = get_orders = submit_order = cancel_order = update_order = None
+    get_private_executions = get_positions = close_position = None
+
+
+def test_backfill():
+    client = DummyClient(session_pool_size=4)
+    backfill = Backfill(client, 'BTC_JPY', 1, 101, chunk_size=10)
+    start = time.time()
+    ids = [x.execution_id for x in backfill]
+    assert time.time() - start < 0.3
+    assert len(client.threads) > 1
+    # stitched and deduplicated
+    assert ids == list(range(1, 102))
+    assert backfill.is_done
+
+
+def test_backfill_resume(tmp_path):
+    path = tmp_path / 'checkpoint.json'
+    client = DummyClient(session_pool_size=2)
+    ids = []
+    for x in Backfill(client, 'BTC_JPY', 1, 101, chunk_size=10, checkpoint_path=path):
+        ids.append(x.execution_id)
+        if x.execution_id == 35:
+            break
+    assert ids == list(range(1, 36))
+
+    client = DummyClient(session_pool_size=2)
+    backfill = Backfill(client, 'BTC_JPY', 1, 101, chunk_size=10, checkpoint_path=path)
+    assert backfill.position == 31
+    ids = [x.execution_id for x in backfill]
+    assert ids[0] == 31 and ids[-1] == 101
+    assert client.ranges[0] == (31, 41)
+
+    # other arguments
+    assert Backfill(client, 'BTC_JPY', 1, 201, chunk_size=10, checkpoint_path=path).position == 1
+
+
+def test_backfill_write_to(tmp_path):
+    store = ExecutionStore(tmp_path / 'store')
+    path = tmp_path / 'checkpoint.json'
+    client = DummyClient(session_pool_size=2)
+    for executions in Backfill(client, 'BTC_JPY', 1, 101, chunk_size=10, checkpoint_path=path).iter_chunks():
+        store.append_executions('dummy', executions)
+        if executions[-1].execution_id == 31:
+            break
+
+    # chunk [21, 31) not checkpointed is fetched again and its executions are not stored twice
+    assert Backfill(client, 'BTC_JPY', 1, 101, chunk_size=10, checkpoint_path=path).write_to(store, 'dummy') == 70
+    assert store.read('dummy', 'BTC_JPY')['execution_id'].tolist() == list(range(1, 102))
@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+
+from coinlib.datatypes import ExecutionBatch
+from coinlib.trade.candlebuilder import CandleBuilder, parse_resolution
+
+
+def test_parse_resolution():
+    assert parse_resolution('1s') == 1
+    assert parse_resolution('5m') == 300
+    assert parse_resolution('1h') == 3600
+    assert parse_resolution('1d') == 86400
+    with pytest.raises(AssertionError):
+        parse_resolution('1x')
+    with pytest.raises(AssertionError):
+        parse_resolution('m')
+
+
+def test_candle_builder():
+    builder = CandleBuilder('BTC_JPY', ['1s', '1m'])
+    assert builder.get_candle('1s') is None
+
+    assert builder.add(60.1, 100, 1) == []
+    assert builder.add(60.5, 102, 2) == []
+    assert builder.add(60.9, 99, 3) == []
+    candle = builder.get_candle('1s')
+    assert (candle.timestamp, candle.open, candle.high, candle.low, candle.close, candle.volume) == \
+           (60, 100, 102, 99, 99, 6)
+
+    closed = builder.add(61.0, 101, 1)
+    assert [x[0] for x in closed] == ['1s']
+    candle = closed[0][1]
+    assert (candle.timestamp, candle.open, candle.high, candle.low, candle.close, candle.volume) == \
+           (60, 100, 102, 99, 99, 6)
+    candle = builder.get_candle('1m')
+    assert (candle.timestamp, candle.open, candle.high, candle.low, candle.close, candle.volume) == \
+           (60, 100, 102, 99, 101, 7)
+
+    # no candle for period without execution
+    closed = builder.add(125.0, 103, 1)
+    assert [(x[0], x[1].timestamp) for x in closed] == [('1s', 61), ('1m', 60)]
+    assert builder.get_candle('1m').timestamp == 120
+
+    closed = builder.close(126)
+    assert [(x[0], x[1].timestamp) for x in closed] == [('1s', 125)]
+    assert builder.get_candle('1s') is None
+    assert builder.get_candle('1m').timestamp == 120
+
+    # late execution of closed period is dropped
+    assert builder.add(125.5, 90, 1) == []
+    assert builder.get_candle('1s') is None
+    assert builder.get_candle('1m').low == 90
+    assert builder.add(126.5, 104, 1) == []
+    assert builder.add(119.0, 80, 1) == []
+    assert builder.get_candle('1s').low == 104
+    assert builder.get_candle('1m').low == 90
+
+
+def test_candle_builder_batch():
+    builder = CandleBuilder('BTC_JPY', ['1s'])
+    batch = ExecutionBatch(instrument='BTC_JPY',
+                           timestamp=np.array([1.0, 1.5, 2.0]),
+                           price=np.array([10.0, 12.0, 11.0]),
+                           qty=np.array([1.0, 1.0, 1.0]),
+                           side=np.array([1, -1, 1], dtype=np.int8))
+    closed = builder.add_batch(batch)
+    assert len(closed) == 1
+    candle = closed[0][1]
+    assert (candle.timestamp, candle.open, candle.high, candle.low, candle.close, candle.volume) == \
+           (1, 10, 12, 10, 12, 2)
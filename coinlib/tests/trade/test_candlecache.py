@@ -0,0 +1,52 @@
+import time
+
+from coinlib.datatypes.candle import Candle
+from coinlib.trade.candlecache import CandleCache
+
+DAY = 24 * 60 * 60
+HOUR = 60 * 60
+# 12:30 UTC
+NOW = 1700000000 // DAY * DAY + 12 * HOUR + 30 * 60
+
+
+class DummyServer:
+    """candles of every hour until NOW"""
+
+    def __init__(self):
+        self.requests = []
+
+    def fetch(self, start: float, end: float):
+        self.requests.append((start, end))
+        for timestamp in range(int(start), int(min(end, NOW)), HOUR):
+            yield Candle(timestamp=timestamp, open=1, high=2, low=1, close=2, volume=1)
+
+
+def get_candles(cache: CandleCache, server: DummyServer, start: float, end: float) -> list:
+    return [x.timestamp for x in cache.get_candles(server.fetch, 'dummy', 'BTC_JPY', '1h', start, end)]
+
+
+def test_candle_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(time, 'time', lambda: NOW)
+    server = DummyServer()
+    cache = CandleCache(tmp_path, delay=0)
+    day = NOW // DAY * DAY - 3 * DAY
+
+    # fetched from start of first day
+    assert get_candles(cache, server, day + 12 * HOUR, day + DAY + 6 * HOUR) == \
+        list(range(day + 12 * HOUR, day + DAY + 6 * HOUR, HOUR))
+    assert server.requests == [(day, day + DAY + 6 * HOUR)]
+
+    # served from cache
+    server.requests = []
+    assert len(get_candles(cache, server, day, day + DAY + 6 * HOUR)) == 30
+    assert server.requests == []
+
+    # uncached range only. open candle of 12:00 is not cached
+    assert get_candles(cache, server, day + 20 * HOUR, NOW) == list(range(day + 20 * HOUR, NOW, HOUR))
+    assert server.requests == [(day + DAY + 6 * HOUR, NOW)]
+
+    # cache is shared by other process
+    server.requests = []
+    cache = CandleCache(tmp_path, delay=0)
+    assert len(get_candles(cache, server, day, NOW)) == 3 * 24 + 13
+    assert server.requests == [(NOW - 30 * 60, NOW)]
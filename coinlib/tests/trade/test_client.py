@@ -0,0 +1,118 @@
+import threading
+import time
+
+import pytest
+import requests
+
+from coinlib.datatypes import Instrument, Order, OrderRequest, OrderState, Ticker
+from coinlib.trade.auth import Auth
+from coinlib.trade.client import Client
+from coinlib.trade.instrumentregistry import InstrumentRegistry
+from coinlib.trade.restapi import RestApi
+
+
+class DummyAuth(Auth):
+    def sign(self, req: requests.PreparedRequest) -> requests.PreparedRequest:
+        return req
+
+
+class DummyRestApi(RestApi):
+    AUTH_CLASS = DummyAuth
+
+
+class DummyClient(Client):
+    REST_API_CLASS = DummyRestApi
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.threads = set()
+        self.get_instruments_count = 0
+
+    def get_instruments(self):
+        self.get_instruments_count += 1
+        return {x: Instrument(name=x, base=x[:3], quote=x[4:], name_id=x, base_id=x[:3], quote_id=x[4:])
+                for x in ['BTC_JPY', 'ETH_JPY', 'XRP_JPY']}
+
+    def get_ticker(self, instrument: str) -> Ticker:
+        self.threads.add(threading.get_ident())
+        time.sleep(0.1)
+        return Ticker(timestamp=time.time(), instrument=instrument, ask=1.0, bid=1.0, last=1.0)
+
+    def submit_order(self, instrument: str, order_type: str, side: str, price, qty: float, **kwargs) -> Order:
+        self.threads.add(threading.get_ident())
+        time.sleep(0.1)
+        if qty <= 0:
+            raise ValueError(qty)
+        return Order(order_id=price, timestamp=time.time(), instrument=instrument, order_type=order_type,
+                     side=side, qty=qty, state=OrderState.ACTIVE, price=price)
+
+    def get_orders(self, *, instrument: str = None, **kwargs):
+        for i in range(1, 4):
+            yield Order(order_id=i, timestamp=time.time(), instrument='BTC_JPY', order_type='LIMIT',
+                        side='BUY', qty=1, state=OrderState.ACTIVE, price=100)
+
+    def cancel_order(self, order_id, **kwargs):
+        self.threads.add(threading.get_ident())
+        time.sleep(0.1)
+        if order_id == 2:
+            raise ValueError(order_id)
+        return None
+
+    # not used
+    get_order_book = get_public_executions = None
+    get_balances_list = update_order = None
+    get_private_executions = get_positions = close_position = None
+
+
+def test_get_tickers():
+    client = DummyClient(session_pool_size=2, instrument_registry=None)
+    start = time.time()
+    tickers = client.get_tickers(['BTC_JPY', 'ETH_JPY'])
+    assert time.time() - start < 0.15
+    assert len(client.threads) == 2
+    assert {k: v.instrument for k, v in tickers.items()} == {'BTC_JPY': 'BTC_JPY', 'ETH_JPY': 'ETH_JPY'}
+
+    tickers = client.get_tickers()
+    assert list(tickers) == ['BTC_JPY', 'ETH_JPY', 'XRP_JPY']
+
+
+def test_submit_orders():
+    client = DummyClient(private_concurrency=3, instrument_registry=None)
+    orders = [OrderRequest('BTC_JPY', 'LIMIT', 'BUY', 100 + i, 1 if i != 1 else 0) for i in range(3)]
+    start = time.time()
+    res = client.submit_orders(orders)
+    assert time.time() - start < 0.15
+    assert res[0].price == 100 and res[2].price == 102
+    assert isinstance(res[1], ValueError)
+
+
+def test_cancel_orders():
+    client = DummyClient(private_concurrency=3, instrument_registry=None)
+    start = time.time()
+    res = client.cancel_orders([1, 2, 3])
+    assert time.time() - start < 0.15
+    assert res[0] is None and res[2] is None
+    assert isinstance(res[1], ValueError)
+    with pytest.raises(ValueError):
+        client.cancel_all()
+
+
+def test_instrument_registry(tmp_path):
+    registry = InstrumentRegistry(tmp_path)
+    client1 = DummyClient(instrument_registry=registry)
+    client2 = DummyClient(instrument_registry=registry)
+    assert 'BTC_JPY' in client1.instruments
+    assert client2.rinstruments['eth_jpy'] == 'ETH_JPY'
+    assert client2.currencies['XRP'] == 'XRP'
+    assert (client1.get_instruments_count, client2.get_instruments_count) == (1, 0)
+
+    # other process
+    client3 = DummyClient(instrument_registry=InstrumentRegistry(tmp_path))
+    assert client3.instruments['BTC_JPY'] == client1.instruments['BTC_JPY']
+    assert client3.rcurrencies['JPY'] == 'JPY'
+    assert client3.get_instruments_count == 0
+
+    # expired
+    client4 = DummyClient(instrument_registry=InstrumentRegistry(tmp_path, ttl=0))
+    assert 'BTC_JPY' in client4.instruments
+    assert client4.get_instruments_count == 1
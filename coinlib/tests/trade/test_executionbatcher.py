@@ -0,0 +1,46 @@
+from queue import Queue
+
+import numpy as np
+
+from coinlib.datatypes import ExecutionBatch, ExecutionSide
+from coinlib.trade.executionbatcher import ExecutionBatcher
+
+WAIT = 5
+
+
+def test_execution_batcher():
+    q = Queue()
+    batcher = ExecutionBatcher(60, on_batch=q.put)
+    key = ('execution', 'BTC_JPY')
+    batcher.add(key, [(1, 2.0, 'BUY', 100.0, 0.1, None), (2, 1.0, 'sell', 101.0, 0.2, None)])
+    batcher.add(key, [(3, 3.0, 'Buy', 102.0, 0.3, None), (4, 4.0, '', 103.0, 0.4, None)])
+    batcher.add(('execution', 'ETH_JPY'), [])
+    batcher.flush()
+    assert q.qsize() == 1
+    d = q.get()
+    assert d.key == key
+    batch: ExecutionBatch = d.data
+    assert batch.instrument == 'BTC_JPY'
+    assert len(batch) == 4
+    assert batch.timestamp.dtype == np.float64
+    assert batch.side.dtype == np.int8
+    assert batch.timestamp.tolist() == [1.0, 2.0, 3.0, 4.0]
+    assert batch.price.tolist() == [101.0, 100.0, 102.0, 103.0]
+    assert batch.qty.tolist() == [0.2, 0.1, 0.3, 0.4]
+    assert batch.side.tolist() == [ExecutionSide.SELL, ExecutionSide.BUY, ExecutionSide.BUY, ExecutionSide.UNKNOWN]
+
+    batcher.flush()
+    assert q.empty()
+
+
+def test_execution_batcher_thread():
+    q = Queue()
+    batcher = ExecutionBatcher(0.1, on_batch=q.put)
+    batcher.start()
+    try:
+        batcher.add(('execution', 'BTC_JPY'), [(1, 1.0, 'BUY', 100.0, 0.1, None)])
+        d = q.get(timeout=WAIT)
+        assert len(d.data) == 1
+    finally:
+        batcher.stop()
+    batcher.join(WAIT)
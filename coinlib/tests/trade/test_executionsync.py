@@ -0,0 +1,85 @@
+import requests
+
+from coinlib.datatypes import Execution
+from coinlib.trade.auth import Auth
+from coinlib.trade.client import Client
+from coinlib.trade.executionsync import CursorStore, ExecutionSync
+from coinlib.trade.restapi import RestApi
+
+
+class DummyAuth(Auth):
+    def sign(self, req: requests.PreparedRequest) -> requests.PreparedRequest:
+        return req
+
+
+class DummyRestApi(RestApi):
+    AUTH_CLASS = DummyAuth
+
+
+class DummyClient(Client):
+    REST_API_CLASS = DummyRestApi
+    LIMIT = 3
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, instrument_registry=None, **kwargs)
+        # (id, timestamp) in time ascending order
+        self.executions = []
+        self.fetched = []
+
+    def get_instrument_registry_name(self) -> str:
+        return 'dummy'
+
+    def get_private_executions(self, instrument: str):
+        def fetch_page(page: int) -> list:
+            self.fetched.append(page)
+            end = len(self.executions) - page * self.LIMIT
+            return list(reversed(self.executions[max(end - self.LIMIT, 0):end]))
+
+        def next_cursor(page: int, res: list):
+            return page + 1 if len(res) == self.LIMIT else None
+
+        for res in self._iter_pages(fetch_page, next_cursor, 0):
+            for i, timestamp in res:
+                yield Execution(execution_id=i, timestamp=timestamp, instrument=instrument,
+                                side='BUY', price=1, qty=1)
+
+    # not used
+    get_instruments = get_ticker = get_order_book = get_public_executions = None
+    get_balances_list = get_orders = submit_order = cancel_order = update_order = None
+    get_positions = close_position = None
+
+
+def test_execution_sync(tmp_path):
+    client = DummyClient({'api_key': 'key', 'api_secret': 'secret'}, prefetch_pages=2)
+    client.executions = [(i, 100 + i // 2) for i in range(1, 11)]
+    sync = ExecutionSync(client, CursorStore(tmp_path))
+    assert [x.execution_id for x in sync.iter_new_executions('BTC_JPY')] == list(range(1, 11))
+    assert sync.get_cursor('BTC_JPY').timestamp == 105
+    assert sync.get_cursor('BTC_JPY').execution_ids == [10]
+    assert 'key' not in sync.name
+
+    # 11 has same timestamp as synced 10
+    client.executions += [(11, 105), (12, 106)]
+    client.fetched = []
+    # cursor is loaded from file
+    sync = ExecutionSync(client, CursorStore(tmp_path))
+    assert [x.execution_id for x in sync.iter_new_executions('BTC_JPY')] == [11, 12]
+    # stopped at an older execution on 2nd page without prefetch of following pages
+    assert client.fetched == [0, 1]
+    assert sync.get_cursor('BTC_JPY').timestamp == 106
+
+    client.fetched = []
+    assert list(sync.iter_new_executions('BTC_JPY')) == []
+    assert client.fetched == [0]
+
+
+def test_execution_sync_since():
+    client = DummyClient({'api_key': 'key', 'api_secret': 'secret'})
+    client.executions = [(i, 100 + i) for i in range(1, 11)]
+    sync = ExecutionSync(client)
+    new_executions = sync.iter_new_executions('BTC_JPY', since=108)
+    # cursor is saved after consumed
+    next(new_executions)
+    assert sync.get_cursor('BTC_JPY') is None
+    assert [x.execution_id for x in new_executions] == [9, 10]
+    assert sync.get_cursor('BTC_JPY').timestamp == 110
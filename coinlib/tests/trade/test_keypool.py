@@ -0,0 +1,36 @@
+import requests
+
+from coinlib.trade.auth import Auth
+from coinlib.trade.keypool import KeyPool
+from coinlib.utils.tokenbucket import TokenBucket
+
+
+class DummyAuth(Auth):
+    def sign(self, req: requests.PreparedRequest) -> requests.PreparedRequest:
+        return req
+
+
+def test_least_loaded():
+    auths = [DummyAuth({'api_key': f'key{i}'}) for i in range(3)]
+    pool = KeyPool(auths, 1)
+    slots = [pool.select(lambda _: None) for _ in range(3)]
+    assert [x.auth for x in slots] == auths
+    pool.release(slots[1])
+    assert pool.select(lambda _: None) is slots[1]
+
+    # keys without tokens are skipped
+    limiters = {x.api_key: TokenBucket(1, 0.001) for x in auths}
+    limiters['key0'].acquire()
+    pool = KeyPool(auths, 1)
+    assert pool.select(lambda auth: limiters[auth.api_key]).auth is auths[1]
+
+
+def test_round_robin():
+    auths = [DummyAuth({'api_key': f'key{i}'}) for i in range(3)]
+    pool = KeyPool(auths, 1, KeyPool.ROUND_ROBIN)
+    selected = []
+    for _ in range(6):
+        slot = pool.select(lambda _: None)
+        selected.append(slot.auth)
+        pool.release(slot)
+    assert selected == auths * 2
@@ -0,0 +1,101 @@
+import threading
+import time
+
+import requests
+
+from coinlib.datatypes import Execution, Ticker
+from coinlib.trade.auth import Auth
+from coinlib.trade.client import Client
+from coinlib.trade.pollingclient import PollingClient, fingerprint
+from coinlib.trade.restapi import RestApi
+
+
+class DummyAuth(Auth):
+    def sign(self, req: requests.PreparedRequest) -> requests.PreparedRequest:
+        return req
+
+
+class DummyRestApi(RestApi):
+    NAME = 'dummy_polling'
+    AUTH_CLASS = DummyAuth
+    RATE_LIMITS = {'public': (10, 1.0)}
+
+
+class DummyClient(Client):
+    REST_API_CLASS = DummyRestApi
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, instrument_registry=None, **kwargs)
+        self.polls = 0
+        self.executions = []
+
+    def get_ticker(self, instrument: str, *, params: dict = None) -> Ticker:
+        self.polls += 1
+        if self.polls == 2:
+            raise ValueError('error')
+        # changes every 3 polls
+        last = 100 + self.polls // 3
+        return Ticker(timestamp=time.time(), instrument=instrument, ask=last + 1, bid=last - 1, last=last)
+
+    def get_public_executions(self, instrument: str, *, params: dict = None):
+        for i, timestamp in reversed(self.executions):
+            yield Execution(execution_id=i, timestamp=timestamp, instrument=instrument, side='BUY', price=1, qty=1)
+
+    # not used
+    get_instruments = get_order_book = None
+    get_balances_list = get_orders = submit_order = cancel_order = update_order = None
+    get_private_executions = get_positions = close_position = None
+
+
+def test_fingerprint():
+    x = Ticker(timestamp=1, instrument='BTC_JPY', ask=2, bid=1, last=1, _data={})
+    y = Ticker(timestamp=2, instrument='BTC_JPY', ask=2, bid=1, last=1)
+    assert fingerprint([x]) == fingerprint([y])
+    y.last = 2
+    assert fingerprint(x) != fingerprint(y)
+
+
+def test_polling_client():
+    received = threading.Event()
+    with PollingClient(DummyClient(), on_data=lambda _: received.set(), interval=0.01) as poller:
+        assert poller.is_connected()
+        poller.subscribe(ticker='BTC_JPY')
+        assert received.wait(5)
+    assert not poller.is_connected()
+
+
+def test_poll():
+    client = DummyClient()
+    client.executions = [(1, 1), (2, 2)]
+    data = []
+    poller = PollingClient(client, on_data=data.append)
+    poller.subscribe(ticker='BTC_JPY', execution='BTC_JPY')
+    for _ in range(7):
+        poller._poll_key(('ticker', 'BTC_JPY'))
+    # first poll only remembers the newest execution
+    poller._poll_key(('execution', 'BTC_JPY'))
+    client.executions += [(3, 2), (4, 3)]
+    poller._poll_key(('execution', 'BTC_JPY'))
+    poller._poll_key(('execution', 'BTC_JPY'))
+    # not published after unsubscribed
+    poller.unsubscribe(ticker='BTC_JPY')
+    for _ in range(2):
+        poller._poll_key(('ticker', 'BTC_JPY'))
+
+    tickers = [x.data.last for x in data if x.key == ('ticker', 'BTC_JPY')]
+    # unchanged tickers are suppressed, failed poll is skipped
+    assert tickers == [100, 101, 102]
+    executions = [x.data for x in data if x.key == ('execution', 'BTC_JPY')]
+    assert [[y.execution_id for y in x] for x in executions] == [[3, 4]]
+
+
+def test_interval():
+    client = DummyClient()
+    poller = PollingClient(client, interval=1, max_interval=30)
+    assert poller.get_interval(('ticker', 'BTC_JPY')) == 1
+    assert poller.get_interval(('ticker', 'BTC_JPY'), failures=2) == 4
+    limiter = client.api.get_rate_limiter('GET', '', False)
+    limiter.reserve(8)
+    # 2 of 10 tokens left
+    assert 2 < poller.get_interval(('ticker', 'BTC_JPY')) < 3
+    assert poller.get_interval(('ticker', 'BTC_JPY'), failures=10) == 30
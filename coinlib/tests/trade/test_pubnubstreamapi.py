@@ -0,0 +1,64 @@
+from coinlib.trade.pubnubstreamapi import PubNubStreamApi
+
+
+class DummyPubNub:
+    def __init__(self):
+        self.calls = []
+
+    def subscribe(self):
+        return DummyBuilder(self.calls, 'subscribe')
+
+    def unsubscribe(self):
+        return DummyBuilder(self.calls, 'unsubscribe')
+
+
+class DummyBuilder:
+    def __init__(self, calls: list, op: str):
+        self.calls = calls
+        self.op = op
+        self.channel_names = None
+
+    def channels(self, channel_names):
+        self.channel_names = channel_names
+        return self
+
+    def execute(self):
+        self.calls.append((self.op, list(self.channel_names)))
+
+
+def test_process_subscription_q():
+    pn = DummyPubNub()
+    api = PubNubStreamApi()
+
+    api.subscribe(('a', 'ch_a'), ('b', 'ch_b'), ('c', 'ch_c'))
+    api.unsubscribe('c')
+    api._process_subscription_q(pn)
+    assert pn.calls == [('subscribe', ['ch_a', 'ch_b'])]
+    assert api._channel_name_map == {'ch_a': 'a', 'ch_b': 'b'}
+    assert api._key_channel_map == {'a': 'ch_a', 'b': 'ch_b'}
+
+    pn.calls.clear()
+    api._process_subscription_q(pn)
+    assert pn.calls == []
+
+    api.unsubscribe('a', 'x')
+    api.subscribe(('d', 'ch_d'))
+    api._process_subscription_q(pn)
+    assert pn.calls == [('unsubscribe', ['ch_a']), ('subscribe', ['ch_d'])]
+    assert api._channel_name_map == {'ch_b': 'b', 'ch_d': 'd'}
+
+    # live channel subscribed and unsubscribed in a batch is unsubscribed
+    pn.calls.clear()
+    api.subscribe(('b', 'ch_b'))
+    api.unsubscribe('b')
+    api._process_subscription_q(pn)
+    assert pn.calls == [('unsubscribe', ['ch_b'])]
+    assert api._channel_name_map == {'ch_d': 'd'}
+
+    # key resubscribed to other channel
+    pn.calls.clear()
+    api.subscribe(('d', 'ch_e'))
+    api._process_subscription_q(pn)
+    assert pn.calls == [('unsubscribe', ['ch_d']), ('subscribe', ['ch_e'])]
+    assert api._channel_name_map == {'ch_e': 'd'}
+    assert api._key_channel_map == {'d': 'ch_e'}
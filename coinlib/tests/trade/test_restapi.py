@@ -0,0 +1,205 @@
+import email.utils
+import io
+import threading
+import time
+
+import pytest
+import requests
+
+from coinlib.trade.auth import Auth
+from coinlib.trade.restapi import RestApi, parse_retry_after
+from coinlib.trade.restmetrics import RestHook
+from coinlib.utils.tokenbucket import TokenBucket
+
+
+class DummyAuth(Auth):
+    def sign(self, req: requests.PreparedRequest) -> requests.PreparedRequest:
+        return req
+
+
+class DummyRestApi(RestApi):
+    NAME = 'dummy'
+    AUTH_CLASS = DummyAuth
+    RATE_LIMITS = {'private': (10, 1.0)}
+
+
+class StreamAdapter(requests.adapters.BaseAdapter):
+    def __init__(self, content_type: str, body: bytes):
+        super().__init__()
+        self.content_type = content_type
+        self.body = body
+
+    def send(self, request, **kwargs):
+        res = new_response(200, {'Content-Type': self.content_type})
+        res.raw = io.BytesIO(self.body)
+        res.request = request
+        return res
+
+    def close(self):
+        pass
+
+
+class EndHook(RestHook):
+    def __init__(self):
+        self.ends = []
+
+    def on_request_end(self, info, exc):
+        self.ends.append(exc)
+
+
+def new_response(status_code: int, headers: dict) -> requests.Response:
+    res = requests.Response()
+    res.status_code = status_code
+    res.headers.update(headers)
+    return res
+
+
+def test_rate_limiter():
+    api1 = DummyRestApi({'api_key': 'key1'})
+    api2 = DummyRestApi({'api_key': 'key1'})
+    api3 = DummyRestApi({'api_key': 'key2'})
+    limiter = api1.get_rate_limiter('GET', '/a', True)
+    assert isinstance(limiter, TokenBucket)
+    assert api2.get_rate_limiter('POST', '/b', True) is limiter
+    assert api3.get_rate_limiter('GET', '/a', True) is not limiter
+    assert api1.get_rate_limiter('GET', '/a', False) is None
+    assert DummyRestApi({'api_key': 'key1'}, rate_limit=False).get_rate_limiter('GET', '/a', True) is None
+
+    api1.update_rate_limiter(limiter, new_response(200, {
+        'x-ratelimit-limit': '5',
+        'x-ratelimit-remaining': '0',
+        'x-ratelimit-reset': str(int(time.time() + 10)),
+    }))
+    assert limiter.capacity == 5
+    assert limiter.acquire(max_wait=5) is None
+
+    # invalid headers are ignored
+    limiter = api3.get_rate_limiter('GET', '/a', True)
+    for headers in [{'x-ratelimit-remaining': ''}, {'x-ratelimit-remaining': 'many'},
+                    {'x-ratelimit-remaining': '3', 'x-ratelimit-limit': 'nan'},
+                    {'x-ratelimit-remaining': '3', 'x-ratelimit-reset': 'soon'}]:
+        api3.update_rate_limiter(limiter, new_response(200, headers))
+    assert limiter.capacity == 10
+    assert limiter.acquire(max_wait=0) == 0
+
+
+def test_retry_after():
+    assert parse_retry_after('3') == 3
+    assert 8 < parse_retry_after(email.utils.formatdate(time.time() + 10, usegmt=True)) <= 10
+    assert parse_retry_after('Wed, 21 Oct 2015 07:28:00 GMT') == 0
+    assert parse_retry_after('soon') is None
+
+    api = DummyRestApi({'api_key': 'key3'})
+    limiter = api.get_rate_limiter('GET', '/a', True)
+    api.update_rate_limiter(limiter, new_response(429, {'retry-after': 'soon'}))
+    assert limiter.acquire(max_wait=0) == 0
+
+
+def test_credentials():
+    api = DummyRestApi([{'api_key': 'key1'}, {'api_key': 'key2'}])
+    assert api.credential == {'api_key': 'key1'}
+    assert len(api.key_pool) == 2
+    limiters = {api.get_rate_limiter('GET', '/a', True, x.auth) for x in api.key_pool.slots}
+    assert len(limiters) == 2
+
+
+def test_response_cache():
+    class A(DummyRestApi):
+        def request(self, method: str, path: str, is_private: bool, params: dict = None):
+            self.calls.append((path, params))
+            return {'path': path}
+
+    api = A(cache_ttls={'/ticker/*': 10})
+    api.calls = []
+    assert api.public_get('/ticker/BTC', x=1) == {'path': '/ticker/BTC'}
+    api.public_get('/ticker/BTC', x=1)
+    api.public_get('/ticker/BTC', x=2)
+    api.public_get('/book/BTC')
+    api.public_get('/book/BTC')
+    assert api.calls == [('/ticker/BTC', {'x': 1}), ('/ticker/BTC', {'x': 2}), ('/book/BTC', {}), ('/book/BTC', {})]
+
+    api.calls = []
+    api.public_get('/ticker/ETH', filter={'open': True}, columns=['a', 'b'])
+    api.public_get('/ticker/ETH', columns=['a', 'b'], filter={'open': True})
+    api.public_get('/ticker/ETH', filter={'open': False}, columns=['a', 'b'])
+    assert len(api.calls) == 2
+
+
+def test_hedged_request():
+    class A(DummyRestApi):
+        def request(self, method: str, path: str, is_private: bool, params: dict = None):
+            with self.lock:
+                self.calls += 1
+                n = self.calls
+            # every 30th request is slow
+            time.sleep(0.5 if n % 30 == 0 else 0.01)
+            return {'n': n}
+
+    api = A(hedge_paths=['/board'], hedge_budget=0.5)
+    api.lock = threading.Lock()
+    api.calls = 0
+    for _ in range(29):
+        api.public_get('/board')
+    assert api.hedger.get_delay('/board') < 0.1
+    start = time.time()
+    assert api.public_get('/board') == {'n': 31}
+    assert time.time() - start < 0.3
+    assert api.hedger.hedged == 1
+    api.public_get('/ticker')
+    assert api.get_hedge_pattern('/ticker') is None
+    api.close()
+
+
+def test_on_response():
+    api = DummyRestApi()
+    res = new_response(200, {'Content-Type': 'application/json; charset=utf-8'})
+    res._content = '{"name": "ビットコイン"}'.encode()
+    assert api.on_response(res, False) == {'name': 'ビットコイン'}
+
+    res = new_response(200, {'Content-Type': 'application/json'})
+    res.raw = io.BytesIO(b'[{"id": 1, "price": 100.5}, {"id": 2, "price": 101}]')
+    api.STREAM_CHUNK_SIZE = 4
+    rows = api.on_stream_response(res, False)
+    assert next(rows) == {'id': 1, 'price': 100.5}
+    assert list(rows) == [{'id': 2, 'price': 101}]
+
+    # status is checked before body is read
+    res = new_response(404, {'Content-Type': 'application/json'})
+    res.raw = io.BytesIO(b'{"error": "not found"}')
+    with pytest.raises(requests.HTTPError):
+        api.on_stream_response(res, False)
+
+
+def test_stream_request():
+    hook = EndHook()
+    api = DummyRestApi({'api_key': 'key4', 'api_secret': 'secret'}, session_pool_size=1, private_concurrency=1, rate_limit=False,
+                       hooks=[hook])
+    adapter = StreamAdapter('application/json', b'[1, 2, 3]')
+
+    def new_session():
+        s = requests.Session()
+        s.mount('http://', adapter)
+        return s
+
+    api.BASE_URL = 'http://dummy'
+    api.session_pool.new_session = new_session
+    slot = api.key_pool.slots[0]
+    queue = api.session_pool._get_queue('http://dummy')
+
+    # session, key slot and request are held until body is read
+    rows = api.private_get_iter('/executions')
+    assert next(rows) == 1
+    assert (queue.qsize(), slot.in_flight, hook.ends) == (0, 1, [])
+    assert list(rows) == [2, 3]
+    assert (queue.qsize(), slot.in_flight, hook.ends) == (1, 0, [None])
+
+    # closed before exhausted
+    rows = api.private_get_iter('/executions')
+    assert slot.in_flight == 1
+    rows.close()
+    assert (queue.qsize(), slot.in_flight, hook.ends) == (1, 0, [None, None])
+
+    adapter.content_type = 'text/html'
+    with pytest.raises(ValueError):
+        api.private_get_iter('/executions')
+    assert (queue.qsize(), slot.in_flight) == (1, 0)
@@ -0,0 +1,98 @@
+import requests
+from requests.adapters import BaseAdapter
+
+from coinlib.trade.auth import Auth
+from coinlib.trade.restapi import RestApi
+from coinlib.trade.restmetrics import RestMetrics, LatencyHistogram, RequestInfo, normalize_path
+
+
+class DummyAuth(Auth):
+    def sign(self, req: requests.PreparedRequest) -> requests.PreparedRequest:
+        return req
+
+
+class DummyAdapter(BaseAdapter):
+    """responses by status codes in order"""
+
+    def __init__(self, status_codes):
+        super().__init__()
+        self.status_codes = list(status_codes)
+
+    def send(self, request, **kwargs):
+        res = requests.Response()
+        res.status_code = self.status_codes.pop(0)
+        res.headers['Content-Type'] = 'application/json'
+        res._content = b'{"id": 1}'
+        return res
+
+    def close(self):
+        pass
+
+
+class DummyRestApi(RestApi):
+    NAME = 'dummy'
+    BASE_URL = 'http://dummy'
+    AUTH_CLASS = DummyAuth
+
+    def __init__(self, adapter: DummyAdapter, **kwargs):
+        super().__init__(session_pool_size=0, rate_limit=False, **kwargs)
+        self.session_pool.new_session = lambda: self.new_session(adapter)
+
+    @staticmethod
+    def new_session(adapter: DummyAdapter) -> requests.Session:
+        s = requests.Session()
+        s.mount('http://', adapter)
+        return s
+
+
+def test_normalize_path():
+    assert normalize_path('/orders/12345') == '/orders/{id}'
+    assert normalize_path('/order/9e107d9d-372b-4d5f-8a8b-1e2c3d4e5f60/cancel') == '/order/{id}/cancel'
+    assert normalize_path('/ticker/tBTCUSD') == '/ticker/tBTCUSD'
+    assert normalize_path('/btc_jpy/ticker') == '/btc_jpy/ticker'
+
+
+def test_latency_histogram():
+    histogram = LatencyHistogram()
+    assert histogram.percentile(0.5) is None
+    for x in [0.001] * 90 + [0.3] * 10:
+        histogram.add(x)
+    assert histogram.percentile(0.5) == 0.005
+    assert histogram.percentile(0.99) == 0.5
+    assert histogram.count == 100
+
+
+def test_rest_metrics():
+    metrics = RestMetrics()
+    api = DummyRestApi(DummyAdapter([200, 200, 404]), hooks=[metrics])
+    api.public_get('/orders/1')
+    api.public_post('/orders/2', x=1)
+    try:
+        api.public_get('/orders/3')
+    except requests.HTTPError:
+        pass
+
+    stats = metrics.snapshot()
+    assert set(stats) == {('dummy', 'GET', '/orders/{id}'), ('dummy', 'POST', '/orders/{id}')}
+    get_stats = stats[('dummy', 'GET', '/orders/{id}')]
+    assert get_stats.requests == 2
+    assert get_stats.statuses == {200: 1, 404: 1}
+    assert get_stats.errors == 1
+    assert get_stats.latency.count == 2
+    assert get_stats.bytes_received == 18
+    assert stats[('dummy', 'POST', '/orders/{id}')].bytes_sent == 3
+
+    assert len(metrics.to_dicts()) == 2
+    text = metrics.to_prometheus()
+    assert 'coinlib_rest_responses_total{exchange="dummy",method="GET",path="/orders/{id}",status="404"} 1' in text
+
+
+def test_bytes_sent():
+    metrics = RestMetrics()
+    info = RequestInfo(exchange='dummy', method='POST', path='/a', template='/a', is_private=False)
+    prep = requests.PreparedRequest()
+    prep.body = '{"name": "ビットコイン"}'
+    metrics.on_send(info, prep)
+    prep.body = b'x=1'
+    metrics.on_send(info, prep)
+    assert metrics.snapshot()[('dummy', 'POST', '/a')].bytes_sent == len(prep.body) + 30
@@ -0,0 +1,133 @@
+import time
+
+import pytest
+import requests
+from requests.adapters import BaseAdapter
+
+from coinlib.errors import ApiTimeoutError
+from coinlib.trade.auth import Auth
+from coinlib.trade.restapi import RestApi
+from coinlib.trade.retrypolicy import Idempotency, RetryPolicy, deadline, get_deadline
+
+
+class DummyAuth(Auth):
+    def sign(self, req: requests.PreparedRequest) -> requests.PreparedRequest:
+        return req
+
+
+class DummyAdapter(BaseAdapter):
+    """fails first `failures` requests by exc"""
+
+    def __init__(self, failures: int, exc: Exception):
+        super().__init__()
+        self.failures = failures
+        self.exc = exc
+        self.requests = []
+
+    def send(self, request, **kwargs):
+        self.requests.append(request)
+        if len(self.requests) <= self.failures:
+            raise self.exc
+        res = requests.Response()
+        res.status_code = 200
+        res.headers['Content-Type'] = 'application/json'
+        res._content = b'{"id": 1}'
+        return res
+
+    def close(self):
+        pass
+
+
+class DummyRestApi(RestApi):
+    BASE_URL = 'http://dummy'
+    AUTH_CLASS = DummyAuth
+    RETRY_POLICIES = {
+        Idempotency.READ: RetryPolicy(initial_wait=0.01, jitter=0),
+        Idempotency.WRITE: RetryPolicy(initial_wait=0.01, jitter=0, retry_transport_errors=False),
+        Idempotency.KEYED: RetryPolicy(initial_wait=0.01, jitter=0),
+    }
+
+    def __init__(self, adapter: DummyAdapter, **kwargs):
+        super().__init__(session_pool_size=0, rate_limit=False, **kwargs)
+        self.adapter = adapter
+        self.reconciled = []
+        self.session_pool.new_session = self.new_session
+
+    def new_session(self) -> requests.Session:
+        s = requests.Session()
+        s.mount('http://', self.adapter)
+        return s
+
+    def get_idempotency(self, method: str, path: str, params: dict) -> str:
+        if params.get('client_id'):
+            return Idempotency.KEYED
+        return super().get_idempotency(method, path, params)
+
+    def reconcile(self, method: str, path: str, params: dict):
+        self.reconciled.append(params['client_id'])
+        return {'id': 2} if len(self.reconciled) > 1 else None
+
+
+def test_get_wait():
+    policy = RetryPolicy(initial_wait=1, max_wait=5, multiplier=2, jitter=0)
+    assert [policy.get_wait(n, Exception()) for n in range(5)] == [1, 2, 4, 5, 5]
+
+
+def test_deadline():
+    assert get_deadline() is None
+    with deadline(10):
+        outer = get_deadline()
+        with deadline(100):
+            assert get_deadline() == outer
+        with deadline(1):
+            assert get_deadline() < outer
+        assert get_deadline() == outer
+    assert get_deadline() is None
+
+
+def test_retry():
+    api = DummyRestApi(DummyAdapter(2, requests.ConnectionError('reset')))
+    assert api.request('GET', '/a', False) == {'id': 1}
+    assert len(api.adapter.requests) == 3
+
+    # write may have been processed by server
+    api = DummyRestApi(DummyAdapter(1, requests.ReadTimeout('timeout')))
+    with pytest.raises(requests.ReadTimeout):
+        api.request('POST', '/order', False)
+    assert len(api.adapter.requests) == 1
+
+    # write was not sent
+    api = DummyRestApi(DummyAdapter(1, requests.ConnectTimeout('timeout')))
+    assert api.request('POST', '/order', False) == {'id': 1}
+
+    # keyed write is reconciled before retry
+    api = DummyRestApi(DummyAdapter(5, requests.ReadTimeout('timeout')))
+    assert api.request('POST', '/order', False, {'client_id': 'x'}) == {'id': 2}
+    assert api.reconciled == ['x', 'x']
+    assert len(api.adapter.requests) == 2
+
+
+def test_reconcile_retry():
+    class FlakyReconcileApi(DummyRestApi):
+        def reconcile(self, method: str, path: str, params: dict):
+            # reconciliation runs under deadline of the request
+            assert get_deadline() is not None
+            self.reconciled.append(params['client_id'])
+            if len(self.reconciled) == 1:
+                raise requests.ConnectionError('reset')
+            return {'id': 2}
+
+    # failed reconciliation is retried by policy of the request
+    api = FlakyReconcileApi(DummyAdapter(5, requests.ReadTimeout('timeout')))
+    assert api.request('POST', '/order', False, {'client_id': 'x'}) == {'id': 2}
+    assert api.reconciled == ['x', 'x']
+    assert len(api.adapter.requests) == 1
+
+
+def test_retry_deadline():
+    api = DummyRestApi(DummyAdapter(100, requests.ConnectionError('reset')))
+    start = time.time()
+    with deadline(0.2):
+        with pytest.raises(ApiTimeoutError):
+            api.request('GET', '/a', False)
+    assert time.time() - start < 0.3
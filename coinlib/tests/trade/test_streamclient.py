@@ -0,0 +1,140 @@
+from queue import Queue
+import time
+from typing import Hashable, Optional, Tuple
+
+import requests
+
+from coinlib.datatypes import Execution, OrderBook, Ticker
+from coinlib.datatypes.streamdata import StreamData, StreamType
+from coinlib.trade.auth import Auth
+from coinlib.trade.restapi import RestApi
+from coinlib.trade.streamapi import StreamApi
+from coinlib.trade.streamclient import StreamClient
+
+
+class DummyAuth(Auth):
+    def sign(self, req: requests.PreparedRequest) -> requests.PreparedRequest:
+        return req
+
+
+class DummyRestApi(RestApi):
+    AUTH_CLASS = DummyAuth
+
+
+class DummyStreamApi(StreamApi):
+    def subscribe(self, *args):
+        pass
+
+    def unsubscribe(self, *args):
+        pass
+
+
+class DummyStreamClient(StreamClient):
+    REST_API_CLASS = DummyRestApi
+    STREAM_API_CLASS = DummyStreamApi
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.requests = []
+
+    def request_subscribe(self, key: Tuple[str, Hashable]):
+        self.requests.append(('subscribe', key))
+
+    def request_unsubscribe(self, key: Tuple[str, Hashable]):
+        self.requests.append(('unsubscribe', key))
+
+    def convert_raw_data(self, data: StreamData) -> Optional[StreamData]:
+        return data
+
+    # not used
+    get_instruments = get_ticker = get_order_book = get_public_executions = None
+    get_balances_list = get_orders = submit_order = cancel_order = update_order = None
+    get_private_executions = get_positions = close_position = None
+
+
+def new_execution(execution_id: int, timestamp: float, price: float) -> Execution:
+    return Execution(execution_id=execution_id, timestamp=timestamp, instrument='BTC_JPY',
+                     side='BUY', price=price, qty=1.0)
+
+
+def test_candle():
+    q = Queue()
+    with DummyStreamClient(on_data=q.put, candle_resolutions=['1s'], candle_close_delay=None) as client:
+        client.subscribe(candle='BTC_JPY')
+        assert client.requests == [('subscribe', ('execution', 'BTC_JPY'))]
+        client.subscribe(execution='BTC_JPY')
+        assert len(client.requests) == 1
+
+        key = (StreamType.EXECUTION, 'BTC_JPY')
+        client._on_stream_data(StreamData(key, [new_execution(1, 1.0, 10.0), new_execution(2, 1.5, 11.0)]))
+        assert q.get_nowait().key == key
+        assert q.empty()
+        assert client.get_open_candle('BTC_JPY', '1s').close == 11.0
+
+        client.unsubscribe(execution='BTC_JPY')
+        assert len(client.requests) == 1
+        client._on_stream_data(StreamData(key, [new_execution(3, 2.0, 12.0)]))
+        d = q.get_nowait()
+        assert d.key == ('candle', 'BTC_JPY')
+        resolution, candle = d.data
+        assert resolution == '1s'
+        assert (candle.timestamp, candle.open, candle.high, candle.close) == (1, 10.0, 11.0, 11.0)
+        assert q.empty()
+
+        client.unsubscribe(candle='BTC_JPY')
+        assert client.requests[-1] == ('unsubscribe', ('execution', 'BTC_JPY'))
+        assert client.get_open_candle('BTC_JPY', '1s') is None
+
+
+def test_candle_timer():
+    q = Queue()
+    client = DummyStreamClient(on_data=q.put, candle_resolutions=['1s'], candle_close_delay=0)
+    client.CANDLE_CLOSE_INTERVAL = 0.01
+    with client:
+        client.subscribe(candle='BTC_JPY')
+        now = time.time()
+        key = (StreamType.EXECUTION, 'BTC_JPY')
+        client._on_stream_data(StreamData(key, [new_execution(1, now - 1, 10.0)]))
+        # closed without execution of later period
+        d = q.get(timeout=1)
+        assert d.key == ('candle', 'BTC_JPY')
+        assert d.data[1].timestamp == (now - 1) // 1
+        assert client.get_open_candle('BTC_JPY', '1s') is None
+
+
+def test_derived_ticker():
+    q = Queue()
+    with DummyStreamClient(on_data=q.put) as client:
+        client.subscribe(order_book='BTC_JPY', execution='BTC_JPY')
+        assert len(client.requests) == 2
+        # order book and execution are already subscribed. no ticker channel is requested
+        client.subscribe(ticker='BTC_JPY')
+        assert len(client.requests) == 2
+
+        order_book = OrderBook(timestamp=1.0, instrument='BTC_JPY', asks=[(11.0, 1.0, None)],
+                               bids=[(9.0, 1.0, None)], _data=None)
+        client._on_stream_data(StreamData((StreamType.ORDER_BOOK, 'BTC_JPY'), order_book))
+        assert q.get_nowait().key == ('order_book', 'BTC_JPY')
+        assert q.empty()
+
+        client._on_stream_data(StreamData((StreamType.EXECUTION, 'BTC_JPY'), [new_execution(1, 2.0, 10.0)]))
+        d = q.get_nowait()
+        assert d.key == ('ticker', 'BTC_JPY')
+        ticker: Ticker = d.data
+        assert (ticker.timestamp, ticker.ask, ticker.bid, ticker.last) == (2.0, 11.0, 9.0, 10.0)
+        assert q.get_nowait().key == ('execution', 'BTC_JPY')
+        assert q.empty()
+
+        # unchanged
+        client._on_stream_data(StreamData((StreamType.EXECUTION, 'BTC_JPY'), [new_execution(2, 3.0, 10.0)]))
+        assert q.get_nowait().key == ('execution', 'BTC_JPY')
+        assert q.empty()
+
+        client.unsubscribe(order_book='BTC_JPY', execution='BTC_JPY')
+        assert len(client.requests) == 2
+        client.unsubscribe(ticker='BTC_JPY')
+        assert client.requests[2:] == [('unsubscribe', ('order_book', 'BTC_JPY')),
+                                       ('unsubscribe', ('execution', 'BTC_JPY'))]
+
+        client.subscribe(ticker='BTC_JPY')
+        assert client.requests[-1] == ('subscribe', ('ticker', 'BTC_JPY'))
@@ -0,0 +1,82 @@
+import numpy as np
+
+from coinlib.datatypes import Execution, ExecutionBatch, StreamData
+from coinlib.datatypes.candle import Candle
+from coinlib.datatypes.streamdata import StreamType
+from coinlib.trade.tradestore import CandleStore, ExecutionStore
+
+DAY = 24 * 60 * 60
+
+
+def new_execution(i: int, timestamp: float) -> Execution:
+    return Execution(execution_id=i, timestamp=timestamp, instrument='BTC_JPY',
+                     side='BUY' if i % 2 else 'SELL', price=100 + i, qty=1)
+
+
+def test_execution_store(tmp_path):
+    store = ExecutionStore(tmp_path)
+    store.INDEX_STRIDE = 4
+    # 2 days
+    timestamps = [DAY - 10 + i for i in range(20)]
+    executions = [new_execution(i + 1, x) for i, x in enumerate(timestamps)]
+    assert store.append_executions('dummy', executions[:15]) == 15
+    # overlapped rows are dropped
+    assert store.append_executions('dummy', executions[10:]) == 5
+    assert len(store.get_day_dirs('dummy', 'BTC_JPY')) == 2
+
+    columns = store.read('dummy', 'BTC_JPY')
+    assert columns['timestamp'].tolist() == timestamps
+    assert columns['execution_id'].tolist() == list(range(1, 21))
+    assert columns['side'][:2].tolist() == [1, -1]
+
+    day = store.read('dummy', 'BTC_JPY', DAY, DAY + 5)
+    assert isinstance(day['price'], np.memmap)
+    assert day['timestamp'].tolist() == [DAY + i for i in range(5)]
+    assert len(store.read('dummy', 'BTC_JPY', 0, DAY - 10)['timestamp']) == 0
+
+    batch = store.read_batch('dummy', 'BTC_JPY', DAY - 3, DAY + 3)
+    assert len(batch) == 6 and batch.price[0] == 108
+
+
+def test_execution_store_repair(tmp_path):
+    store = ExecutionStore(tmp_path)
+    store.INDEX_STRIDE = 4
+    store.append_executions('dummy', [new_execution(i + 1, 100 + i) for i in range(10)])
+    day_dir = store.get_day_dirs('dummy', 'BTC_JPY')[0]
+    # interrupted while appending a row
+    with (day_dir / 'timestamp.bin').open('ab') as f:
+        f.write(np.array([110.0]).tobytes())
+    (day_dir / '_index.bin').unlink()
+    assert len(store.read('dummy', 'BTC_JPY')['timestamp']) == 10
+    store.append_executions('dummy', [new_execution(11, 110)])
+    assert store.read('dummy', 'BTC_JPY', 105)['execution_id'].tolist() == [6, 7, 8, 9, 10, 11]
+
+
+def test_execution_store_str_id(tmp_path):
+    store = ExecutionStore(tmp_path)
+    executions = [Execution(execution_id=f'uuid-{i}', timestamp=100.0, instrument='BTC_JPY',
+                            side='BUY', price=100, qty=1) for i in range(3)]
+    # side not given by server
+    executions[2].side = ''
+    assert store.append_executions('dummy', executions[:2]) == 2
+    # overlapped rows of same timestamp are dropped by hashed ids
+    assert store.append_executions('dummy', executions) == 1
+    columns = store.read('dummy', 'BTC_JPY')
+    assert len(set(columns['execution_id'].tolist())) == 3
+    assert (columns['execution_id'] >= 0).all()
+    assert columns['side'].tolist() == [1, 1, 0]
+
+
+def test_stream_data(tmp_path):
+    store = ExecutionStore(tmp_path)
+    batch = ExecutionBatch(instrument='BTC_JPY', timestamp=np.array([1.0, 2.0]), price=np.array([10.0, 11.0]),
+                           qty=np.array([1.0, 2.0]), side=np.array([1, -1], dtype='i1'))
+    assert store.write_stream_data('dummy', StreamData((StreamType.EXECUTION, 'BTC_JPY'), batch))
+    assert not store.write_stream_data('dummy', StreamData((StreamType.TICKER, 'BTC_JPY'), None))
+    assert store.read_batch('dummy', 'BTC_JPY').qty.tolist() == [1, 2]
+
+    candle_store = CandleStore(tmp_path)
+    candle = Candle(timestamp=60, open=1, high=3, low=1, close=2)
+    assert candle_store.write_stream_data('dummy', StreamData((StreamType.CANDLE, 'BTC_JPY'), ('1m', candle)))
+    assert list(candle_store.iter_candles('dummy', 'BTC_JPY', '1m')) == [candle]
+    assert candle_store.get_last_timestamp('dummy', 'BTC_JPY', '1m') == 60
@@ -0,0 +1,50 @@
+from queue import Queue
+
+from websocket import ABNF, WebSocket
+
+from coinlib.trade.websocketstreamapi import WebSocketStreamApi
+
+WAIT = 5
+
+
+class DummyWebSocket:
+    def __init__(self, frames: list):
+        self.frames = list(frames)
+
+    def recv_data(self):
+        if self.frames:
+            return self.frames.pop(0)
+        return ABNF.OPCODE_CLOSE, b''
+
+    def send_close(self):
+        pass
+
+    def shutdown(self):
+        pass
+
+
+def test_recv_bytes():
+    q = Queue()
+
+    class A(WebSocketStreamApi):
+        def _process_subscription_q(self, ws: WebSocket):
+            pass
+
+        def create_connection(self):
+            self._ws = DummyWebSocket([
+                (ABNF.OPCODE_TEXT, b'{"a": 1}'),
+                (ABNF.OPCODE_PONG, b''),
+                (ABNF.OPCODE_BINARY, '["あ"]'.encode()),
+            ])
+            return self._ws
+
+        def on_message(self, message_data: bytes):
+            assert isinstance(message_data, bytes)
+            q.put(self.decode_message(message_data))
+            if q.qsize() == 2:
+                self.stop()
+
+    with A() as a:
+        assert q.get(timeout=WAIT) == {'a': 1}
+        assert q.get(timeout=WAIT) == ['あ']
+        a.join(WAIT)
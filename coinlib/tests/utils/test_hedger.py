@@ -0,0 +1,30 @@
+from coinlib.utils.hedger import Hedger
+
+
+def test_get_delay():
+    hedger = Hedger(percentile=0.9, min_samples=10, window=100)
+    for i in range(9):
+        hedger.record('a', 0.1)
+    assert hedger.get_delay('a') is None
+    for i in range(91):
+        hedger.record('a', 0.1 if i < 80 else 1.0)
+    assert hedger.get_delay('a') == 1.0
+    # old latencies are dropped
+    for i in range(100):
+        hedger.record('a', 0.2)
+    assert hedger.get_delay('a') == 0.2
+    assert hedger.get_delay('b') is None
+
+
+def test_budget():
+    hedger = Hedger(budget=0.25, burst=2)
+    results = []
+    for _ in range(12):
+        hedger.earn()
+        results.append(hedger.spend())
+    assert results.count(True) == 3
+    assert hedger.hedged == 3
+
+    for _ in range(100):
+        hedger.earn()
+    assert [hedger.spend() for _ in range(3)] == [True, True, False]
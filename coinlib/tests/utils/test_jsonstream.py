@@ -0,0 +1,23 @@
+import json
+
+import pytest
+
+from coinlib.utils.jsonstream import iter_json_array
+
+
+def split(data: bytes, size: int) -> list:
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+@pytest.mark.parametrize('size', [1, 3, 7, 1000])
+def test_iter_json_array(size):
+    values = [1, 23.5, -1e-3, 'ビットコイン', None, True, {'a': [1, {'b': 'c,]'}]}, [], 12345678]
+    data = json.dumps(values, ensure_ascii=False, indent=1).encode()
+    assert list(iter_json_array(split(data, size))) == values
+    assert list(iter_json_array([b' [ ] '])) == []
+
+
+@pytest.mark.parametrize('data', [b'{"a": 1}', b'[1, 2', b'[1 2]', b'[1, {"a": ]', b''])
+def test_invalid(data):
+    with pytest.raises(ValueError):
+        list(iter_json_array(split(data, 2)))
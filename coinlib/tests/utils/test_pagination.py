@@ -0,0 +1,61 @@
+import time
+
+import pytest
+
+from coinlib.utils.pagination import iter_pages
+
+
+def new_pages(n: int, fetched: list, wait: float = 0):
+    def fetch_page(cursor: int) -> list:
+        fetched.append(cursor)
+        time.sleep(wait)
+        if cursor == 'error':
+            raise ValueError(cursor)
+        return [cursor]
+
+    def next_cursor(cursor: int, page: list) -> int:
+        return cursor + 1 if cursor + 1 < n else None
+
+    return fetch_page, next_cursor
+
+
+@pytest.mark.parametrize('look_ahead', [0, 1, 3])
+def test_iter_pages(look_ahead):
+    fetched = []
+    fetch_page, next_cursor = new_pages(5, fetched)
+    assert list(iter_pages(fetch_page, next_cursor, 0, look_ahead=look_ahead)) == [[0], [1], [2], [3], [4]]
+    assert fetched == [0, 1, 2, 3, 4]
+
+
+def test_look_ahead():
+    fetched = []
+    fetch_page, next_cursor = new_pages(10, fetched)
+    pages = iter_pages(fetch_page, next_cursor, 0, look_ahead=2)
+    assert next(pages) == [0]
+    time.sleep(0.2)
+    # bounded
+    assert fetched == [0, 1, 2]
+    pages.close()
+    time.sleep(0.2)
+    assert fetched == [0, 1, 2]
+
+
+def test_overlap():
+    fetched = []
+    fetch_page, next_cursor = new_pages(4, fetched, wait=0.1)
+    start = time.time()
+    for _ in iter_pages(fetch_page, next_cursor, 0):
+        time.sleep(0.1)
+    # fetching and processing overlap
+    assert time.time() - start < 0.65
+
+
+def test_error():
+    def next_cursor(cursor, page):
+        return 'error' if cursor == 0 else None
+
+    fetch_page, _ = new_pages(10, [])
+    pages = iter_pages(fetch_page, next_cursor, 0)
+    assert next(pages) == [0]
+    with pytest.raises(ValueError):
+        next(pages)
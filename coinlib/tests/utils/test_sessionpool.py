@@ -1,8 +1,10 @@
 from queue import Empty
+import time
 
 import pytest
 
 from coinlib.utils.sessiopool import SessionPool
+from coinlib.utils.tokenbucket import TokenBucket
 
 
 def test_session_pool():
@@ -31,3 +33,86 @@ def test_session_pool():
     for _ in range(10):
         ss.add(pool.get())
     assert len(ss) == 10
+
+
+@pytest.fixture
+def http_server():
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+    import threading
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def do_HEAD(self):
+            self.send_response(200)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+
+        do_GET = do_HEAD
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f'http://127.0.0.1:{server.server_port}'
+    server.shutdown()
+
+
+def test_session_pool_per_host(http_server):
+    pool = SessionPool(2, timeout=0.2, pool_maxsize=1)
+    with pool.get(http_server + '/a') as s1:
+        with pool.get('http://localhost/b') as s2:
+            assert s1 is not s2
+        with pool.get(http_server + '/c') as s3:
+            assert s3 is not s1
+            with pytest.raises(Empty):
+                with pool.get(http_server + '/d'):
+                    pass
+    stats = pool.stats
+    assert (stats.gets, stats.waits, stats.timeouts) == (4, 1, 1)
+
+    pool.warm_up(http_server + '/a')
+    assert pool.stats.handshakes == 2
+    assert pool.stats.probes == 2
+    for _ in range(3):
+        with pool.get(http_server + '/a') as s:
+            s.get(http_server + '/a')
+    # connections are reused
+    assert pool.stats.handshakes == 2
+
+
+def test_session_pool_keep_alive(http_server):
+    pool = SessionPool(1, keep_alive_interval=0.1)
+    with pool.get(http_server + '/a') as s:
+        s.get(http_server + '/a')
+    pool.start()
+    time.sleep(0.35)
+    pool.stop()
+    assert pool.stats.probes >= 2
+    assert pool.stats.handshakes == 1
+
+
+def test_session_pool_keep_alive_idle(http_server):
+    pool = SessionPool(2, keep_alive_interval=0.2)
+    url = http_server + '/a'
+    with pool.get(url):
+        pass
+    pool.start()
+    # session in use is not probed. other one is probed once it has been idle for an interval
+    with pool.get(url) as s:
+        time.sleep(0.5)
+        assert pool.stats.probes >= 1
+        s.get(url)
+    pool.stop()
+
+    # probes wait for tokens of rate limiter of host
+    limiter = TokenBucket(1, 0.001)
+    limiter.acquire()
+    pool = SessionPool(1, keep_alive_interval=0.1, get_rate_limiter=lambda host: limiter)
+    with pool.get(url):
+        pass
+    pool.start()
+    time.sleep(0.35)
+    pool.stop()
+    assert pool.stats.probes == 0
@@ -0,0 +1,24 @@
+import time
+
+from coinlib.utils.tokenbucket import TokenBucket
+
+
+def test_token_bucket():
+    bucket = TokenBucket(2, 10)
+    assert bucket.acquire() == 0
+    assert bucket.acquire() == 0
+    assert 0 < bucket.acquire() <= 0.1
+    assert bucket.acquire(max_wait=0.01) is None
+
+    bucket = TokenBucket(2, 10)
+    bucket.pause(0.2)
+    start = time.time()
+    bucket.acquire()
+    assert time.time() - start >= 0.2
+
+    bucket = TokenBucket(10, 10)
+    bucket.update(remaining=1, limit=5)
+    assert bucket.capacity == 5
+    assert bucket.tokens < 2
+    bucket.update(remaining=0, reset_seconds=10)
+    assert bucket.acquire(max_wait=5) is None
@@ -0,0 +1,73 @@
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import time
+
+import pytest
+
+from coinlib.utils.ttlcache import TTLCache
+
+
+def test_ttl_cache():
+    cache = TTLCache(2)
+    calls = []
+
+    def loader(value):
+        def _load():
+            calls.append(value)
+            return value
+
+        return _load
+
+    assert cache.get('a', loader(1), 0.1) == 1
+    assert cache.get('a', loader(2), 0.1) == 1
+    time.sleep(0.15)
+    assert cache.get('a', loader(3), 0.1) == 3
+    assert calls == [1, 3]
+
+    # lru
+    cache.get('b', loader(4), 10)
+    cache.get('a', loader(5), 10)
+    cache.get('c', loader(6), 10)
+    assert len(cache) == 2
+    assert cache.get('b', loader(7), 10) == 7
+
+    def error():
+        raise ValueError()
+
+    with pytest.raises(ValueError):
+        cache.get('d', error, 10)
+    assert cache.get('d', loader(8), 10) == 8
+
+
+def test_single_flight():
+    cache = TTLCache()
+    calls = []
+
+    def loader():
+        calls.append(threading.get_ident())
+        time.sleep(0.1)
+        return 1
+
+    with ThreadPoolExecutor(8) as executor:
+        results = list(executor.map(lambda _: cache.get('a', loader, 10), range(8)))
+    assert results == [1] * 8
+    assert len(calls) == 1
+
+
+def test_stale_while_revalidate():
+    cache = TTLCache(stale_seconds=10)
+    loaded = threading.Event()
+
+    def loader():
+        time.sleep(0.1)
+        loaded.set()
+        return 2
+
+    cache.get('a', lambda: 1, 0.01)
+    time.sleep(0.02)
+    start = time.time()
+    assert cache.get('a', loader, 10) == 1
+    assert time.time() - start < 0.05
+    assert loaded.wait(1)
+    time.sleep(0.01)
+    assert cache.get('a', loader, 10) == 2
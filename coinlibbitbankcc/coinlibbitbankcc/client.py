@@ -1,12 +1,14 @@
 from collections import defaultdict
+import datetime
 import logging
-from typing import Hashable, Dict, Iterable, Optional, Iterator, List
+from typing import Hashable, Dict, Iterable, Optional, Iterator, List, Tuple, Union
 
 from coinlib.datatypes import Instrument, OrderBook, Balance, Execution, Ticker
 from coinlib.datatypes.balance import BalanceType
+from coinlib.datatypes.candle import Candle
 from coinlib.datatypes.order import OrderState, Order, OrderType
 from coinlib.datatypes.position import Position
-from coinlib.errors import NotSupportedError
+from coinlib.errors import NotFoundError, NotSupportedError
 from coinlib.trade.client import Client as ClientBase
 from coinlib.utils.funcs import no_none_dict
 from .restapi import RestApi
@@ -65,6 +67,45 @@ class Client(ClientBase):
     def get_public_executions(self, instrument: str, *, params: dict = None) -> Iterator[Execution]:
         raise NotSupportedError('not implemented yet')
 
+    # candle_size -> (candle-type, candles of a request are per day or per year)
+    CANDLE_SIZES = {
+        '1m': ('1min', 'day'), '5m': ('5min', 'day'), '15m': ('15min', 'day'), '30m': ('30min', 'day'),
+        '1h': ('1hour', 'day'), '4h': ('4hour', 'year'), '8h': ('8hour', 'year'), '12h': ('12hour', 'year'),
+        '1d': ('1day', 'year'),
+    }
+
+    def _fetch_candles(self, instrument: str, candle_size: str, start: float, end: float, *,
+                       params: dict = None) -> Iterator[Candle]:
+        pair = self.instruments[instrument].name_id
+        if candle_size not in self.CANDLE_SIZES:
+            raise NotSupportedError(f'candle_size={candle_size} not supported')
+        candle_type, period = self.CANDLE_SIZES[candle_size]
+        first = datetime.datetime.fromtimestamp(start, datetime.timezone.utc)
+        if period == 'day':
+            first = datetime.datetime(first.year, first.month, first.day, tzinfo=datetime.timezone.utc)
+        else:
+            first = datetime.datetime(first.year, 1, 1, tzinfo=datetime.timezone.utc)
+
+        def fetch_page(dt: datetime.datetime) -> list:
+            date = dt.strftime('%Y%m%d' if period == 'day' else '%Y')
+            res = self.public_get(f'/{pair}/candlestick/{candle_type}/{date}', **(params or {}))
+            return res['candlestick'][0]['ohlcv']
+
+        def next_cursor(dt: datetime.datetime, _) -> Optional[datetime.datetime]:
+            if period == 'day':
+                dt += datetime.timedelta(days=1)
+            else:
+                dt = dt.replace(year=dt.year + 1)
+            return dt if dt.timestamp() < end else None
+
+        for res in self._iter_pages(fetch_page, next_cursor, first):
+            for x in res:
+                # [open, high, low, close, volume, unixtime_ms]
+                timestamp = x[5] / 1000
+                if start <= timestamp < end:
+                    yield Candle(timestamp=timestamp, open=float(x[0]), high=float(x[1]), low=float(x[2]),
+                                 close=float(x[3]), volume=float(x[4]), _data=x)
+
     # private methods
 
     def get_balances_list(self, *, params: dict = None) -> List[Balance]:
@@ -159,6 +200,35 @@ class Client(ClientBase):
         res = self.private_post('/user/spot/cancel_order', pair=pair, order_id=order_id)
         return self._convert_order(res)
 
+    # order_ids of /user/spot/cancel_orders
+    CANCEL_ORDERS_LIMIT = 30
+
+    def cancel_orders(self, order_ids: Iterable[Hashable]) -> List[Union[Optional[Order], Exception]]:
+        """orders are canceled by /user/spot/cancel_orders for each pair"""
+        order_ids = list(order_ids)
+        instrument_order_ids = defaultdict(list)
+        for instrument, order_id in order_ids:
+            instrument_order_ids[instrument].append(order_id)
+        chunks = []
+        for instrument, ids in instrument_order_ids.items():
+            for start in range(0, len(ids), self.CANCEL_ORDERS_LIMIT):
+                chunks.append((instrument, ids[start:start + self.CANCEL_ORDERS_LIMIT]))
+
+        def _cancel_orders(chunk: Tuple[str, List[Hashable]]) -> List[Order]:
+            instrument, ids = chunk
+            res = self.private_post('/user/spot/cancel_orders', pair=self.instruments[instrument].name_id,
+                                    order_ids=ids)
+            return [self._convert_order(x) for x in res['orders']]
+
+        results: Dict[Hashable, Union[Order, Exception]] = {}
+        for chunk, res in zip(chunks, self._map_private(_cancel_orders, chunks)):
+            instrument, ids = chunk
+            if isinstance(res, Exception):
+                results.update({(instrument, x): res for x in ids})
+            else:
+                results.update({x.order_id: x for x in res})
+        return [results.get(tuple(x), NotFoundError(f'{x} order not found')) for x in order_ids]
+
     def update_order(self, order_id: Hashable, *, params: dict = None) -> Optional[Order]:
         raise NotSupportedError('update_order is not supported')
 
@@ -24,7 +24,7 @@ class RestApi(RestApiBase):
 
     def on_response(self, res: requests.Response, is_private: bool):
         res.raise_for_status()
-        data = res.json()
+        data = self.decode_json(res)
         if not data['success']:
             code = data['data']['code']
             message = ERROR_CODES.get(str(code))
@@ -1,4 +1,5 @@
-from typing import Hashable, Tuple, Optional
+from collections import defaultdict
+from typing import Hashable, Tuple, Optional, DefaultDict
 
 from coinlib.datatypes.streamdata import StreamData, StreamType
 from coinlib.trade.streamclient import StreamClient as StreamClientBase
@@ -9,7 +10,12 @@ from .streamapi import StreamApi
 class StreamClient(Client, StreamClientBase):
     STREAM_API_CLASS = StreamApi
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._channel_data_cache: DefaultDict[Hashable, dict] = defaultdict(dict)
+
     def request_subscribe(self, key: Tuple[str, Hashable]):
+        self._channel_data_cache[key].clear()
         stream_type = key[0]
         if stream_type == StreamType.TICKER:
             instrument: str = key[1]
@@ -19,6 +25,10 @@ class StreamClient(Client, StreamClientBase):
             instrument: str = key[1]
             pair = self.instruments[instrument].name_id
             self.stream_api.subscribe((key, f'depth_{pair}'))
+        elif stream_type == StreamType.EXECUTION:
+            instrument: str = key[1]
+            pair = self.instruments[instrument].name_id
+            self.stream_api.subscribe((key, f'transactions_{pair}'))
 
     def request_unsubscribe(self, key: Tuple[str, Hashable]):
         self.stream_api.unsubscribe(key)
@@ -35,5 +45,21 @@ class StreamClient(Client, StreamClientBase):
             instrument: str = key[1]
             order_book = self._convert_order_book(instrument, data['data'])
             return StreamData(key, order_book)
+        elif stream_type == StreamType.EXECUTION:
+            # message may overlap with previous one, pick up newer than last message
+            cache = self._channel_data_cache[key]
+            last_id = cache.get('last_id')
+            rows = []
+            for x in data['data']['transactions']:
+                # {'transaction_id': 123, 'side': 'buy', 'price': '1000000', 'amount': '0.01',
+                #  'executed_at': 1527000000000}
+                if last_id is not None and x['transaction_id'] <= last_id:
+                    continue
+                rows.append((x['transaction_id'], x['executed_at'] / 1000, x['side'],
+                             float(x['price']), float(x['amount']), x))
+            if rows:
+                cache['last_id'] = max(row[0] for row in rows)
+            rows.sort(key=lambda row: row[0])
+            return self.convert_executions(key, rows)
 
         return None
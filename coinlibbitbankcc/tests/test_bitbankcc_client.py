@@ -29,6 +29,16 @@ def test_get_public_executions(client: Client):
         next(res)
 
 
+def test_get_candles(client: Client):
+    end = time.time() // 60 * 60
+    start = end - 2 * 24 * 60 * 60
+    candles = list(client.get_candles('BTC_JPY', '1m', start=start, end=end))
+    assert candles
+    timestamps = [x.timestamp for x in candles]
+    assert timestamps == sorted(set(timestamps))
+    assert start <= timestamps[0] and timestamps[-1] < end
+
+
 def test_get_balances(client: Client):
     balances = client.get_balances()
     balances = balances[BalanceType.MAIN]
@@ -1,4 +1,3 @@
-import json
 import logging
 from typing import Hashable, Dict
 
@@ -48,8 +47,8 @@ class StreamApi(WebSocketStreamApi):
             'chanId': channel_id,
         })
 
-    def on_message(self, message_data: str):
-        message = json.loads(message_data)
+    def on_message(self, message_data: bytes):
+        message = self.decode_message(message_data)
         if isinstance(message, dict):
             event = message.get('event')
             if event == 'info':
@@ -78,7 +77,7 @@ class StreamApi(WebSocketStreamApi):
 
         for key, params in self._subscriptions.items():
             if channel_name == params.get('channel'):
-                if channel_name == 'book':
+                if channel_name in ('book', 'trades'):
                     # TODO: distinguish between order_book and raw_order_book
                     if message['pair'].upper() != params.get('pair', '').upper():
                         continue
@@ -2,7 +2,7 @@ from collections import defaultdict
 import time
 from typing import Hashable, Tuple, Optional, DefaultDict
 
-from coinlib.datatypes import OrderBook
+from coinlib.datatypes import OrderBook, OrderSide
 from coinlib.datatypes.streamdata import StreamData, StreamType
 from coinlib.trade.streamclient import StreamClient as StreamClientBase
 from .client import Client
@@ -11,6 +11,7 @@ from .streamapi import StreamApi
 
 class StreamClient(Client, StreamClientBase):
     STREAM_API_CLASS = StreamApi
+    NATIVE_TICKER_STREAM = False
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -32,6 +33,16 @@ class StreamClient(Client, StreamClientBase):
             }
             self.stream_api.subscribe((key, params))
             return
+        if stream_type == StreamType.EXECUTION:
+            instrument: str = key[1]
+            pair = self.instruments[instrument].name_id
+            params = {
+                'event': 'subscribe',
+                'channel': 'trades',
+                'pair': pair,
+            }
+            self.stream_api.subscribe((key, params))
+            return
 
     def request_unsubscribe(self, key: Tuple[str, Hashable]):
         self.stream_api.unsubscribe(key)
@@ -41,6 +52,8 @@ class StreamClient(Client, StreamClientBase):
         stream_type = key[0]
         if stream_type == StreamType.ORDER_BOOK:
             return self.convert_order_book(data)
+        if stream_type == StreamType.EXECUTION:
+            return self.convert_execution(data)
 
         return None
 
@@ -75,3 +88,16 @@ class StreamClient(Client, StreamClientBase):
                 bids.append((float(price), abs(float(amount)), int(count)))
         order_book = OrderBook(timestamp=time.time(), instrument=instrument, asks=asks, bids=bids, _data=None)
         return StreamData(key, order_book)
+
+    def convert_execution(self, data: StreamData) -> Optional[StreamData]:
+        key: Tuple[str, Hashable] = data.key
+        data: list = data.data
+        assert isinstance(data, list), data
+        # snapshot(recent history) and 'tu'(same execution as 'te') are ignored
+        if data[1] != 'te':
+            return None
+        # [CHANNEL_ID, 'te', SEQ, TIMESTAMP, PRICE, AMOUNT]
+        execution_id, timestamp, price, amount = data[2:6]
+        side = OrderSide.BUY if amount > 0 else OrderSide.SELL
+        row = (execution_id, float(timestamp), side, float(price), abs(float(amount)), data)
+        return self.convert_executions(key, [row])
@@ -11,7 +11,6 @@ WAIT = 5
 N = 10
 
 
-@pytest.mark.skip(reason='currently not supported')
 def test_ticker(stream_client: StreamClient):
     q = Queue()
 
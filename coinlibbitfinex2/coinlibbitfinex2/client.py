@@ -2,16 +2,17 @@ from collections import OrderedDict
 import enum
 import logging
 import time
-from typing import Hashable, Iterable, Optional, Iterator, List
+from typing import Dict, Hashable, Iterable, Optional, Iterator, List
 
 from coinlib.datatypes import Instrument, OrderBook, Balance, Execution, Ticker
 from coinlib.datatypes.balance import BalanceType
+from coinlib.datatypes.candle import Candle
 from coinlib.datatypes.order import OrderState, Order, OrderType, OrderSide
 from coinlib.datatypes.position import Position, PositionState
 from coinlib.errors import NotSupportedError
-from coinlib.trade.client import Client as ClientBase
+from coinlib.trade.client import Client as ClientBase, ExecutionRangeKey
 from coinlib.utils.decorators import dedup
-from coinlibbitfinex.client import Client as V1Client
+from coinlibbitfinex.restapi import RestApi as V1RestApi
 from .restapi import RestApi
 
 logger = logging.getLogger(__name__)
@@ -37,7 +38,7 @@ class Client(ClientBase):
 
     def get_instruments(self):
         instrument_map = {}
-        for info in V1Client().public_get('/symbols_details'):
+        for info in V1RestApi().public_get('/symbols_details'):
             pair = info['pair'].upper()
             base_id, quote_id = pair[:-3], pair[-3:]
             base, quote = base_id.upper(), quote_id.upper()
@@ -62,6 +63,21 @@ class Client(ClientBase):
         res = self.public_get(f'/ticker/{symbol}')
         return self._convert_ticker(timestamp, instrument, res)
 
+    def get_tickers(self, instruments: Iterable[str] = None) -> Dict[str, Ticker]:
+        if instruments is not None:
+            instruments = list(instruments)
+            symbols = ','.join(self.instruments[x].name_id for x in instruments)
+        else:
+            symbols = 'ALL'
+        timestamp = time.time()
+        res = self.public_get('/tickers', symbols=symbols)
+        # [SYMBOL, BID, BID_SIZE, ASK, ...]
+        data_map = {x[0]: x[1:] for x in res}
+        if instruments is None:
+            # funding tickers('f...') are excluded
+            instruments = [self.rinstruments[x] for x in data_map if x in self.rinstruments]
+        return {x: self._convert_ticker(timestamp, x, data_map[self.instruments[x].name_id]) for x in instruments}
+
     def _convert_order_book(self, timestamp: float, instrument: str, data: list):
         asks = []
         bids = []
@@ -95,21 +111,76 @@ class Client(ClientBase):
         symbol = self.instruments[instrument].name_id
         limit = 500
         kwargs = dict(limit=limit, sort=-1)
-        end = int(time.time() * 1000)
-        last_id = None
-        while True:
-            kwargs.update(end=end)
-            res = self.public_get(f'/trades/{symbol}/hist', **kwargs)
-            last_execution = None
+
+        def fetch_page(end: int) -> list:
+            return self.public_get(f'/trades/{symbol}/hist', end=end, **kwargs)
+
+        # [ID, MTS, AMOUNT, PRICE]
+        next_cursor = self._next_mts(limit, 1)
+        for res in self._iter_pages(fetch_page, next_cursor, int(time.time() * 1000)):
+            for x in res:
+                yield self._convert_public_execution(instrument, x)
+
+    EXECUTION_RANGE_KEY = ExecutionRangeKey.TIME_MS
+
+    @dedup(lambda x: x.execution_id)
+    def get_public_executions_range(self, instrument: str, start: int, end: int) -> Iterator[Execution]:
+        symbol = self.instruments[instrument].name_id
+        limit = 1000
+        # start and end are inclusive
+        kwargs = dict(limit=limit, sort=1, end=end - 1)
+
+        def fetch_page(_start: int) -> list:
+            return self.public_get(f'/trades/{symbol}/hist', start=_start, **kwargs)
+
+        # [ID, MTS, AMOUNT, PRICE]
+        next_cursor = self._next_mts(limit, 1)
+        for res in self._iter_pages(fetch_page, next_cursor, start):
+            for x in res:
+                yield self._convert_public_execution(instrument, x)
+
+    CANDLE_SIZES = {
+        '1m': '1m', '5m': '5m', '15m': '15m', '30m': '30m',
+        '1h': '1h', '3h': '3h', '6h': '6h', '12h': '12h', '1d': '1D',
+    }
+
+    @dedup(lambda x: x.timestamp)
+    def _fetch_candles(self, instrument: str, candle_size: str, start: float, end: float, *,
+                       params: dict = None) -> Iterator[Candle]:
+        symbol = self.instruments[instrument].name_id
+        tf = self.CANDLE_SIZES.get(candle_size)
+        if not tf:
+            raise NotSupportedError(f'candle_size={candle_size} not supported')
+        limit = 10000
+        # start and end are inclusive
+        kwargs = dict(limit=limit, sort=1, end=int(end * 1000) - 1)
+        kwargs.update(params or {})
+
+        def fetch_page(_start: int) -> list:
+            return self.public_get(f'/candles/trade:{tf}:{symbol}/hist', start=_start, **kwargs)
+
+        # [MTS, OPEN, CLOSE, HIGH, LOW, VOLUME]
+        next_cursor = self._next_mts(limit, 0)
+        for res in self._iter_pages(fetch_page, next_cursor, int(start * 1000)):
             for x in res:
-                last_execution = self._convert_public_execution(instrument, x)
-                yield last_execution
+                mts, open_, close, high, low, volume = x[:6]
+                yield Candle(timestamp=mts / 1000, open=open_, high=high, low=low, close=close, volume=volume,
+                             _data=x)
+
+    @staticmethod
+    def _next_mts(limit: int, mts_index: int):
+        """next_cursor of _iter_pages(). pages are paginated by mts of last row ('end' or 'start' if sort=1)"""
+        last_id = None
+
+        def next_cursor(_, res: list) -> Optional[int]:
+            nonlocal last_id
             if len(res) < limit:
-                break
-            assert last_id != last_execution.execution_id
-            last_id = last_execution.execution_id
-            # noinspection PyProtectedMember
-            end = last_execution._data['mts']
+                return None
+            assert last_id != res[-1][0]
+            last_id = res[-1][0]
+            return res[-1][mts_index]
+
+        return next_cursor
 
     # private methods
 
@@ -240,21 +311,15 @@ class Client(ClientBase):
         symbol = self.instruments[instrument].name_id
         limit = 500
         kwargs = dict(limit=limit)
-        end = int(time.time() * 1000)
-        last_id = None
-        while True:
-            kwargs.update(end=end)
-            res = self.private_post(f'/auth/r/trades/{symbol}/hist', **kwargs)
-            last_execution = None
+
+        def fetch_page(end: int) -> list:
+            return self.private_post(f'/auth/r/trades/{symbol}/hist', end=end, **kwargs)
+
+        # [ID, PAIR, MTS_CREATE, ...]
+        next_cursor = self._next_mts(limit, 2)
+        for res in self._iter_pages(fetch_page, next_cursor, int(time.time() * 1000)):
             for x in res:
-                last_execution = self._convert_private_execution(x)
-                yield last_execution
-            if len(res) < limit:
-                break
-            assert last_id != last_execution.execution_id
-            last_id = last_execution.execution_id
-            # noinspection PyProtectedMember
-            end = last_execution._data['mts_create']
+                yield self._convert_private_execution(x)
 
     def _convert_position(self, data: list) -> Position:
         keys = [
@@ -11,6 +11,8 @@ class RestApi(RestApiBase):
     AUTH_CLASS = Auth
     CONTENT_TYPE = 'application/json'
     RATE_LIMIT_WAIT = 15
+    # 10-90 requests / minute per endpoint
+    RATE_LIMITS = {'public': (30, 0.5), 'private': (90, 1.5)}
 
     def on_error(self, exc: Exception):
         if isinstance(exc, HTTPError):
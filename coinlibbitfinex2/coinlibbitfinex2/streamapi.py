@@ -1,6 +1,5 @@
 import hashlib
 import hmac
-import json
 import logging
 from typing import Hashable, Dict, Callable, Any
 
@@ -51,8 +50,8 @@ class StreamApi(WebSocketStreamApi):
             'chanId': channel_id,
         })
 
-    def on_message(self, message_data: str):
-        message = json.loads(message_data)
+    def on_message(self, message_data: bytes):
+        message = self.decode_message(message_data)
         if isinstance(message, dict):
             event = message.get('event')
             if event == 'info':
@@ -96,7 +95,8 @@ class StreamApi(WebSocketStreamApi):
         api_key: str = credential.get('api_key')
         api_secret: str = credential.get('api_secret')
         assert api_key and api_secret
-        nonce = Auth.get_nonce()
+        # shares nonce with REST API
+        nonce = Auth(credential).get_nonce()
         auth_payload = f'AUTH{nonce}'
         signature = hmac.new(api_secret.encode(), auth_payload.encode(), hashlib.sha384).hexdigest()
 
@@ -115,7 +115,7 @@ class StreamApi(WebSocketStreamApi):
 
         for key, params in self._subscriptions.items():
             if channel_name == params.get('channel'):
-                if channel_name == 'book':
+                if channel_name in ('book', 'trades'):
                     # TODO: distinguish between order_book and raw_order_book
                     if message['symbol'].upper() != params.get('symbol', '').upper():
                         continue
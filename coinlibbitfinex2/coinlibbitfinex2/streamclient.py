@@ -3,12 +3,13 @@ import copy
 import logging
 import threading
 import time
-from typing import Hashable, Tuple, Optional, DefaultDict, Dict, Deque, List, Any, Iterable, Iterator
+from typing import Hashable, Tuple, Optional, DefaultDict, Dict, Deque, List, Any, Iterable, Iterator, Union
 
 import dataclasses
 from dataclasses import dataclass
 
 from coinlib.datatypes import OrderBook, Order, Position, Execution, OrderState, Balance, OrderSide, OrderType
+from coinlib.datatypes.order import OrderRequest
 from coinlib.datatypes.streamdata import StreamData, StreamType
 from coinlib.errors import NotFoundError, CoinError, NotSupportedError
 from coinlib.trade.streamclient import StreamClient as StreamClientBase
@@ -106,6 +107,7 @@ class AccountInfo:
 
 class StreamClient(Client, StreamClientBase):
     STREAM_API_CLASS = StreamApi
+    NATIVE_TICKER_STREAM = False
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -148,6 +150,16 @@ class StreamClient(Client, StreamClientBase):
             }
             self.stream_api.subscribe((key, params))
             return
+        if stream_type == StreamType.EXECUTION:
+            instrument: str = key[1]
+            symbol = self.instruments[instrument].name_id
+            params = {
+                'event': 'subscribe',
+                'channel': 'trades',
+                'symbol': symbol,
+            }
+            self.stream_api.subscribe((key, params))
+            return
 
     def request_unsubscribe(self, key: Tuple[str, Hashable]):
         self.stream_api.unsubscribe(key)
@@ -157,6 +169,8 @@ class StreamClient(Client, StreamClientBase):
         stream_type = key[0]
         if stream_type == StreamType.ORDER_BOOK:
             return self.convert_order_book(data)
+        if stream_type == StreamType.EXECUTION:
+            return self.convert_execution(data)
         if stream_type == 'private_account':
             self.convert_account_info(data)
             return data
@@ -198,6 +212,20 @@ class StreamClient(Client, StreamClientBase):
         order_book = OrderBook(timestamp=timestamp, instrument=instrument, asks=asks, bids=bids, _data=None)
         return StreamData(key, order_book)
 
+    def convert_execution(self, data: StreamData) -> Optional[StreamData]:
+        key: Tuple[str, Hashable] = data.key
+        data: list = data.data
+        assert isinstance(data, list), data
+        # snapshot(recent history) and 'tu'(same execution as 'te') are ignored
+        if data[1] != 'te':
+            return None
+        # [ID, MTS, AMOUNT, PRICE]
+        values = data[2]
+        execution_id, mts, amount, price = values[:4]
+        side = OrderSide.BUY if amount > 0 else OrderSide.SELL
+        row = (execution_id, mts / 1000, side, float(price), abs(float(amount)), values)
+        return self.convert_executions(key, [row])
+
     # private
 
     def convert_account_info(self, data: StreamData) -> Optional[StreamData]:
@@ -303,15 +331,38 @@ class StreamClient(Client, StreamClientBase):
                      *, margin: bool = False, leverage: float = None, params: dict = None,
                      gid: int = None, flags: int = None,
                      timeout: float = 30, async: bool = False) -> Order:
-        order_type = self._order_type_map.get((order_type, margin), order_type)
-        if margin:
-            assert 'EXCHANGE' not in order_type, f'margin={margin}, but spot order'
-        kwargs = dict(instrument=instrument, order_type=order_type, side=side,
-                      price=price, qty=qty, gid=gid, flags=flags)
+        kwargs = dict(gid=gid, flags=flags)
         kwargs.update(params or {})
-        order_op = self._new_order_op(**kwargs)
+        order_op = self._submit_order_op_of(instrument, order_type, side, price, qty, margin, kwargs)
         return self._submit_order_op(order_op, timeout=timeout, async=async)
 
+    # ops in a ox_multi message
+    MULTI_OP_LIMIT = 75
+
+    def submit_orders(self, orders: Iterable[OrderRequest], *, timeout: float = 30) -> List[Union[Order, Exception]]:
+        """orders are sent by ox_multi messages"""
+        orders = list(orders)
+        results: List[Union[Order, Exception]] = [None] * len(orders)
+        order_ops = []
+        for i, x in enumerate(orders):
+            try:
+                order_ops.append((i, self._submit_order_op_of(x.instrument, x.order_type, x.side, x.price, x.qty,
+                                                              x.margin, x.params)))
+            except Exception as e:
+                results[i] = e
+        with self._order_op_lock:
+            timestamp = time.time()
+            for start in range(0, len(order_ops), self.MULTI_OP_LIMIT):
+                ops = [[op, params] for _, (op, params) in order_ops[start:start + self.MULTI_OP_LIMIT]]
+                self.send_message([0, 'ox_multi', None, ops])
+        expired = timestamp + timeout
+        for i, (op, params) in order_ops:
+            try:
+                results[i] = self._wait_order_response(op, params, timestamp, max(expired - time.time(), 0))
+            except Exception as e:
+                results[i] = e
+        return results
+
     def cancel_order(self, order_id: Hashable, *, params: dict = None,
                      timeout: float = 30, async: bool = False) -> Order:
         order_op = self._cancel_order_op(order_id)
@@ -321,6 +372,26 @@ class StreamClient(Client, StreamClientBase):
         order_op = self._cancel_order_group_op(group_id)
         return self._submit_order_op(order_op, timeout=timeout, async=async)
 
+    def cancel_orders(self, order_ids: Iterable[Hashable], *,
+                      timeout: float = 30) -> List[Union[Optional[Order], Exception]]:
+        """orders are canceled by one oc_multi message. result of each order is None"""
+        order_ids = list(order_ids)
+        if not order_ids:
+            return []
+        try:
+            self._submit_order_op(self._cancel_orders_op(order_ids), timeout=timeout)
+        except Exception as e:
+            return [e] * len(order_ids)
+        return [None] * len(order_ids)
+
+    def cancel_all(self, instrument: str = None, *, timeout: float = 30):
+        if instrument:
+            order_ids = [x.order_id for x in self.get_orders(instrument=instrument)]
+            if order_ids:
+                self._submit_order_op(self._cancel_orders_op(order_ids), timeout=timeout)
+        else:
+            self._submit_order_op(('oc_multi', {'all': 1}), timeout=timeout)
+
     def update_order(self, order_id: Hashable, *, params: dict = None, timeout: float = 30, async: bool = False,
                      gid: int = None, price: float = None,
                      qty: float = None, qty_delta: float = None, flags: int = None) -> Order:
@@ -354,9 +425,19 @@ class StreamClient(Client, StreamClientBase):
             cls._cid = cid
             return cid
 
+    def _submit_order_op_of(self, instrument: str, order_type: str, side: str, price: Optional[float], qty: float,
+                            margin: bool, params: Optional[dict]):
+        order_type = self._order_type_map.get((order_type, margin), order_type)
+        if margin:
+            assert 'EXCHANGE' not in order_type, f'margin={margin}, but spot order'
+        kwargs = dict(instrument=instrument, order_type=order_type, side=side, price=price, qty=qty)
+        kwargs.update(params or {})
+        return self._new_order_op(**kwargs)
+
     def _new_order_op(self, *, instrument: str, order_type: str, side: str, price: float = None, qty: float,
-                      gid: int = None, flags: int = None):
-        cid = self._get_cid()
+                      gid: int = None, flags: int = None, cid: int = None):
+        # cid of caller identifies the order after timeout. see _find_order_by_cid()
+        cid = cid or self._get_cid()
         symbol = self.instruments[instrument].name_id
         side = side.upper()
         if side == 'BUY':
@@ -397,6 +478,10 @@ class StreamClient(Client, StreamClientBase):
         _ = self
         return 'oc', {'id': order_id}
 
+    def _cancel_orders_op(self, order_ids: List[Hashable]):
+        _ = self
+        return 'oc_multi', {'id': order_ids}
+
     def _cancel_order_group_op(self, gid: int):
         _ = self
         return 'oc_multi', {'gid': [[gid]]}
@@ -456,8 +541,19 @@ class StreamClient(Client, StreamClientBase):
                                 target_order_id = notification.notify_info[0]
                                 break
             time.sleep(0.2)
+        if op == 'on':
+            # notification may be lost. order is found by cid
+            order = self._find_order_by_cid(params['cid'])
+            if order:
+                return order
         raise CoinError('timeout')
 
+    def _find_order_by_cid(self, cid: int) -> Optional[Order]:
+        for order in self._account_info.get_orders().values():
+            if order and order._data and order._data.get('cid') == cid:
+                return order
+        return None
+
     def send_message(self, message: Any):
         stream_api: StreamApi = self.stream_api
         stream_api.send_message(message)
@@ -22,6 +22,25 @@ def test_get_order_book(client: Client):
     assert abs(order_book.timestamp - time.time()) < 2
 
 
+def test_get_tickers(client: Client):
+    tickers = client.get_tickers(['BTC_USD', 'ETH_USD'])
+    assert set(tickers) == {'BTC_USD', 'ETH_USD'}
+    for instrument, ticker in tickers.items():
+        assert isinstance(ticker, Ticker)
+        ticker.validate()
+        assert ticker.instrument == instrument
+    assert 'BTC_USD' in client.get_tickers()
+
+
+def test_get_order_books(client: Client):
+    order_books = client.get_order_books(['BTC_USD', 'ETH_USD'])
+    assert set(order_books) == {'BTC_USD', 'ETH_USD'}
+    for instrument, order_book in order_books.items():
+        assert isinstance(order_book, OrderBook)
+        order_book.validate()
+        assert order_book.instrument == instrument
+
+
 def test_get_public_executions(client: Client):
     execution_ids = set()
     timestamp = math.inf
@@ -36,6 +55,16 @@ def test_get_public_executions(client: Client):
     assert len(execution_ids) == 1001
 
 
+def test_get_candles(client: Client):
+    end = time.time() // 60 * 60
+    start = end - 2 * 24 * 60 * 60
+    candles = list(client.get_candles('BTC_USD', '1m', start=start, end=end))
+    assert candles
+    timestamps = [x.timestamp for x in candles]
+    assert timestamps == sorted(set(timestamps))
+    assert start <= timestamps[0] and timestamps[-1] < end
+
+
 def test_get_balances(client: Client):
     all_balances = client.get_balances()
     assert set(all_balances.keys()).issubset(BalanceType._all)
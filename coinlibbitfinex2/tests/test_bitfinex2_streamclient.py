@@ -3,7 +3,7 @@ import time
 
 import pytest
 
-from coinlib.datatypes import Ticker, OrderBook, OrderSide
+from coinlib.datatypes import Ticker, OrderBook, OrderSide, Execution
 from coinlib.datatypes.streamdata import StreamData
 from coinlibbitfinex2.client import Flag
 from coinlibbitfinex2.streamclient import StreamClient
@@ -12,7 +12,6 @@ WAIT = 5
 N = 50
 
 
-@pytest.mark.skip(reason='currently not supported')
 def test_ticker(stream_client: StreamClient):
     q = Queue()
 
@@ -43,6 +42,22 @@ def test_order_book(stream_client: StreamClient):
     assert isinstance(bid[0], float) and isinstance(bid[1], float) and isinstance(bid[2], int)
 
 
+def test_execution(stream_client: StreamClient):
+    q = Queue()
+
+    stream_client.on_data = q.put
+    assert stream_client.wait_connection(5)
+    stream_client.subscribe(execution='BTC_USD')
+    d: StreamData = q.get(timeout=WAIT * 6)
+    k, d = d.key, d.data
+    assert k == ('execution', 'BTC_USD')
+    assert isinstance(d, list)
+    for x in d:
+        assert isinstance(x, Execution)
+        assert x.instrument == 'BTC_USD'
+        assert isinstance(x.price, float) and isinstance(x.qty, float)
+
+
 def test_subscribe_unsubscribe(stream_client: StreamClient):
     q = Queue()
 
@@ -1,6 +1,5 @@
 import hashlib
 import hmac
-import time
 import urllib.parse
 
 import requests
@@ -9,6 +8,8 @@ from coinlib.trade.auth import Auth as AuthBase
 
 
 class Auth(AuthBase):
+    NONCE_RESOLUTION = 1000000
+
     def sign(self, req: requests.PreparedRequest) -> requests.PreparedRequest:
         method = req.method.upper()
         parsed = urllib.parse.urlsplit(req.url)
@@ -36,6 +37,6 @@ class Auth(AuthBase):
         req.headers.update(headers)
         return req
 
-    @classmethod
-    def get_nonce(cls):
-        return time.time()
+    def get_nonce(self) -> float:
+        # unix time
+        return super().get_nonce() / self.NONCE_RESOLUTION
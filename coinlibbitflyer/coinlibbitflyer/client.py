@@ -9,7 +9,8 @@ from coinlib.datatypes.balance import BalanceType
 from coinlib.datatypes.order import OrderState, OrderType
 from coinlib.datatypes.position import Position, PositionState
 from coinlib.errors import NotSupportedError
-from coinlib.trade.client import Client as ClientBase
+from coinlib.trade.client import Client as ClientBase, ExecutionRangeKey
+from coinlib.utils.funcs import no_none_dict
 from .restapi import RestApi
 
 
@@ -77,29 +78,58 @@ class Client(ClientBase):
         order_book.timestamp = timestamp
         return order_book
 
-    def get_public_executions(self, instrument: str, **kwargs) -> Iterator[Execution]:
+    def get_public_executions(self, instrument: str, *, params: dict = None) -> Iterator[Execution]:
         limit = 500
         kwargs = {
             'product_code': self.instruments[instrument].name_id,
             'count': limit,
         }
-        kwargs.update(_params or {})
-        while True:
-            res = self.public_get('/executions', **kwargs)
+        kwargs.update(params or {})
+
+        def fetch_page(before: Optional[int]) -> list:
+            return self.public_get('/executions', **no_none_dict(kwargs, before=before))
+
+        for res in self._iter_pages(fetch_page, self._next_before(limit)):
             for x in res:
-                execution_id = x['id']
-                timestamp = self._parse_time(x['exec_date'])
-                execution = Execution(execution_id=execution_id,
-                                      timestamp=timestamp,
-                                      instrument=instrument,
-                                      side=x['side'],
-                                      price=x['price'],
-                                      qty=x['size'],
-                                      _data=x)
-                yield execution
-            if len(res) < limit:
-                break
-            kwargs.update(before=res[-1]['id'])
+                # itayose execution has no taker side
+                if x['side']:
+                    yield self._convert_execution(instrument, x)
+
+    EXECUTION_RANGE_KEY = ExecutionRangeKey.ID
+
+    def get_public_executions_range(self, instrument: str, start: int, end: int) -> Iterator[Execution]:
+        limit = 500
+        kwargs = {
+            'product_code': self.instruments[instrument].name_id,
+            'count': limit,
+            'after': start - 1,
+        }
+
+        def fetch_page(before: int) -> list:
+            return self.public_get('/executions', before=before, **kwargs)
+
+        executions = []
+        for res in self._iter_pages(fetch_page, self._next_before(limit), end):
+            # itayose execution has no taker side
+            executions.extend(self._convert_execution(instrument, x) for x in res if x['side'])
+        return reversed(executions)
+
+    def _convert_execution(self, instrument: str, data: dict) -> Execution:
+        return Execution(execution_id=data['id'],
+                         timestamp=self._parse_time(data['exec_date']),
+                         instrument=instrument,
+                         side=data['side'],
+                         price=data['price'],
+                         qty=data['size'],
+                         _data=data)
+
+    @staticmethod
+    def _next_before(limit: int):
+        """next_cursor of _iter_pages(). pages are paginated by 'before' id"""
+        def next_cursor(_, res: list) -> Optional[int]:
+            return res[-1]['id'] if len(res) >= limit else None
+
+        return next_cursor
 
     def get_balances_list(self) -> List[Balance]:
         balances = []
@@ -166,13 +196,13 @@ class Client(ClientBase):
             }
             if active_only:
                 kwargs.update(child_order_state='ACTIVE')
-            while True:
-                res = self.private_get('/getchildorders', **kwargs)
+
+            def fetch_page(before: Optional[int]) -> list:
+                return self.private_get('/getchildorders', **no_none_dict(kwargs, before=before))
+
+            for res in self._iter_pages(fetch_page, self._next_before(limit)):
                 for v in res:
                     yield self._convert_order(v)
-                if len(res) < limit:
-                    break
-                kwargs.update(before=res[-1]['id'])
 
     _order_type_map = {
         OrderType.MARKET: 'MARKET',
@@ -208,6 +238,17 @@ class Client(ClientBase):
         self.private_post('/cancelchildorder', product_code=product_code, child_order_acceptance_id=order_id)
         return None
 
+    def cancel_all(self, instrument: str = None):
+        """/cancelallchildorders of instrument or each instrument if None"""
+        instruments = [instrument] if instrument else list(self.instruments)
+
+        def _cancel_all(x: str):
+            self.private_post('/cancelallchildorders', product_code=self.instruments[x].name_id)
+
+        for res in self._map_private(_cancel_all, instruments):
+            if isinstance(res, Exception):
+                raise res
+
     def update_order(self, order_id: Hashable, *, params: dict) -> Optional[Order]:
         raise NotSupportedError('not supported')
 
@@ -217,22 +258,13 @@ class Client(ClientBase):
             'product_code': self.instruments[instrument].name_id,
             'count': limit,
         }
-        while True:
-            res = self.private_get('/executions', **kwargs)
+
+        def fetch_page(before: Optional[int]) -> list:
+            return self.private_get('/executions', **no_none_dict(kwargs, before=before))
+
+        for res in self._iter_pages(fetch_page, self._next_before(limit)):
             for x in res:
-                execution_id = x['id']
-                timestamp = self._parse_time(x['exec_date'])
-                execution = Execution(execution_id=execution_id,
-                                      timestamp=timestamp,
-                                      instrument=instrument,
-                                      side=x['side'],
-                                      price=x['price'],
-                                      qty=x['size'],
-                                      _data=x)
-                yield execution
-            if len(res) < limit:
-                break
-            kwargs.update(before=res[-1]['id'])
+                yield self._convert_execution(instrument, x)
 
     def _convert_position(self, data: dict) -> Position:
         instrument = self.rinstruments[data['product_code']]
@@ -8,6 +8,10 @@ class RestApi(RestApiBase):
     NAME = 'bitflyer'
     AUTH_CLASS = Auth
     CONTENT_TYPE = 'application/json'
+    # about 500 requests / 5 minutes per api key and per ip address
+    RATE_LIMITS = {'public': (500, 500 / 300), 'private': (500, 500 / 300)}
+    # ACCESS-TIMESTAMP is not required to arrive in order
+    PRIVATE_CONCURRENCY = 4
 
     def get_url(self, path: str, is_private: bool):
         if is_private:
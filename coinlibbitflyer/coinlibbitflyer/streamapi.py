@@ -1,5 +1,4 @@
 import itertools
-import json
 import logging
 from typing import Dict, Any
 
@@ -45,8 +44,8 @@ class StreamApi(WebSocketStreamApi):
             'id': request_id,
         })
 
-    def on_message(self, message_data: str):
-        message = json.loads(message_data)
+    def on_message(self, message_data: bytes):
+        message = self.decode_message(message_data)
         if isinstance(message, dict):
             method = message.get('method')
             if method == 'channelMessage':
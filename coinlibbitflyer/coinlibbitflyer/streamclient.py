@@ -33,10 +33,15 @@ class StreamClient(Client, StreamClientBase):
             self.stream_api.subscribe((internal_key, f'lightning_board_snapshot_{pair}'))
             self.stream_api.subscribe((internal_key2, f'lightning_board_{pair}'))
             return
+        if stream_type == StreamType.EXECUTION:
+            instrument: str = key[1]
+            pair = self.instruments[instrument].name_id
+            self.stream_api.subscribe((key, f'lightning_executions_{pair}'))
+            return
 
     def request_unsubscribe(self, key: Tuple[str, Hashable]):
         stream_type = key[0]
-        if stream_type == StreamType.TICKER:
+        if stream_type in (StreamType.TICKER, StreamType.EXECUTION):
             self.stream_api.unsubscribe(key)
             return
         if stream_type == StreamType.ORDER_BOOK:
@@ -78,5 +83,16 @@ class StreamClient(Client, StreamClientBase):
                                        asks=asks, bids=bids, _data=None)
                 # return (key, data)
                 return StreamData(key[:2], order_book)
+        elif stream_type == StreamType.EXECUTION:
+            rows = []
+            for x in data:
+                # {'id': 123, 'side': 'BUY', 'price': 1000000, 'size': 0.01,
+                #  'exec_date': '2018-05-22T07:35:42.3991234Z', ...}
+                if not x['side']:
+                    # itayose execution has no taker side
+                    continue
+                rows.append((x['id'], self._parse_time(x['exec_date']), x['side'],
+                             float(x['price']), float(x['size']), x))
+            return self.convert_executions(key, rows)
 
         return None
@@ -1,7 +1,7 @@
 import itertools
 import time
 
-from coinlib.datatypes import Ticker, OrderBook, OrderState, OrderSide, Order
+from coinlib.datatypes import Instrument, Ticker, OrderBook, OrderState, OrderSide, Order
 from coinlib.datatypes.balance import BalanceType
 from coinlibbitflyer.client import Client
 
@@ -90,3 +90,19 @@ def test_order(client_write: Client):
     res = client_write.get_orders(order_ids=[order.order_id], instrument='BTC_JPY', active_only=False)
     res = list(res)
     assert len(res) == 0
+
+
+def test_executions_range_without_side():
+    client = Client(instrument_registry=None)
+    client.instruments = {'BTC_JPY': Instrument(name='BTC_JPY', base='BTC', quote='JPY', name_id='BTC_JPY')}
+    pages = {
+        4: [
+            {'id': 3, 'side': 'BUY', 'price': 100.0, 'size': 0.1, 'exec_date': '2020-01-01T00:00:03.0'},
+            # itayose execution
+            {'id': 2, 'side': '', 'price': 101.0, 'size': 0.2, 'exec_date': '2020-01-01T00:00:02.0'},
+            {'id': 1, 'side': 'SELL', 'price': 102.0, 'size': 0.3, 'exec_date': '2020-01-01T00:00:01.0'},
+        ],
+    }
+    client.public_get = lambda path, before, **_: pages.get(before, [])
+    executions = list(client.get_public_executions_range('BTC_JPY', 1, 4))
+    assert [(x.execution_id, x.side) for x in executions] == [(1, 'SELL'), (3, 'BUY')]
@@ -3,7 +3,7 @@ from queue import Queue, Empty
 
 import pytest
 
-from coinlib.datatypes import Ticker, OrderBook
+from coinlib.datatypes import Ticker, OrderBook, Execution
 from coinlib.datatypes.streamdata import StreamData
 from coinlibbitflyer.streamclient import StreamClient
 
@@ -40,6 +40,22 @@ def test_order_book(stream_client: StreamClient):
     assert isinstance(bid[0], float) and isinstance(bid[1], float) and bid[2] is None
 
 
+def test_execution(stream_client: StreamClient):
+    q = Queue()
+
+    stream_client.on_data = q.put
+    assert stream_client.wait_connection(5)
+    stream_client.subscribe(execution='FX_BTC_JPY')
+    d: StreamData = q.get(timeout=WAIT * 6)
+    k, d = d.key, d.data
+    assert k == ('execution', 'FX_BTC_JPY')
+    assert isinstance(d, list)
+    for x in d:
+        assert isinstance(x, Execution)
+        assert x.instrument == 'FX_BTC_JPY'
+        assert isinstance(x.price, float) and isinstance(x.qty, float)
+
+
 def test_subscribe_unsubscribe(stream_client: StreamClient):
     q = Queue()
 
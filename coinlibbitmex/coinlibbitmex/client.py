@@ -1,16 +1,20 @@
+import datetime
 import json
 import logging
 import time
-from typing import Hashable, Optional, Iterable, Iterator, List
+import uuid
+from typing import Dict, Hashable, Optional, Iterable, Iterator, List, Union
 
 import dateutil.parser
 import pytz
 from requests.structures import CaseInsensitiveDict
 
 from coinlib.datatypes import Instrument, OrderBook, Execution, Order, Ticker, Balance, OrderState, OrderType
+from coinlib.datatypes.order import OrderRequest
 from coinlib.datatypes.balance import BalanceType
+from coinlib.datatypes.candle import Candle
 from coinlib.datatypes.position import Position
-from coinlib.errors import NotSupportedError
+from coinlib.errors import CoinError, NotFoundError, NotSupportedError
 from coinlib.trade.client import Client as ClientBase
 from coinlib.utils.decorators import dedup
 from coinlib.utils.funcs import no_none_dict
@@ -38,13 +42,27 @@ class Client(ClientBase):
                                              _data=x)
         return instruments
 
+    def _convert_ticker(self, instrument: str, data: dict, res) -> Ticker:
+        return Ticker(timestamp=self._parse_time(data['timestamp']), instrument=instrument,
+                      ask=float(data['askPrice']), bid=float(data['bidPrice']), last=float(data['lastPrice']),
+                      volume_24h=float(data['volume24h']), _data=res)
+
     def get_ticker(self, instrument: str) -> Ticker:
         symbol = self.instruments[instrument].name_id
         res = self.public_get('/instrument', symbol=symbol)
-        x = res[0]
-        return Ticker(timestamp=self._parse_time(x['timestamp']), instrument=instrument,
-                      ask=float(x['askPrice']), bid=float(x['bidPrice']), last=float(x['lastPrice']),
-                      volume_24h=float(x['volume24h']), _data=res)
+        return self._convert_ticker(instrument, res[0], res)
+
+    def get_tickers(self, instruments: Iterable[str] = None) -> Dict[str, Ticker]:
+        # all active instruments in one request
+        res = self.public_get('/instrument/active')
+        data_map = {x['symbol']: x for x in res}
+        if instruments is None:
+            instruments = [self.rinstruments[x] for x in data_map if x in self.rinstruments]
+        tickers = {}
+        for instrument in instruments:
+            data = data_map[self.instruments[instrument].name_id]
+            tickers[instrument] = self._convert_ticker(instrument, data, data)
+        return tickers
 
     def _parse_time(self, time_str: str) -> float:
         dt = dateutil.parser.parse(time_str)
@@ -56,10 +74,12 @@ class Client(ClientBase):
         symbol = self.instruments[instrument].name_id
         timestamp = time.time()
         kwargs = no_none_dict(symbol=symbol, depth=_depth)
-        res = self.public_get('/orderBook/L2', **kwargs)
+        # full order book is large. rows are converted while response arrives
+        res = []
         asks = []
         bids = []
-        for x in res:
+        for x in self.public_get_iter('/orderBook/L2', **kwargs):
+            res.append(x)
             if x['side'].upper() == 'BUY':
                 bids.append((float(x['price']), float(x['size']), x['id']))
             else:
@@ -69,6 +89,37 @@ class Client(ClientBase):
     def get_public_executions(self, instrument: str, **kwargs) -> Iterator[Execution]:
         pass
 
+    @staticmethod
+    def _format_time(timestamp: float) -> str:
+        dt = datetime.datetime.fromtimestamp(timestamp, pytz.UTC)
+        return dt.strftime('%Y-%m-%dT%H:%M:%S.%f')[:-3] + 'Z'
+
+    CANDLE_SIZES = {'1m': 60, '5m': 5 * 60, '1h': 60 * 60, '1d': 24 * 60 * 60}
+
+    def _fetch_candles(self, instrument: str, candle_size: str, start: float, end: float, *,
+                       params: dict = None) -> Iterator[Candle]:
+        seconds = self.CANDLE_SIZES.get(candle_size)
+        if not seconds:
+            raise NotSupportedError(f'candle_size={candle_size} not supported')
+        limit = 1000
+        # timestamp of bucket is end of period. startTime and endTime are inclusive
+        kwargs = dict(binSize=candle_size, symbol=self.instruments[instrument].name_id, count=limit,
+                      partial='true', startTime=self._format_time(start + seconds),
+                      endTime=self._format_time(end + seconds - 0.001))
+        kwargs.update(params or {})
+
+        def fetch_page(_start: int) -> list:
+            return self.public_get('/trade/bucketed', start=_start, **kwargs)
+
+        for res in self._iter_pages(fetch_page, self._next_start(limit), 0):
+            for x in res:
+                # no trade in period
+                if x['open'] is None:
+                    continue
+                yield Candle(timestamp=self._parse_time(x['timestamp']) - seconds,
+                             open=x['open'], high=x['high'], low=x['low'], close=x['close'],
+                             volume=x['volume'], _data=x)
+
     def get_balances_list(self) -> List[Balance]:
         balances = []
         res = self.private_get('/user/margin')
@@ -156,37 +207,98 @@ class Client(ClientBase):
                 kwargs.update(symbol=self.instruments[instrument].name_id)
             if active_only:
                 kwargs.update(filter=json.dumps({'open': True}))
-            start = 0
-            while True:
-                kwargs.update(start=start)
-                start += limit
-                res = self.private_get('/order', **kwargs)
-                for x in res:
-                    yield self._convert_order(x)
-                if len(res) < limit:
-                    break
+
+            def fetch_page(start: int) -> List[Order]:
+                # orders are converted while response arrives
+                return [self._convert_order(x) for x in self.private_get_iter('/order', start=start, **kwargs)]
+
+            for orders in self._iter_pages(fetch_page, self._next_start(limit), 0):
+                yield from orders
+
+    @staticmethod
+    def _next_start(limit: int):
+        """next_cursor of _iter_pages(). pages are paginated by 'start' offset"""
+        def next_cursor(start: int, res: list) -> Optional[int]:
+            return start + limit if len(res) >= limit else None
+
+        return next_cursor
 
     _order_type_map = {
         OrderType.MARKET: 'Market',
         OrderType.LIMIT: 'Limit',
     }
 
-    def submit_order(self, instrument: str, order_type: str, side: str, price: float, qty: float,
-                     *, margin: bool = False, params: dict = None, **__) -> Order:
+    def _new_order_params(self, instrument: str, order_type: str, side: str, price: float, qty: float,
+                          margin: bool, params: Optional[dict]) -> dict:
         assert margin, 'margin only'
         side = side.lower().capitalize()
         kwargs = dict(symbol=self.instruments[instrument].name_id,
                       side=side, orderQty=qty, orderType=self._order_type_map.get(order_type, order_type))
         if price:
             kwargs.update(price=price)
+        # retried order is reconciled by clOrdID. see RestApi.reconcile()
+        kwargs.update(clOrdID=uuid.uuid4().hex)
         kwargs.update(params or {})
+        return kwargs
+
+    def submit_order(self, instrument: str, order_type: str, side: str, price: float, qty: float,
+                     *, margin: bool = False, params: dict = None, **__) -> Order:
+        kwargs = self._new_order_params(instrument, order_type, side, price, qty, margin, params)
         res = self.private_post('/order', **kwargs)
         return self._convert_order(res)
 
+    def submit_orders(self, orders: Iterable[OrderRequest]) -> List[Union[Order, Exception]]:
+        """orders are sent by one request of /order/bulk"""
+        orders = list(orders)
+        results: List[Union[Order, Exception]] = [None] * len(orders)
+        bulk = []
+        for i, x in enumerate(orders):
+            try:
+                bulk.append((i, self._new_order_params(x.instrument, x.order_type, x.side, x.price, x.qty,
+                                                       x.margin, x.params)))
+            except Exception as e:
+                results[i] = e
+        if bulk:
+            try:
+                res = self.private_post('/order/bulk', orders=[params for _, params in bulk])
+                for (i, _), data in zip(bulk, res):
+                    results[i] = self._convert_order(data)
+            except Exception as e:
+                for i, _ in bulk:
+                    results[i] = e
+        return results
+
     def cancel_order(self, order_id: Hashable) -> Optional[Order]:
         res = self.private_delete('/order', orderID=order_id)
         return self._convert_order(res[0])
 
+    def cancel_orders(self, order_ids: Iterable[Hashable]) -> List[Union[Optional[Order], Exception]]:
+        """orders are canceled by one request of DELETE /order"""
+        order_ids = list(order_ids)
+        if not order_ids:
+            return []
+        try:
+            res = self.private_delete('/order', orderID=order_ids)
+        except Exception as e:
+            return [e] * len(order_ids)
+        orders = {x['orderID']: x for x in res}
+        results: List[Union[Optional[Order], Exception]] = []
+        for order_id in order_ids:
+            data = orders.get(order_id)
+            if data is None:
+                results.append(NotFoundError(f'{order_id} order not found'))
+            elif data.get('error'):
+                results.append(CoinError(dict(message=data['error'], order_id=order_id)))
+            else:
+                results.append(self._convert_order(data))
+        return results
+
+    def cancel_all(self, instrument: str = None):
+        kwargs = {}
+        if instrument:
+            kwargs.update(symbol=self.instruments[instrument].name_id)
+        self.private_delete('/order/all', **kwargs)
+
     def update_order(self, order_id: Hashable, *, params: dict) -> Optional[Order]:
         raise NotSupportedError('not supported yet')
 
@@ -195,11 +307,11 @@ class Client(ClientBase):
         limit = 10
         kwargs = dict(count=limit, symbol=self.instruments[instrument].name_id,
                       reverse='true', filter=json.dumps(dict(execType='Trade')))
-        start = 0
-        while True:
-            kwargs.update(start=start)
-            start += limit
-            res = self.private_get('/execution/tradeHistory', **kwargs)
+
+        def fetch_page(start: int) -> list:
+            return self.private_get('/execution/tradeHistory', start=start, **kwargs)
+
+        for res in self._iter_pages(fetch_page, self._next_start(limit), 0):
             for x in res:
                 yield Execution(execution_id=x['execID'],
                                 timestamp=self._parse_time(x['timestamp']),
@@ -208,8 +320,6 @@ class Client(ClientBase):
                                 price=x['price'],
                                 qty=x['cumQty'],
                                 _data=x)
-            if len(res) < limit:
-                break
 
     def get_positions(self, *, instrument: str = None, active_only: bool = True,
                       position_ids: Iterable[Hashable] = None) -> Iterator[Position]:
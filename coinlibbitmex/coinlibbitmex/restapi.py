@@ -1,6 +1,11 @@
+import json
+from typing import Optional
+
 from requests import HTTPError, Response
 
-from coinlib.trade.restapi import RestApi as RestApiBase
+from coinlib.errors import RateLimitError
+from coinlib.trade.retrypolicy import Idempotency
+from coinlib.trade.restapi import RestApi as RestApiBase, parse_retry_after
 from .auth import Auth
 
 
@@ -9,10 +14,29 @@ class RestApi(RestApiBase):
     BASE_URL = 'https://www.bitmex.com/api/v1'
     AUTH_CLASS = Auth
     CONTENT_TYPE = 'application/json'
+    # 300 requests / 5 minutes per account, 150 if not authenticated
+    RATE_LIMITS = {'public': (150, 0.5), 'private': (300, 1.0)}
+    # signed by expiration time, no nonce
+    PRIVATE_CONCURRENCY = 4
+
+    def get_idempotency(self, method: str, path: str, params: dict) -> str:
+        if method == 'POST' and path == '/order' and params.get('clOrdID'):
+            return Idempotency.KEYED
+        return super().get_idempotency(method, path, params)
+
+    def reconcile(self, method: str, path: str, params: dict) -> Optional[dict]:
+        # order submitted by previous try
+        assert (method, path) == ('POST', '/order'), (method, path)
+        res = self.request('GET', '/order', True, dict(filter=json.dumps(dict(clOrdID=params['clOrdID'])),
+                                                         reverse='true', count=1))
+        return res[0] if res else None
 
     def on_error(self, exc: Exception):
         if isinstance(exc, HTTPError):
             res: Response = exc.response
+            if res.status_code == 429:
+                wait_seconds = parse_retry_after(res.headers.get('retry-after'))
+                raise RateLimitError(res.json(), wait_seconds=1 if wait_seconds is None else wait_seconds) from exc
             raise HTTPError(res.json()) from exc
 
         super().on_error(exc)
@@ -1,6 +1,5 @@
-import json
 import logging
-from typing import Dict
+from typing import Dict, Hashable, List
 
 from requests.structures import CaseInsensitiveDict
 from websocket import WebSocket
@@ -16,22 +15,32 @@ class StreamApi(WebSocketStreamApi):
 
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
-        self._channel_name_map: Dict[str, str] = CaseInsensitiveDict()
+        # one channel may be shared by some keys(e.g. ticker and execution use same trade channel)
+        self._channel_name_map: Dict[str, List[Hashable]] = CaseInsensitiveDict()
+        self._key_channel_map: Dict[Hashable, str] = {}
 
     def _process_subscription_q(self, ws: WebSocket):
         # process one
         if len(self._subscription_q):
             op, (key, channel_name) = self._subscription_q.popleft()
             if op == 'subscribe':
-                self._channel_name_map[channel_name] = key
-                self._subscribe_channel(channel_name)
+                keys = self._channel_name_map.setdefault(channel_name, [])
+                if key not in keys:
+                    keys.append(key)
+                self._key_channel_map[key] = channel_name
+                if len(keys) == 1:
+                    self._subscribe_channel(channel_name)
                 logger.debug(f'subscribe {key} {channel_name}')
             elif op == 'unsubscribe':
-                for k, v in self._channel_name_map.items():
-                    if v == key:
-                        self._unsubscribe_channel(k)
-                        logger.debug(f'unsubscribe {key} {k}')
-                        break
+                channel_name = self._key_channel_map.pop(key, None)
+                if channel_name is not None:
+                    keys = self._channel_name_map.get(channel_name, [])
+                    if key in keys:
+                        keys.remove(key)
+                    if not keys:
+                        self._channel_name_map.pop(channel_name, None)
+                        self._unsubscribe_channel(channel_name)
+                    logger.debug(f'unsubscribe {key} {channel_name}')
             else:
                 assert False, f'unknown operation={op}'
 
@@ -45,8 +54,8 @@ class StreamApi(WebSocketStreamApi):
             'op': 'unsubscribe', 'args': [channel_name],
         })
 
-    def on_message(self, message_data: str):
-        message = json.loads(message_data)
+    def on_message(self, message_data: bytes):
+        message = self.decode_message(message_data)
         if isinstance(message, dict):
             if message.get('subscribe') and message.get('success'):
                 logger.debug(f'event subscribe {message}')
@@ -72,10 +81,8 @@ class StreamApi(WebSocketStreamApi):
         if data:
             symbol = data[0].get('symbol')
             channel_name = f'{table}:{symbol}'
-            key = self._channel_name_map.get(channel_name)
-            if key:
+            for key in tuple(self._channel_name_map.get(channel_name, ())):
                 self.on_raw_data(StreamData(key, message))
         channel_name = f'{table}'
-        key = self._channel_name_map.get(channel_name)
-        if key:
+        for key in tuple(self._channel_name_map.get(channel_name, ())):
             self.on_raw_data(StreamData(key, message))
@@ -34,6 +34,11 @@ class StreamClient(Client, StreamClientBase):
             symbol = self.instruments[instrument].name_id
             self.stream_api.subscribe((key, f'orderBookL2:{symbol}'))
             return
+        if stream_type == StreamType.EXECUTION:
+            instrument: str = key[1]
+            symbol = self.instruments[instrument].name_id
+            self.stream_api.subscribe((key, f'trade:{symbol}'))
+            return
 
     def request_unsubscribe(self, key: Tuple[str, Hashable]):
         stream_type = key[0]
@@ -126,6 +131,19 @@ class StreamClient(Client, StreamClientBase):
             order_book = OrderBook(timestamp=time.time(), instrument=instrument,
                                    asks=asks, bids=bids, _data=None)
             return StreamData(key[:2], order_book)
+        elif stream_type == StreamType.EXECUTION:
+            # partial is recent history, not new executions
+            if data.action != 'insert':
+                return None
+            symbol = self.rinstruments[key[1]]
+            rows = []
+            for x in data.data:
+                # {'timestamp': '2018-05-22T07:35:42.399Z', 'symbol': 'XBTUSD', 'side': 'Buy',
+                #  'size': 100, 'price': 8000, 'trdMatchID': '...', ...}
+                assert x['symbol'] == symbol, data.message
+                rows.append((x['trdMatchID'], self._parse_time(x['timestamp']), x['side'],
+                             float(x['price']), float(x['size']), x))
+            return self.convert_executions(key, rows)
 
         return None
 
@@ -1,7 +1,7 @@
 import time
 from pprint import pprint
 
-from coinlib.datatypes import Ticker, OrderBook, OrderSide, OrderState, Order
+from coinlib.datatypes import Ticker, OrderBook, OrderSide, OrderState, Order, OrderRequest
 from coinlib.datatypes.balance import BalanceType
 from coinlib.datatypes.position import Position
 from coinlibbitmex.client import Client
@@ -44,6 +44,16 @@ def test_public(client: Client):
     assert abs(order_book.timestamp - time.time()) < 30
 
 
+def test_get_candles(client: Client):
+    end = time.time() // 60 * 60
+    start = end - 2 * 24 * 60 * 60
+    candles = list(client.get_candles('XBTUSD', '1m', start=start, end=end))
+    assert candles
+    timestamps = [x.timestamp for x in candles]
+    assert timestamps == sorted(set(timestamps))
+    assert start <= timestamps[0] and timestamps[-1] < end
+
+
 def test_get_balances(client: Client):
     all_balances = client.get_balances()
     assert set(all_balances.keys()).issubset(BalanceType._all)
@@ -91,6 +101,19 @@ def test_order(client_write: Client):
     assert len(res) == 1 and res[0].state == OrderState.CANCELED
 
 
+def test_submit_orders(client_write: Client):
+    ticker = client_write.get_ticker('XBTUSD')
+    bids = [round(ticker.bid * x, -1) for x in (0.7, 0.8)]
+    orders = [OrderRequest('XBTUSD', 'Limit', 'BUY', bid, 1, margin=True) for bid in bids]
+    # spot order is not supported
+    orders.insert(1, OrderRequest('XBTUSD', 'Limit', 'BUY', bids[0], 1))
+    res = client_write.submit_orders(orders)
+    assert isinstance(res[1], AssertionError)
+    assert [x.price for x in (res[0], res[2])] == bids
+    for x in (res[0], res[2]):
+        client_write.cancel_order(x.order_id)
+
+
 def test_get_private_executions(client: Client):
     for i, x in enumerate(client.get_private_executions('XBTUSD')):
         pass
@@ -107,3 +130,19 @@ def test_get_positions(client: Client):
         assert x.qty_opened > 0
         if i > 1:
             break
+
+
+def test_tickers(client: Client):
+    tickers = client.get_tickers(['XBTUSD', 'ETHUSD'])
+    assert set(tickers) == {'XBTUSD', 'ETHUSD'}
+    for instrument, ticker in tickers.items():
+        assert isinstance(ticker, Ticker)
+        assert ticker.instrument == instrument
+
+    assert 'XBTUSD' in client.get_tickers()
+
+    order_books = client.get_order_books(['XBTUSD', 'ETHUSD'])
+    assert set(order_books) == {'XBTUSD', 'ETHUSD'}
+    for instrument, order_book in order_books.items():
+        assert isinstance(order_book, OrderBook)
+        assert order_book.instrument == instrument
@@ -3,7 +3,7 @@ from queue import Queue, Empty
 
 import pytest
 
-from coinlib.datatypes import Ticker, OrderBook
+from coinlib.datatypes import Ticker, OrderBook, Execution, ExecutionBatch
 from coinlib.datatypes.streamdata import StreamData
 from coinlibbitmex.streamclient import StreamClient
 
@@ -42,6 +42,36 @@ def test_order_book(stream_client: StreamClient):
     assert isinstance(bid[0], float) and isinstance(bid[1], float) and isinstance(bid[2], int)
 
 
+def test_execution(stream_client: StreamClient):
+    q = Queue()
+
+    stream_client.on_data = q.put
+    assert stream_client.wait_connection(5)
+    stream_client.subscribe(execution='XBTUSD')
+    d: StreamData = q.get(timeout=WAIT * 6)
+    k, d = d.key, d.data
+    assert k == ('execution', 'XBTUSD')
+    assert isinstance(d, list)
+    for x in d:
+        assert isinstance(x, Execution)
+        assert x.instrument == 'XBTUSD'
+        assert isinstance(x.price, float) and isinstance(x.qty, float)
+
+
+def test_execution_batch():
+    q = Queue()
+
+    with StreamClient(execution_batch_interval=1, on_data=q.put) as stream_client:
+        assert stream_client.wait_connection(5)
+        stream_client.subscribe(execution='XBTUSD')
+        d: StreamData = q.get(timeout=WAIT * 6)
+        k, d = d.key, d.data
+        assert k == ('execution', 'XBTUSD')
+        assert isinstance(d, ExecutionBatch)
+        assert d.instrument == 'XBTUSD'
+        assert len(d) == len(d.price) == len(d.qty) == len(d.side) > 0
+
+
 def test_subscribe_unsubscribe(stream_client: StreamClient):
     q = Queue()
 
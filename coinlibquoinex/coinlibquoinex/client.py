@@ -63,12 +63,12 @@ class Client(ClientBase):
     def get_public_executions(self, instrument: str, **kwargs) -> Iterator[Execution]:
         product_id = self.instruments[instrument].name_id
         limit = 1000
-        page = 1
         kwargs = dict(product_id=product_id, limit=limit)
-        while True:
-            kwargs.update(page=page)
-            page += 1
-            res = self.public_get('/executions', **kwargs)
+
+        def fetch_page(page: int) -> dict:
+            return self.public_get('/executions', page=page, **kwargs)
+
+        for res in self._iter_pages(fetch_page, self._next_page(limit), 1):
             for x in res['models']:
                 yield Execution(execution_id=x['id'],
                                 timestamp=float(x['created_at']),
@@ -77,8 +77,14 @@ class Client(ClientBase):
                                 price=float(x['price']),
                                 qty=float(x['quantity']),
                                 _data=x)
-            if len(res) < limit:
-                break
+
+    @staticmethod
+    def _next_page(limit: int):
+        """next_cursor of _iter_pages(). pages are paginated by 'page' number"""
+        def next_cursor(page: int, res: dict) -> Optional[int]:
+            return page + 1 if len(res['models']) >= limit else None
+
+        return next_cursor
 
     def get_balances_list(self) -> List[Balance]:
         balances = []
@@ -141,16 +147,14 @@ class Client(ClientBase):
                 kwargs['product_id'] = self.instruments[instrument].name_id
             if _with_details:
                 kwargs['with_details'] = 1
-            page = 1
-            while True:
-                kwargs.update(page=page)
-                page += 1
-                res = self.private_get('/orders', **kwargs)
+
+            def fetch_page(page: int) -> dict:
+                return self.private_get('/orders', page=page, **kwargs)
+
+            for res in self._iter_pages(fetch_page, self._next_page(limit), 1):
                 for x in res['models']:
                     order = self._convert_order(x)
                     yield order
-                if len(res) < limit:
-                    break
 
     _order_type_map = {
         OrderType.MARKET: 'market',
@@ -186,12 +190,12 @@ class Client(ClientBase):
     def get_private_executions(self, instrument: str) -> Iterator[Execution]:
         product_id = self.instruments[instrument].name_id
         limit = 1000
-        page = 1
         kwargs = dict(product_id=product_id, limit=limit)
-        while True:
-            kwargs.update(page=page)
-            page += 1
-            res = self.private_get('/executions/me', **kwargs)
+
+        def fetch_page(page: int) -> dict:
+            return self.private_get('/executions/me', page=page, **kwargs)
+
+        for res in self._iter_pages(fetch_page, self._next_page(limit), 1):
             for x in res['models']:
                 yield Execution(execution_id=x['id'],
                                 timestamp=float(x['created_at']),
@@ -200,8 +204,6 @@ class Client(ClientBase):
                                 price=float(x['price']),
                                 qty=float(x['quantity']),
                                 _data=x)
-            if len(res) < limit:
-                break
 
     _position_state_map = {
         'open': PositionState.ACTIVE,
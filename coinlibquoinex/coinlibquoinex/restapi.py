@@ -11,6 +11,8 @@ class RestApi(RestApiBase):
     AUTH_CLASS = Auth
     CONTENT_TYPE = 'application/json'
     RATE_LIMIT_WAIT = 15
+    # 300 requests / 5 minutes
+    RATE_LIMITS = {'public': (300, 1.0), 'private': (300, 1.0)}
 
     def on_error(self, exc: Exception):
         if isinstance(exc, HTTPError):
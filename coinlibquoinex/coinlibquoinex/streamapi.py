@@ -1,4 +1,3 @@
-import json
 import logging
 import time
 from typing import Dict
@@ -52,8 +51,8 @@ class StreamApi(WebSocketStreamApi):
             },
         })
 
-    def on_message(self, message_data: str):
-        message: dict = json.loads(message_data)
+    def on_message(self, message_data: bytes):
+        message: dict = self.decode_message(message_data)
         event = message.get('event')
         channel_name = message.get('channel')
         data = message.get('data', {})